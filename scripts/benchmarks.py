@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the PDF-to-Skills pipeline
+
+Agent calls are replaced by a simulated agent with fixed latency so results
+measure the pipeline itself and are reproducible without Azure credentials.
+
+Usage:
+    python scripts/benchmarks.py resume                       # Uses references/*.pdf; fresh vs. index vs. checkpoint
+    python scripts/benchmarks.py resume --pdf a.pdf b.pdf --latency 0.05
+    python scripts/benchmarks.py render --count 5000
+    python scripts/benchmarks.py chunking --edits 20            # Chunk cache hit rate after edits
+    python scripts/benchmarks.py extract --workers 2 4 8        # Serial vs. process-pool vs. cached
+    python scripts/benchmarks.py memory --budget-mb 200  # Fails if peak memory exceeds budget
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import List
+
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+console = Console()
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class SimulatedAgent:
+    """Agent stand-in that sleeps for a fixed latency and returns canned JSON"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def run(self, prompt: str) -> str:
+        await asyncio.sleep(self.latency)
+
+        if prompt.startswith("Map this skill"):
+            return json.dumps({"tracks": ["data-science"]})
+
+        if prompt.startswith("Extract Python skills"):
+            digest = abs(hash(prompt)) % 10_000
+            return json.dumps([{
+                "name": f"Simulated Skill {digest}",
+                "description": "Apply a simulated technique to a simulated dataset.",
+                "category": "Data Manipulation",
+                "difficulty": "beginner",
+                "key_concepts": ["simulation", "benchmark"],
+                "source_section": "Simulated Chapter"
+            }])
+
+        return "{}"
+
+
+def make_simulated_config(checkpoint_dir: Path, latency: float):
+    """Create an AgentConfiguration whose agents are simulated"""
+    os.environ.setdefault("AZURE_ENDPOINT", "https://simulated.invalid")
+    os.environ["CHECKPOINT_DIR"] = str(checkpoint_dir)
+
+    from teaching_utils.agent_config import AgentConfiguration
+
+    class SimulatedConfiguration(AgentConfiguration):
+        @asynccontextmanager
+        async def create_agent(self, instructions: str, name: str, tools=None):
+            yield SimulatedAgent(latency)
+
+    return SimulatedConfiguration(env_file=Path(os.devnull))
+
+
+def find_pdfs(pdfs: List[str]) -> List[Path]:
+    """Resolve PDF arguments, defaulting to every reference book"""
+    paths = [Path(p) for p in pdfs] if pdfs else sorted((PROJECT_ROOT / "references").glob("*.pdf"))
+    if not paths:
+        console.print("[red]No PDFs found. Pass --pdf or add books to references/[/red]")
+        sys.exit(1)
+    return paths
+
+
+def benchmark_resume(args):
+    """
+    Time a fresh multi-book run against a fingerprint-index rerun and a
+    checkpoint resume.
+
+    The index rerun is a new workflow over unchanged books, so every stage is
+    reused from the fingerprint index. The resume run reloads the interrupted
+    workflow's checkpoint with the index cleared, so only completed steps
+    are reused.
+    """
+    from teaching_utils.state_manager import StepStatus
+    from teaching_utils.workflows import BookToProcess, SkillExtractionWorkflow
+
+    pdfs = find_pdfs(args.pdf)
+    if len(pdfs) < 2:
+        console.print("[red]The resume benchmark needs at least two PDFs[/red]")
+        sys.exit(1)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="skills_bench_"))
+    references_dir = work_dir / "references"
+    references_dir.mkdir()
+    for pdf in pdfs:
+        shutil.copy(pdf, references_dir / pdf.name)
+
+    def make_books():
+        return [
+            BookToProcess(filename=pdf.name, output_name=pdf.stem.lower().replace(" ", "-"))
+            for pdf in pdfs
+        ]
+
+    async def timed_run(workflow_id: str):
+        config = make_simulated_config(work_dir / "checkpoints", args.latency)
+        workflow = SkillExtractionWorkflow(config=config)
+        start = time.perf_counter()
+        await workflow.run(make_books(), references_dir, work_dir / "output", workflow_id=workflow_id)
+        return workflow, time.perf_counter() - start
+
+    async def run_benchmark():
+        # Full run from scratch
+        workflow, fresh_time = await timed_run("bench_resume")
+
+        # New workflow, unchanged inputs: every stage is an index hit
+        _, index_time = await timed_run("bench_index")
+
+        # Simulate an interruption: the second half of the books stopped after
+        # identification, so validate/categorize are still pending
+        interrupted = {book.output_name for book in make_books()[len(pdfs) // 2:]}
+        for step in workflow.workflow_state.steps:
+            stage, _, book = step.step_id.partition("_")
+            if book in interrupted and stage in ("validate", "categorize"):
+                step.status = StepStatus.PENDING
+        workflow.state_manager.save_checkpoint(workflow.workflow_state)
+
+        # Without the index only the checkpoint's completed steps are reused
+        shutil.rmtree(work_dir / "checkpoints" / "artifacts" / "_index", ignore_errors=True)
+        _, resume_time = await timed_run("bench_resume")
+        return fresh_time, index_time, resume_time
+
+    try:
+        fresh_time, index_time, resume_time = asyncio.run(run_benchmark())
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    table = Table(title=f"Resume Benchmark ({len(pdfs)} books, {args.latency}s simulated latency)")
+    table.add_column("Run", style="cyan")
+    table.add_column("Wall Time (s)", justify="right")
+    table.add_column("Saved vs. Fresh (s)", justify="right", style="green")
+    table.add_row("Fresh run", f"{fresh_time:.2f}", "")
+    table.add_row("Rerun, fingerprint index hit", f"{index_time:.2f}", f"{fresh_time - index_time:.2f}")
+    table.add_row("Resume from checkpoint", f"{resume_time:.2f}", f"{fresh_time - resume_time:.2f}")
+    console.print(table)
+
+
+def benchmark_memory(args):
+    """Run the workflow with memory profiling and fail if it exceeds a budget"""
+    from teaching_utils.profiling import MemoryBudgetExceeded
+    from teaching_utils.workflows import BookToProcess, SkillExtractionWorkflow
+
+    pdfs = find_pdfs(args.pdf)
+    work_dir = Path(tempfile.mkdtemp(prefix="skills_bench_"))
+
+    async def run_benchmark():
+        config = make_simulated_config(work_dir / "checkpoints", args.latency)
+        config.memory_budget_mb = args.budget_mb
+        workflow = SkillExtractionWorkflow(config=config, memory_profile=True)
+        books = [
+            BookToProcess(filename=pdf.name, output_name=pdf.stem.lower().replace(" ", "-"))
+            for pdf in pdfs
+        ]
+        await workflow.run(books, pdfs[0].parent, work_dir / "output", workflow_id="bench_memory")
+        return workflow.memory_profiler.peak_mb
+
+    try:
+        peak_mb = asyncio.run(run_benchmark())
+    except MemoryBudgetExceeded as e:
+        console.print(f"[red]✗ {e}[/red]")
+        sys.exit(1)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    budget = f" (budget {args.budget_mb:.1f} MB)" if args.budget_mb is not None else ""
+    console.print(f"[green]✓ Peak traced memory {peak_mb:.1f} MB{budget}[/green]")
+
+
+def benchmark_render(args):
+    """Compare JSON-string rendering with batch rendering from skill objects"""
+    from teaching_utils.agent_tools import cached_slugify, generate_skill_markdown, render_skills_markdown
+    from teaching_utils.workflows import ExtractedSkill
+
+    names = [f"Simulated Skill {i}" for i in range(args.count)]
+    skills = [
+        ExtractedSkill(
+            name=name,
+            description="Apply a simulated technique to a simulated dataset. " * 3,
+            category="Data Manipulation",
+            difficulty="intermediate",
+            key_concepts=["simulation", "benchmark", "rendering", "markdown"],
+            source_book="Simulated Book",
+            source_section="Chapter 1",
+            prerequisites=names[max(i - 3, 0):i],
+            related_skills=names[i + 1:i + 4],
+            tracks=["data-science", "automation"]
+        )
+        for i, name in enumerate(names)
+    ]
+
+    def time_best(render):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            render()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    json_time = time_best(lambda: [
+        generate_skill_markdown(skill.model_dump_json(), skill.tracks) for skill in skills
+    ])
+    cached_slugify.cache_clear()
+    batch_time = time_best(lambda: render_skills_markdown(skills))
+
+    table = Table(title=f"Render Benchmark ({args.count} skills, best of {args.repeat})")
+    table.add_column("Renderer", style="cyan")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Skills/s", justify="right")
+    table.add_row("generate_skill_markdown (JSON)", f"{json_time:.3f}", f"{args.count / json_time:,.0f}")
+    table.add_row("render_skills_markdown (batch)", f"{batch_time:.3f}", f"{args.count / batch_time:,.0f}")
+    table.add_row("Speedup", f"{json_time / batch_time:.1f}x", "", style="green")
+    console.print(table)
+
+
+def benchmark_extract(args):
+    """Compare serial, process-pool and page-cache PDF text extraction"""
+    from teaching_utils.agent_tools import load_pdf_pages, read_pdf_pages, read_pdf_pages_parallel
+
+    pdfs = find_pdfs(args.pdf)
+    cache_dir = Path(tempfile.mkdtemp(prefix="pdf_cache_bench_"))
+
+    def time_best(extract):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            extract()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    table = Table(title=f"Extract Benchmark ({os.cpu_count()} CPUs, best of {args.repeat})")
+    table.add_column("Book", style="cyan")
+    table.add_column("Workers", justify="right")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Speedup", justify="right")
+
+    for pdf in pdfs:
+        serial_pages = read_pdf_pages(pdf)
+        serial_time = time_best(lambda: read_pdf_pages(pdf))
+        table.add_row(pdf.name, "serial", f"{serial_time:.2f}", "1.0x")
+
+        for workers in args.workers:
+            if read_pdf_pages_parallel(pdf, workers) != serial_pages:
+                console.print(f"[red]✗ Parallel extraction of {pdf.name} differs from serial[/red]")
+                sys.exit(1)
+            parallel_time = time_best(lambda: read_pdf_pages_parallel(pdf, workers))
+            table.add_row("", str(workers), f"{parallel_time:.2f}", f"{serial_time / parallel_time:.1f}x")
+
+        load_pdf_pages(pdf, 1, cache_dir=cache_dir)
+        cached_time = time_best(lambda: load_pdf_pages(pdf, 1, cache_dir=cache_dir))
+        table.add_row("", "page cache", f"{cached_time:.4f}", f"{serial_time / cached_time:.0f}x")
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    console.print(table)
+
+
+def benchmark_chunking(args):
+    """Compare how many chunks survive small edits with fixed and content-defined chunking"""
+    import random
+    import statistics
+
+    from teaching_utils.agent_tools import iter_chunk_spans, iter_content_defined_spans, load_pdf_pages
+
+    chunkers = {
+        "fixed": lambda text: iter_chunk_spans(text, args.chunk_size),
+        "content-defined": lambda text: iter_content_defined_spans(
+            text, args.chunk_size // 2, max_size=args.chunk_size
+        ),
+    }
+
+    table = Table(title=f"Chunking Benchmark ({args.edits} single-character edits per book)")
+    table.add_column("Book", style="cyan")
+    table.add_column("Chunker")
+    table.add_column("Chunks", justify="right")
+    table.add_column("Mean size", justify="right")
+    table.add_column("Cache hit rate", justify="right")
+
+    for pdf in find_pdfs(args.pdf):
+        text = "\n\n".join(load_pdf_pages(pdf))
+        rng = random.Random(args.seed)
+        positions = [rng.randrange(len(text) + 1) for _ in range(args.edits)]
+
+        for index, (name, chunker) in enumerate(chunkers.items()):
+            original = [span.text(text) for span in chunker(text)]
+            cached = set(original)
+
+            # A chunk cache hits when an edited book yields a chunk seen before
+            hit_rates = []
+            for position in positions:
+                edited = text[:position] + "x" + text[position:]
+                chunks = [span.text(edited) for span in chunker(edited)]
+                hit_rates.append(sum(chunk in cached for chunk in chunks) / len(chunks))
+
+            table.add_row(
+                pdf.name if index == 0 else "",
+                name,
+                str(len(original)),
+                f"{statistics.mean(len(chunk) for chunk in original):,.0f}",
+                f"{statistics.mean(hit_rates):.1%}"
+            )
+
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PDF-to-Skills pipeline")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    resume = subparsers.add_parser("resume", help="Fresh run vs. resuming a partial run")
+    resume.add_argument("--pdf", nargs="+", default=[], help="PDFs to process")
+    resume.add_argument("--latency", type=float, default=0.05, help="Simulated agent latency (s)")
+    resume.set_defaults(func=benchmark_resume)
+
+    render = subparsers.add_parser("render", help="Markdown rendering throughput")
+    render.add_argument("--count", type=int, default=5000, help="Number of skills to render")
+    render.add_argument("--repeat", type=int, default=3, help="Timed repetitions (best is reported)")
+    render.set_defaults(func=benchmark_render)
+
+    chunking = subparsers.add_parser("chunking", help="Chunk cache hit rate after small edits")
+    chunking.add_argument("--pdf", nargs="+", default=[], help="PDFs to chunk")
+    chunking.add_argument("--chunk-size", type=int, default=8000, help="Maximum chunk size")
+    chunking.add_argument("--edits", type=int, default=20, help="Simulated edits per book")
+    chunking.add_argument("--seed", type=int, default=0, help="Random seed for edit positions")
+    chunking.set_defaults(func=benchmark_chunking)
+
+    extract = subparsers.add_parser("extract", help="Serial vs. process-pool vs. cached PDF text extraction")
+    extract.add_argument("--pdf", nargs="+", default=[], help="PDFs to extract")
+    extract.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8], help="Worker counts to try")
+    extract.add_argument("--repeat", type=int, default=3, help="Timed repetitions (best is reported)")
+    extract.set_defaults(func=benchmark_extract)
+
+    memory = subparsers.add_parser("memory", help="Peak memory per stage, with an optional budget")
+    memory.add_argument("--pdf", nargs="+", default=[], help="PDFs to process (from one directory)")
+    memory.add_argument("--latency", type=float, default=0.01, help="Simulated agent latency (s)")
+    memory.add_argument("--budget-mb", type=float, default=None, help="Fail if peak traced memory exceeds this")
+    memory.set_defaults(func=benchmark_memory)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ discrete Python skills, concepts, and learning points.
 import os
 import sys
 import json
+from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
@@ -19,6 +20,10 @@ from azure.ai.agents import AgentsClient
 from azure.core.credentials import AzureKeyCredential
 from pydantic import BaseModel, Field
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from teaching_utils.artifacts import compute_fingerprint, file_sha256, hash_text  # noqa: E402
+from teaching_utils.telemetry import TelemetryRecorder  # noqa: E402
+
 
 console = Console()
 
@@ -69,6 +74,11 @@ class AzureOpenAISkillExtractor:
 
         self.agent = None
         self.agent_id = None
+        self.instructions = None
+        self.telemetry = TelemetryRecorder(
+            prompt_cost_per_1k=float(os.getenv("PROMPT_TOKEN_COST_PER_1K", "0")),
+            completion_cost_per_1k=float(os.getenv("COMPLETION_TOKEN_COST_PER_1K", "0"))
+        )
 
     def create_skill_extraction_agent(self):
         """Create an agent specialized in extracting Python skills"""
@@ -104,6 +114,7 @@ Return ONLY a valid JSON array of skill objects following this structure:
 ]
 
 Be specific and practical. Focus on skills that can be taught and practiced."""
+        self.instructions = instructions
 
         try:
             self.agent = self.client.create_agent(
@@ -121,23 +132,42 @@ Be specific and practical. Focus on skills that can be taught and practiced."""
 
         return self.agent
 
+    def input_fingerprint(self, markdown_path: Path, chunk_size: int) -> str:
+        """Fingerprint everything that determines a book's extracted skills"""
+        return compute_fingerprint(
+            file_sha256(markdown_path),
+            chunk_size,
+            hash_text(self.instructions or ""),
+            self.deployment
+        )
+
     def extract_skills_from_content(self, content: str, book_name: str) -> List[Skill]:
         """Extract skills from markdown content"""
         try:
             prompt = f"Extract Python skills from this content:\n\n{content[:8000]}"  # Limit size
 
-            # Create a thread and run the agent
-            run = self.client.create_thread_and_run(
-                agent_id=self.agent_id,
-                thread={
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ]
-                }
-            )
+            # Create a thread and run the agent, waiting for the run to finish
+            with self.telemetry.track(
+                role="python-skill-extractor",
+                stage="extract_skills",
+                book=book_name
+            ) as call:
+                run = self.client.create_thread_and_process_run(
+                    agent_id=self.agent_id,
+                    thread={
+                        "messages": [
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ]
+                    }
+                )
+                # Usage is only filled in once the run is in a terminal state
+                self.telemetry.record_usage(call, run)
+                if run.status != "completed":
+                    call.success = False
+                    call.error = str(run.last_error or run.status)
 
             # Get the messages from the thread
             messages = self.client.messages.list(thread_id=run.thread_id)
@@ -180,6 +210,20 @@ Be specific and practical. Focus on skills that can be taught and practiced."""
         return []
 
 
+def get_chunk_size() -> int:
+    """Chunk size used to split markdown content"""
+    return int(os.getenv("PDF_CHUNK_SIZE", "8000"))
+
+
+def load_input_fingerprint(output_file: Path) -> Optional[str]:
+    """Read the input fingerprint recorded in a previous extraction, if any"""
+    try:
+        data = json.loads(output_file.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data.get("metadata", {}).get("input_fingerprint")
+
+
 def process_markdown_file(
     markdown_path: Path,
     book_name: str,
@@ -192,7 +236,7 @@ def process_markdown_file(
     content = markdown_path.read_text(encoding="utf-8")
 
     # Split into chunks if too large
-    chunk_size = int(os.getenv("PDF_CHUNK_SIZE", "8000"))
+    chunk_size = get_chunk_size()
     chunks = [content[i:i+chunk_size] for i in range(0, len(content), chunk_size)]
 
     console.print(f"[cyan]Analyzing {len(chunks)} chunk(s) for skills...[/cyan]")
@@ -223,6 +267,7 @@ def process_markdown_file(
         skills=all_skills,
         metadata={
             "source_file": str(markdown_path),
+            "input_fingerprint": extractor.input_fingerprint(markdown_path, chunk_size),
             "total_chunks": len(chunks),
             "total_skills": len(all_skills)
         }
@@ -268,10 +313,11 @@ def main():
     for md_file in markdown_files:
         book_name = md_file.parent.name
 
-        # Check if already processed
+        # Skip books whose content, chunking, instructions and model are unchanged
         output_file = extracted_dir / f"{book_name}_skills.json"
-        if output_file.exists():
-            console.print(f"[yellow]Skipping {book_name} (already processed)[/yellow]")
+        fingerprint = extractor.input_fingerprint(md_file, get_chunk_size())
+        if output_file.exists() and load_input_fingerprint(output_file) == fingerprint:
+            console.print(f"[yellow]Skipping {book_name} (inputs unchanged)[/yellow]")
             console.print(f"  Delete {output_file} to reprocess\n")
             continue
 
@@ -306,6 +352,13 @@ def main():
 
     console.print("\n[bold green]✓ Skill extraction complete![/bold green]")
     console.print(f"Skills saved to: {extracted_dir}")
+
+    # Save telemetry report
+    extractor.telemetry.print_summary()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    extractor.telemetry.write_report(
+        project_root / "references" / "_telemetry" / f"extract_skills_{timestamp}.json"
+    )
     console.print("\nNext step: Run organize_skills.py to map skills to learning tracks")
 
 
@@ -9,6 +9,7 @@ deduplicates similar skills, and generates individual skill markdown files.
 import os
 import sys
 import json
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Set
 from collections import defaultdict
@@ -21,6 +22,12 @@ from azure.ai.agents import AgentsClient
 from azure.core.credentials import AzureKeyCredential
 from pydantic import BaseModel, Field
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from teaching_utils.agent_tools import merge_skill_cluster, skill_provenance  # noqa: E402
+from teaching_utils.output_writer import BulkWriter  # noqa: E402
+from teaching_utils.similarity import SkillSimilarityIndex  # noqa: E402
+from teaching_utils.telemetry import TelemetryRecorder  # noqa: E402
+
 
 console = Console()
 
@@ -86,6 +93,10 @@ class AzureOpenAITrackMapper:
 
         self.agent = None
         self.agent_id = None
+        self.telemetry = TelemetryRecorder(
+            prompt_cost_per_1k=float(os.getenv("PROMPT_TOKEN_COST_PER_1K", "0")),
+            completion_cost_per_1k=float(os.getenv("COMPLETION_TOKEN_COST_PER_1K", "0"))
+        )
 
     def create_mapping_agent(self):
         """Create agent for track mapping"""
@@ -140,18 +151,28 @@ Key Concepts: {', '.join(skill.key_concepts)}"""
         try:
             prompt = f"Map this skill to learning tracks:\n\n{skill_info}"
 
-            # Create a thread and run the agent
-            run = self.client.create_thread_and_run(
-                agent_id=self.agent_id,
-                thread={
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ]
-                }
-            )
+            # Create a thread and run the agent, waiting for the run to finish
+            with self.telemetry.track(
+                role="skill-track-mapper",
+                stage="map_tracks",
+                book=skill.source_book
+            ) as call:
+                run = self.client.create_thread_and_process_run(
+                    agent_id=self.agent_id,
+                    thread={
+                        "messages": [
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ]
+                    }
+                )
+                # Usage is only filled in once the run is in a terminal state
+                self.telemetry.record_usage(call, run)
+                if run.status != "completed":
+                    call.success = False
+                    call.error = str(run.last_error or run.status)
 
             # Get the messages from the thread
             messages = self.client.messages.list(thread_id=run.thread_id)
@@ -232,44 +253,24 @@ def slugify(text: str) -> str:
 
 def deduplicate_skills(skills: List[Skill]) -> List[OrganizedSkill]:
     """Merge similar skills from different books"""
-    # Group by skill name (case-insensitive)
-    skill_groups = defaultdict(list)
-
-    for skill in skills:
-        key = skill.name.lower().strip()
-        skill_groups[key].append(skill)
+    # Group near-duplicate names and concepts with MinHash/LSH
+    index = SkillSimilarityIndex(
+        threshold=float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.7")),
+        num_perm=int(os.getenv("DEDUP_NUM_PERM", "128"))
+    )
+    skill_groups = [[skills[i] for i in cluster] for cluster in index.find_clusters(skills)]
 
     # Merge duplicates
     organized = []
 
-    for skill_name, skill_list in skill_groups.items():
-        if len(skill_list) == 1:
-            # No duplicates
-            skill = skill_list[0]
-            organized.append(OrganizedSkill(
-                skill=skill,
-                tracks=[],  # Will be filled later
-                skill_id=slugify(skill.name),
-                merged_from=[skill.source_book]
-            ))
-        else:
-            # Merge multiple occurrences
-            base_skill = skill_list[0]
-            all_concepts = set(base_skill.key_concepts)
-            all_sources = [base_skill.source_book]
-
-            for other_skill in skill_list[1:]:
-                all_concepts.update(other_skill.key_concepts)
-                all_sources.append(other_skill.source_book)
-
-            base_skill.key_concepts = sorted(list(all_concepts))
-
-            organized.append(OrganizedSkill(
-                skill=base_skill,
-                tracks=[],
-                skill_id=slugify(base_skill.name),
-                merged_from=all_sources
-            ))
+    for skill_list in skill_groups:
+        skill = merge_skill_cluster(skill_list)
+        organized.append(OrganizedSkill(
+            skill=skill,
+            tracks=[],  # Will be filled later
+            skill_id=slugify(skill.name),
+            merged_from=skill_provenance(skill_list)["merged_from"]
+        ))
 
     console.print(f"[green]✓ Deduplicated to {len(organized)} unique skills[/green]\n")
     return organized
@@ -302,7 +303,7 @@ def map_skills_to_tracks(
     return organized_skills
 
 
-def generate_skill_markdown(org_skill: OrganizedSkill, skills_dir: Path):
+def generate_skill_markdown(org_skill: OrganizedSkill, skills_dir: Path, writer: BulkWriter):
     """Generate markdown file for a skill"""
     # Create markdown content
     content = f"""# {org_skill.skill.name}
@@ -340,16 +341,11 @@ def generate_skill_markdown(org_skill: OrganizedSkill, skills_dir: Path):
 
     content += f"\n---\n\n*Sources: {', '.join(org_skill.merged_from)}*\n"
 
-    # Save to appropriate track directories
-    for track in org_skill.tracks:
-        track_dir = skills_dir / track
-        track_dir.mkdir(parents=True, exist_ok=True)
-
-        skill_file = track_dir / f"{org_skill.skill_id}.md"
-        skill_file.write_text(content, encoding="utf-8")
+    # Save to appropriate track directories (one file, linked into the others)
+    writer.add(content, [skills_dir / track / f"{org_skill.skill_id}.md" for track in org_skill.tracks])
 
 
-def generate_index(organized_skills: List[OrganizedSkill], skills_dir: Path):
+def generate_index(organized_skills: List[OrganizedSkill], skills_dir: Path, writer: BulkWriter):
     """Generate master index and track indexes"""
     # Master index
     content = "# Python Skills Catalog\n\n"
@@ -373,7 +369,7 @@ def generate_index(organized_skills: List[OrganizedSkill], skills_dir: Path):
             content += f"*({org_skill.skill.difficulty})*\n"
 
     # Save master index
-    (skills_dir / "index.md").write_text(content, encoding="utf-8")
+    writer.add(content, [skills_dir / "index.md"])
 
     # Create per-track indexes
     for track, skills in by_track.items():
@@ -393,7 +389,7 @@ def generate_index(organized_skills: List[OrganizedSkill], skills_dir: Path):
                 for org_skill in sorted(by_difficulty[difficulty], key=lambda s: s.skill.name):
                     track_content += f"- [{org_skill.skill.name}](./{org_skill.skill_id}.md)\n"
 
-        (track_dir / "index.md").write_text(track_content, encoding="utf-8")
+        writer.add(track_content, [track_dir / "index.md"])
 
 
 def main():
@@ -433,15 +429,20 @@ def main():
 
     # Generate markdown files
     console.print("\n[cyan]Generating skill markdown files...[/cyan]")
+    writer = BulkWriter(skills_dir, link_mode=os.getenv("OUTPUT_LINK_MODE", "hardlink").lower())
     for org_skill in organized_skills:
-        generate_skill_markdown(org_skill, skills_dir)
-
-    console.print(f"[green]✓ Generated {len(organized_skills)} skill files[/green]")
+        generate_skill_markdown(org_skill, skills_dir, writer)
 
     # Generate indexes
-    console.print("\n[cyan]Generating indexes...[/cyan]")
-    generate_index(organized_skills, skills_dir)
-    console.print("[green]✓ Generated master and track indexes[/green]")
+    generate_index(organized_skills, skills_dir, writer)
+
+    prune = os.getenv("PRUNE_OUTPUTS", "false").lower() == "true"
+    report = writer.commit(prune_glob="*.md" if prune else None)
+    console.print(
+        f"[green]✓ Generated {len(organized_skills)} skill files and indexes "
+        f"({report.written} written, {report.linked} linked, "
+        f"{report.skipped} unchanged, {report.removed} removed)[/green]"
+    )
 
     # Save metadata
     metadata = {
@@ -476,6 +477,13 @@ def main():
     console.print(f"\nSkills saved to: {skills_dir}")
     console.print(f"View master catalog: {skills_dir / 'index.md'}")
 
+    # Save telemetry report
+    mapper.telemetry.print_summary()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    mapper.telemetry.write_report(
+        project_root / "references" / "_telemetry" / f"organize_skills_{timestamp}.json"
+    )
+
 
 if __name__ == "__main__":
     main()
@@ -24,6 +24,7 @@ to well-structured markdown with preserved code blocks and formatting.
 import os
 import sys
 import asyncio
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 import json
@@ -35,6 +36,11 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from azure.ai.agents.responses import AzureOpenAIResponsesClient
 from pydantic import BaseModel
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from teaching_utils.agent_tools import load_pdf_pages  # noqa: E402
+from teaching_utils.normalization import normalize_pdf_pages, print_normalization_report  # noqa: E402
+from teaching_utils.telemetry import TelemetryRecorder  # noqa: E402
+
 
 console = Console()
 
@@ -94,6 +100,10 @@ class AzureOpenAIClient:
             sys.exit(1)
 
         self.agent = None
+        self.telemetry = TelemetryRecorder(
+            prompt_cost_per_1k=float(os.getenv("PROMPT_TOKEN_COST_PER_1K", "0")),
+            completion_cost_per_1k=float(os.getenv("COMPLETION_TOKEN_COST_PER_1K", "0"))
+        )
 
     async def create_markdown_agent(self):
         """Create an agent specialized in converting PDF text to markdown"""
@@ -133,11 +143,17 @@ Output only the cleaned markdown without any explanations."""
 
         return self.agent
 
-    async def process_text_chunk(self, text: str) -> str:
+    async def process_text_chunk(self, text: str, book_name: Optional[str] = None) -> str:
         """Process a text chunk through the agent"""
         try:
             prompt = f"Convert this PDF text to clean markdown:\n\n{text}"
-            response = await self.agent.run(prompt)
+            response = await self.telemetry.run_agent(
+                self.agent,
+                prompt,
+                role="pdf-to-markdown-converter",
+                stage="pdf_to_markdown",
+                book=book_name
+            )
             return str(response)
         except Exception as e:
             console.print(f"[yellow]Warning: Error processing chunk: {e}[/yellow]")
@@ -150,8 +166,8 @@ def extract_text_from_pdf(pdf_path: Path) -> list[str]:
     """Extract text from PDF, returning pages as list"""
     console.print(f"[cyan]Extracting text from {pdf_path.name}...[/cyan]")
 
-    reader = PdfReader(pdf_path)
-    pages = []
+    page_count = len(PdfReader(pdf_path).pages)
+    workers = int(os.getenv("PDF_EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
 
     with Progress(
         SpinnerColumn(),
@@ -159,15 +175,15 @@ def extract_text_from_pdf(pdf_path: Path) -> list[str]:
         console=console
     ) as progress:
         task = progress.add_task(
-            f"Reading {len(reader.pages)} pages...",
-            total=len(reader.pages)
+            f"Reading {page_count} pages...",
+            total=page_count
         )
 
-        for page_num, page in enumerate(reader.pages, 1):
-            text = page.extract_text()
-            if text.strip():
-                pages.append(text)
-            progress.update(task, advance=1)
+        pages = load_pdf_pages(
+            pdf_path,
+            max_workers=workers,
+            on_progress=lambda done: progress.update(task, advance=done)
+        )
 
     console.print(f"[green]✓ Extracted {len(pages)} pages[/green]")
     return pages
@@ -208,6 +224,12 @@ async def process_book(book: BookConfig, azure_client: AzureOpenAIClient, refere
     # Extract text from PDF
     pages = extract_text_from_pdf(pdf_path)
 
+    # Strip running headers, page numbers and hyphenation before chunking
+    if os.getenv("NORMALIZE_TEXT", "true").lower() == "true":
+        pages, report = normalize_pdf_pages(pages)
+        pages = [page for page in pages if page]
+        print_normalization_report(book.output_name, report)
+
     # Chunk pages for processing
     chunk_size = int(os.getenv("PDF_CHUNK_SIZE", "2000"))
     chunks = chunk_pages(pages, chunk_size)
@@ -228,7 +250,7 @@ async def process_book(book: BookConfig, azure_client: AzureOpenAIClient, refere
 
         for i, chunk in enumerate(chunks, 1):
             try:
-                markdown = await azure_client.process_text_chunk(chunk)
+                markdown = await azure_client.process_text_chunk(chunk, book.output_name)
                 markdown_chunks.append(f"<!-- Chunk {i} -->\n\n{markdown}")
                 progress.update(task, advance=1)
             except Exception as e:
@@ -316,6 +338,13 @@ async def main():
     console.print("\n[bold green]✓ Processing complete![/bold green]")
     console.print(f"Markdown files saved to: {references_dir / 'markdown'}")
 
+    # Save telemetry report
+    azure_client.telemetry.print_summary()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    azure_client.telemetry.write_report(
+        references_dir / "_telemetry" / f"pdf_to_markdown_{timestamp}.json"
+    )
+
 
 if __name__ == "__main__":
     asyncio.run(main())
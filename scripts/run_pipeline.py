@@ -8,24 +8,45 @@ Usage:
     python scripts/run_pipeline.py --step 2           # Run only skill extraction
     python scripts/run_pipeline.py --step 3           # Run only organization
     python scripts/run_pipeline.py --books "book1" "book2"  # Process specific books
+    python scripts/run_pipeline.py --profile          # Report wall vs CPU time per step
 """
 
+import resource
 import subprocess
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
 import argparse
+from typing import Optional
 
 from rich.console import Console
 from rich.panel import Panel
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from teaching_utils.profiling import WorkflowProfiler  # noqa: E402
+
 
 console = Console()
 
 
-def run_command(command: list, description: str) -> bool:
+def children_cpu_time() -> float:
+    """CPU seconds (user + system) used by finished child processes"""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_command(
+    command: list,
+    description: str,
+    profiler: Optional[WorkflowProfiler] = None,
+    stage: Optional[str] = None
+) -> bool:
     """Run a command and return success status"""
     console.print(Panel(description, style="bold cyan"))
 
+    start = time.perf_counter()
+    cpu_start = children_cpu_time()
     try:
         result = subprocess.run(
             command,
@@ -40,6 +61,31 @@ def run_command(command: list, description: str) -> bool:
     except KeyboardInterrupt:
         console.print("\n[yellow]Interrupted by user[/yellow]")
         return False
+    finally:
+        if profiler is not None:
+            profiler.record(
+                stage or description,
+                "pipeline",
+                wall_s=time.perf_counter() - start,
+                cpu_s=children_cpu_time() - cpu_start
+            )
+
+
+def write_profile(profiler: Optional[WorkflowProfiler], pipeline_start: float):
+    """Print and save the pipeline profile, if profiling"""
+    if profiler is None:
+        return
+
+    # Steps run as subprocesses: their CPU time comes from child rusage and
+    # the rest of their wall time was spent waiting (network, disk)
+    profiler.wall_s = time.perf_counter() - pipeline_start
+    profiler.process_cpu_s = sum(stage.cpu_s for stage in profiler.stages())
+    profiler.print_summary()
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    profiler.write_report(
+        Path(__file__).parent.parent / "references" / "_telemetry" / f"pipeline_profile_{timestamp}.json"
+    )
 
 
 def main():
@@ -55,6 +101,11 @@ def main():
         nargs="+",
         help="Specific books to process (for step 1)"
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report wall-clock vs CPU time per step and write a flamegraph profile"
+    )
 
     args = parser.parse_args()
 
@@ -67,33 +118,41 @@ def main():
         cmd = ["uv", "run", "python", "scripts/pdf_to_markdown.py"]
         if args.books:
             cmd.extend(args.books)
-        steps.append((cmd, "Step 1: PDF → Markdown Conversion"))
+        steps.append((cmd, "Step 1: PDF → Markdown Conversion", "pdf_to_markdown"))
 
     if args.step is None or args.step == 2:
         # Step 2: Extract Skills
         steps.append((
             ["uv", "run", "python", "scripts/extract_skills.py"],
-            "Step 2: Skill Extraction"
+            "Step 2: Skill Extraction",
+            "extract_skills"
         ))
 
     if args.step is None or args.step == 3:
         # Step 3: Organize & Map
         steps.append((
             ["uv", "run", "python", "scripts/organize_skills.py"],
-            "Step 3: Organize & Map to Tracks"
+            "Step 3: Organize & Map to Tracks",
+            "organize_skills"
         ))
 
+    profiler = WorkflowProfiler() if args.profile else None
+    pipeline_start = time.perf_counter()
+
     # Run each step
-    for i, (cmd, description) in enumerate(steps, 1):
-        success = run_command(cmd, description)
+    for i, (cmd, description, stage) in enumerate(steps, 1):
+        success = run_command(cmd, description, profiler, stage)
 
         if not success:
             console.print(f"[red]Pipeline stopped at step {i}[/red]")
+            write_profile(profiler, pipeline_start)
             sys.exit(1)
 
         if i < len(steps):
             console.print("[cyan]" + "="*60 + "[/cyan]\n")
 
+    write_profile(profiler, pipeline_start)
+
     # Success!
     console.print(Panel.fit(
         "[bold green]✓ Pipeline completed successfully![/bold green]\n\n"
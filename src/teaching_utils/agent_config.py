@@ -58,12 +58,44 @@ class AgentConfiguration:
 
         # Pipeline configuration
         self.chunk_size = int(os.getenv("PDF_CHUNK_SIZE", "8000"))
+        self.pdf_cleanup_mode = os.getenv("PDF_CLEANUP_MODE", "none").lower()
+        self.normalize_text = os.getenv("NORMALIZE_TEXT", "true").lower() == "true"
+        self.chunk_filter_threshold = float(os.getenv("CHUNK_FILTER_THRESHOLD", "0"))
+        self.chunking_mode = os.getenv("CHUNKING_MODE", "fixed").lower()
+        self.chunk_cache = os.getenv("CHUNK_CACHE", "on").lower()
+        self.segmentation_mode = os.getenv("SEGMENTATION_MODE", "chunks").lower()
+        self.pdf_extract_workers = int(os.getenv("PDF_EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+        self.tool_process_workers = int(os.getenv("TOOL_PROCESS_WORKERS", "0")) or os.cpu_count() or 1
+        self.tool_modes = {
+            name.strip(): mode.strip().lower()
+            for name, _, mode in (entry.partition("=") for entry in os.getenv("TOOL_MODES", "").split(","))
+            if mode.strip()
+        }
         self.max_concurrent_agents = int(os.getenv("MAX_CONCURRENT_AGENTS", "5"))
+        self.max_concurrent_books = int(os.getenv("MAX_CONCURRENT_BOOKS", "1"))
+        self.agent_max_retries = int(os.getenv("AGENT_MAX_RETRIES", "2"))
+        self.stream_queue_size = int(os.getenv("STREAM_QUEUE_SIZE", "32"))
+        self.dedup_threshold = float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.7"))
+        self.dedup_num_perm = int(os.getenv("DEDUP_NUM_PERM", "128"))
+        self.output_link_mode = os.getenv("OUTPUT_LINK_MODE", "hardlink").lower()
+        self.prune_outputs = os.getenv("PRUNE_OUTPUTS", "false").lower() == "true"
+        memory_budget = os.getenv("MEMORY_BUDGET_MB")
+        self.memory_budget_mb = float(memory_budget) if memory_budget else None
+        self.pdf_cache_dir = Path(os.getenv(
+            "PDF_CACHE_DIR",
+            str(Path(__file__).parent.parent.parent / "references" / "_pdf_cache")
+        ))
         self.checkpoint_dir = Path(os.getenv(
             "CHECKPOINT_DIR",
             str(Path(__file__).parent.parent.parent / "references" / "_checkpoints")
         ))
 
+        # Telemetry pricing (per 1,000 tokens)
+        self.prompt_token_cost = float(os.getenv("PROMPT_TOKEN_COST_PER_1K", "0"))
+        self.completion_token_cost = float(os.getenv("COMPLETION_TOKEN_COST_PER_1K", "0"))
+        cached_cost = os.getenv("CACHED_TOKEN_COST_PER_1K")
+        self.cached_token_cost = float(cached_cost) if cached_cost else None
+
         # Ensure checkpoint directory exists
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
 
@@ -155,7 +187,25 @@ class AgentConfiguration:
         console.print(f"API Version: {self.api_version}")
         console.print(f"Using Managed Identity: {self.use_managed_identity}")
         console.print(f"Chunk Size: {self.chunk_size}")
+        console.print(f"PDF Cleanup Mode: {self.pdf_cleanup_mode}")
+        console.print(f"Normalize Text: {self.normalize_text}")
+        console.print(f"Chunk Filter Threshold: {self.chunk_filter_threshold or 'off'}")
+        console.print(f"Chunking Mode: {self.chunking_mode}")
+        console.print(f"Chunk Cache: {self.chunk_cache}")
+        console.print(f"Segmentation Mode: {self.segmentation_mode}")
+        console.print(f"PDF Extract Workers: {self.pdf_extract_workers}")
+        console.print(f"PDF Cache Directory: {self.pdf_cache_dir}")
+        console.print(f"Tool Process Workers: {self.tool_process_workers}")
+        console.print(f"Tool Modes: {self.tool_modes or 'defaults'}")
         console.print(f"Max Concurrent Agents: {self.max_concurrent_agents}")
+        console.print(f"Max Concurrent Books: {self.max_concurrent_books}")
+        console.print(f"Agent Max Retries: {self.agent_max_retries}")
+        console.print(f"Stream Queue Size: {self.stream_queue_size}")
+        console.print(f"Dedup Similarity Threshold: {self.dedup_threshold}")
+        console.print(f"Dedup MinHash Permutations: {self.dedup_num_perm}")
+        console.print(f"Output Link Mode: {self.output_link_mode}")
+        console.print(f"Prune Outputs: {self.prune_outputs}")
+        console.print(f"Memory Budget (MB): {self.memory_budget_mb or 'none'}")
         console.print(f"Checkpoint Directory: {self.checkpoint_dir}")
 
 
@@ -5,32 +5,263 @@ Provides @ai_function decorated tools that agents can use for PDF processing,
 skill extraction, validation, and organization tasks.
 """
 
+import bisect
 import json
+import math
+import os
 import re
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
 from pathlib import Path
-from typing import Annotated, List, Dict, Any, Optional
+from typing import (
+    Annotated, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+)
 
 from pydantic import BaseModel, Field
 from pypdf import PdfReader
 from rich.console import Console
 
+from .artifacts import file_sha256
+from .normalization import is_code_line, normalize_pdf_pages
+from .pdf_cache import PdfPageCache
+
 
 console = Console()
 
 
+# Bump when extraction or validation rules change so cached stage outputs
+# produced by the old rules are not reused
+PDF_TEXT_EXTRACTOR_VERSION = 1
+SKILL_SCHEMA_VERSION = 1
+
+
 # Note: @ai_function decorator from agent_framework
 # Will be imported when agent_framework package is installed
 # For now, we'll define tools as regular functions with proper type hints
 # and add decorators in the migration phase
 
 
-def extract_pdf_text(pdf_path: Annotated[str, Field(description="Path to PDF file")]) -> str:
+def _resolve_page_range(page_count: int, start_page: int, end_page: Optional[int]) -> int:
+    """Validate a 1-based page range and return its last page"""
+    end_page = page_count if end_page is None else min(end_page, page_count)
+    if start_page < 1 or start_page > max(end_page, 1):
+        raise ValueError(f"Invalid page range {start_page}-{end_page} for {page_count} pages")
+    return end_page
+
+
+def iter_pdf_pages(
+    pdf_path: Path,
+    start_page: int = 1,
+    end_page: Optional[int] = None
+) -> Iterator[Tuple[int, str]]:
     """
-    Extract all text content from a PDF file.
+    Lazily extract page text, one page at a time.
+
+    Pages are parsed only as the caller asks for them, so the first pages
+    can be processed before the rest of the book is read. This is a
+    blocking, CPU-bound generator; drive it from a worker thread in async
+    code.
+
+    Args:
+        pdf_path: Path to the PDF file
+        start_page: First page to read (1-based)
+        end_page: Last page to read, inclusive (defaults to the last page)
+
+    Yields:
+        Tuples of (page_number, text), skipping blank pages
+    """
+    reader = PdfReader(pdf_path)
+    end_page = _resolve_page_range(len(reader.pages), start_page, end_page)
+
+    for page_number in range(start_page, end_page + 1):
+        text = reader.pages[page_number - 1].extract_text()
+        if text.strip():
+            yield page_number, text
+
+
+def read_pdf_pages(pdf_path: Path) -> List[str]:
+    """
+    Read the non-empty text of every page, parsing each page exactly once.
+
+    This is a blocking, CPU-bound call; run it in a worker thread from
+    async code.
 
     Args:
         pdf_path: Path to the PDF file
 
+    Returns:
+        List of page texts, skipping blank pages
+    """
+    return [text for _, text in iter_pdf_pages(pdf_path)]
+
+
+def _extract_page_shard(shard: Tuple[str, int, int]) -> List[Tuple[int, str]]:
+    """Read one contiguous page range in a worker process"""
+    pdf_path, start_page, end_page = shard
+    return list(iter_pdf_pages(Path(pdf_path), start_page, end_page))
+
+
+def _read_page_items(
+    pdf_path: Path,
+    page_count: int,
+    max_workers: Optional[int],
+    start_page: int,
+    end_page: Optional[int],
+    pages_per_shard: Optional[int] = None,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> List[Tuple[int, str]]:
+    """Read (page_number, text) for a page range, sharded across processes"""
+    end_page = _resolve_page_range(page_count, start_page, end_page)
+    total = end_page - start_page + 1
+    workers = min(max_workers or os.cpu_count() or 1, max(total, 1))
+
+    if workers <= 1:
+        items = list(iter_pdf_pages(pdf_path, start_page, end_page))
+        if on_progress:
+            on_progress(total)
+        return items
+
+    # Several shards per worker keep cores busy when page costs are uneven
+    shard_size = pages_per_shard or max(1, math.ceil(total / (workers * 4)))
+    shards = [
+        (str(pdf_path), first, min(first + shard_size - 1, end_page))
+        for first in range(start_page, end_page + 1, shard_size)
+    ]
+
+    items: List[Tuple[int, str]] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for (_, first, last), shard_items in zip(shards, executor.map(_extract_page_shard, shards)):
+            items.extend(shard_items)
+            if on_progress:
+                on_progress(last - first + 1)
+
+    return items
+
+
+def read_pdf_pages_parallel(
+    pdf_path: Path,
+    max_workers: Optional[int] = None,
+    start_page: int = 1,
+    end_page: Optional[int] = None,
+    pages_per_shard: Optional[int] = None,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> List[str]:
+    """
+    Read page text across a process pool, one shard of pages per task.
+
+    Each worker opens the PDF itself, so only file paths and page text cross
+    process boundaries. Shards are returned in page order, giving the same
+    result as read_pdf_pages. Falls back to reading in this process when
+    there is a single worker or too few pages to split.
+
+    Args:
+        pdf_path: Path to the PDF file
+        max_workers: Worker processes (defaults to one per CPU core)
+        start_page: First page to read (1-based)
+        end_page: Last page to read, inclusive (defaults to the last page)
+        pages_per_shard: Pages per task (defaults to about four shards per worker)
+        on_progress: Called with the number of pages finished after each shard
+
+    Returns:
+        List of page texts in page order, skipping blank pages
+    """
+    items = _read_page_items(
+        pdf_path, len(PdfReader(pdf_path).pages), max_workers,
+        start_page, end_page, pages_per_shard, on_progress
+    )
+    return [text for _, text in items]
+
+
+def load_pdf_page_items(
+    pdf_path: Path,
+    max_workers: Optional[int] = None,
+    start_page: int = 1,
+    end_page: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> List[Tuple[int, str]]:
+    """
+    Read (page_number, text) through the on-disk page cache.
+
+    Cache entries are keyed by the PDF's content hash and
+    PDF_TEXT_EXTRACTOR_VERSION. On a miss the whole book is extracted with
+    read_pdf_pages_parallel and cached; a page-range miss extracts only
+    that range and is not cached.
+
+    Args:
+        pdf_path: Path to the PDF file
+        max_workers: Worker processes used on a cache miss
+        start_page: First page to read (1-based)
+        end_page: Last page to read, inclusive (defaults to the last page)
+        cache_dir: Cache directory (defaults to PDF_CACHE_DIR)
+        on_progress: Called with the number of pages finished
+
+    Returns:
+        (page_number, text) in page order, skipping blank pages
+    """
+    pdf_path = Path(pdf_path)
+    pdf_hash = file_sha256(pdf_path)
+    cache = PdfPageCache(cache_dir, extractor_version=PDF_TEXT_EXTRACTOR_VERSION)
+
+    cached = cache.get(pdf_hash, start_page, end_page)
+    if cached is not None:
+        page_count, items = cached
+        last = _resolve_page_range(page_count, start_page, end_page)
+        if on_progress:
+            on_progress(last - start_page + 1)
+        return items
+
+    page_count = len(PdfReader(pdf_path).pages)
+    whole_book = start_page == 1 and (end_page is None or end_page >= page_count)
+    items = _read_page_items(
+        pdf_path, page_count, max_workers, start_page, end_page, on_progress=on_progress
+    )
+    if whole_book:
+        cache.put(pdf_hash, page_count, items)
+
+    return items
+
+
+def load_pdf_pages(
+    pdf_path: Path,
+    max_workers: Optional[int] = None,
+    start_page: int = 1,
+    end_page: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> List[str]:
+    """
+    Read page text through the on-disk page cache.
+
+    Same as load_pdf_page_items without the page numbers.
+
+    Returns:
+        List of page texts in page order, skipping blank pages
+    """
+    items = load_pdf_page_items(pdf_path, max_workers, start_page, end_page, cache_dir, on_progress)
+    return [text for _, text in items]
+
+
+def extract_pdf_text(
+    pdf_path: Annotated[str, Field(description="Path to PDF file")],
+    start_page: Annotated[int, Field(description="First page to extract (1-based)")] = 1,
+    end_page: Annotated[Optional[int], Field(description="Last page to extract, inclusive")] = None
+) -> str:
+    """
+    Extract text content from a PDF file, optionally for a page range.
+
+    Returns the whole text, so it is meant for pipeline code; agents use
+    open_pdf_document and read_document_chunk instead.
+
+    Args:
+        pdf_path: Path to the PDF file
+        start_page: First page to extract (1-based)
+        end_page: Last page to extract, inclusive (defaults to the last page)
+
     Returns:
         Extracted text as a single string
     """
@@ -39,13 +270,7 @@ def extract_pdf_text(pdf_path: Annotated[str, Field(description="Path to PDF fil
         if not path.exists():
             return f"Error: PDF file not found at {pdf_path}"
 
-        reader = PdfReader(path)
-        text_chunks = []
-
-        for page in reader.pages:
-            text = page.extract_text()
-            if text.strip():
-                text_chunks.append(text)
+        text_chunks = load_pdf_pages(path, start_page=start_page, end_page=end_page)
 
         result = "\n\n".join(text_chunks)
         console.print(f"[dim]Extracted {len(text_chunks)} pages from {path.name}[/dim]")
@@ -55,6 +280,222 @@ def extract_pdf_text(pdf_path: Annotated[str, Field(description="Path to PDF fil
         return f"Error extracting PDF text: {str(e)}"
 
 
+def iter_chunks(
+    segments: Iterable[str],
+    chunk_size: int = 8000,
+    overlap: int = 200,
+    separator: str = "\n\n"
+) -> Iterator[str]:
+    """
+    Chunk a stream of text segments (e.g. pages) without joining them first.
+
+    Produces exactly the chunks chunk_content would produce for
+    ``separator.join(segments)``, while holding at most about one chunk
+    plus one segment in memory.
+
+    Args:
+        segments: Text pieces in order, such as page texts from iter_pdf_pages
+        chunk_size: Maximum characters per chunk
+        overlap: Overlap size between consecutive chunks
+        separator: Text placed between segments
+
+    Yields:
+        Text chunks
+    """
+    pieces = iter(segments)
+    buffer = ""
+    exhausted = False
+    first = True
+
+    while True:
+        # Read until the buffer extends past this chunk or the input ends
+        while len(buffer) <= chunk_size and not exhausted:
+            segment = next(pieces, None)
+            if segment is None:
+                exhausted = True
+            else:
+                buffer = segment if first else buffer + separator + segment
+                first = False
+
+        if not buffer:
+            return
+
+        end = chunk_size
+        more = end < len(buffer)
+
+        # Try to break at paragraph boundaries
+        if more:
+            paragraph_break = buffer.rfind('\n\n', max(0, end - 200), end)
+            if paragraph_break > 0:
+                end = paragraph_break
+
+        chunk = buffer[:end].strip()
+        if chunk:
+            yield chunk
+
+        if not more:
+            return
+
+        # Move to next chunk with overlap
+        buffer = buffer[end - overlap:]
+
+
+class ChunkSpan(NamedTuple):
+    """Character offsets [start, end) of one chunk in its source text"""
+    start: int
+    end: int
+
+    def text(self, source: str, limit: Optional[int] = None) -> str:
+        """
+        Materialize the chunk's text.
+
+        Args:
+            source: Text the span was computed over
+            limit: Return at most this many leading characters
+
+        Returns:
+            The chunk text
+        """
+        end = self.end if limit is None else min(self.end, self.start + limit)
+        return source[self.start:end]
+
+
+def iter_chunk_spans(
+    content: str,
+    chunk_size: int = 8000,
+    overlap: int = 200
+) -> Iterator[ChunkSpan]:
+    """
+    Lazily compute chunk boundaries without copying any text.
+
+    Spans match chunk_content exactly: ``span.text(content)`` is the chunk
+    chunk_content would return, already stripped of surrounding whitespace.
+
+    Args:
+        content: Text to split
+        chunk_size: Maximum characters per chunk
+        overlap: Overlap size between consecutive chunks
+
+    Yields:
+        Chunk spans in order
+    """
+    start = 0
+    length = len(content)
+
+    while start < length:
+        end = start + chunk_size
+        more = end < length
+
+        # Try to break at paragraph boundaries
+        if more:
+            paragraph_break = content.rfind('\n\n', max(start, end - 200), end)
+            if paragraph_break > start:
+                end = paragraph_break
+
+        span = _trimmed_span(content, start, min(end, length))
+        if span:
+            yield span
+
+        # Move to next chunk with overlap
+        start = end - overlap if more else length
+
+
+def _trimmed_span(content: str, start: int, end: int) -> Optional[ChunkSpan]:
+    """Trim whitespace by moving offsets instead of calling strip()"""
+    while start < end and content[start].isspace():
+        start += 1
+    while end > start and content[end - 1].isspace():
+        end -= 1
+    return ChunkSpan(start, end) if end > start else None
+
+
+# Chance that a paragraph or line break becomes a chunk boundary before and
+# after the chunk reaches its target size, as thresholds on a 32-bit hash.
+# Line breaks are rarely used, so boundaries land on paragraph breaks when
+# the text has them.
+_CDC_THRESHOLDS = {
+    "paragraph": (2**32 // 16, 2**32 // 2),
+    "line": (2**32 // 256, 2**32 // 16),
+}
+_TEXT_BREAK = re.compile(r'(?P<paragraph>\n\n)|(?P<line>\n)')
+
+
+def iter_content_defined_spans(
+    content: str,
+    target_size: int = 8000,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    window: int = 64
+) -> Iterator[ChunkSpan]:
+    """
+    Lazily compute content-defined chunk boundaries.
+
+    Boundaries are only placed at paragraph breaks (or, more rarely, line
+    breaks), and whether a break becomes a boundary depends on a hash of
+    the ``window`` characters before it, not on its absolute position. An
+    edit therefore only moves the boundaries near it; chunks elsewhere in
+    the text come out byte-identical, so caches keyed by chunk text keep
+    hitting. A chunk that reaches ``max_size`` is cut at its last paragraph
+    break, else its last line break, else at ``max_size``. Chunks do not
+    overlap.
+
+    Args:
+        content: Text to split
+        target_size: Typical chunk size in characters
+        min_size: No boundary before this many characters (default target/4)
+        max_size: Hard limit on chunk size (default 2 * target)
+        window: Characters hashed before each break
+
+    Yields:
+        Chunk spans in order, stripped of surrounding whitespace
+    """
+    min_size = target_size // 4 if min_size is None else min_size
+    max_size = target_size * 2 if max_size is None else max_size
+
+    start = 0
+    last_breaks: Dict[str, int] = {}
+
+    def cut(position: int) -> Optional[ChunkSpan]:
+        nonlocal start
+        span = _trimmed_span(content, start, position)
+        start = position
+        last_breaks.clear()
+        return span
+
+    def force_cuts(position: int) -> Iterator[ChunkSpan]:
+        # Split off chunks until the text up to position fits in max_size
+        while position - start > max_size:
+            fallback = last_breaks.get("paragraph", last_breaks.get("line", start + max_size))
+            span = cut(fallback)
+            if span:
+                yield span
+
+    for match in _TEXT_BREAK.finditer(content):
+        position = match.start()
+        yield from force_cuts(position)
+
+        size = position - start
+        if size <= 0:
+            continue
+
+        kind = match.lastgroup
+        if size >= min_size:
+            digest = zlib.crc32(content[max(0, position - window):position].encode("utf-8"))
+            early, late = _CDC_THRESHOLDS[kind]
+            if digest < (early if size < target_size else late):
+                span = cut(position)
+                if span:
+                    yield span
+                continue
+
+        last_breaks[kind] = position
+
+    yield from force_cuts(len(content))
+    span = cut(len(content))
+    if span:
+        yield span
+
+
 def chunk_content(
     content: Annotated[str, Field(description="Text content to chunk")],
     chunk_size: Annotated[int, Field(description="Maximum chunk size in characters")] = 8000,
@@ -71,94 +512,623 @@ def chunk_content(
     Returns:
         List of text chunks
     """
-    if not content:
+    chunks = [span.text(content) for span in iter_chunk_spans(content, chunk_size, overlap)]
+
+    console.print(f"[dim]Split content into {len(chunks)} chunks[/dim]")
+    return chunks
+
+
+FRONT_MATTER_SECTION = "Front Matter"
+
+
+class PdfSection(BaseModel):
+    """A run of pages under one outline entry"""
+    path: List[str]
+    start_page: int
+    end_page: int
+
+    @property
+    def label(self) -> str:
+        """Section path as shown to agents and stored on skills"""
+        return " > ".join(self.path) if self.path else FRONT_MATTER_SECTION
+
+
+class SectionChunk(BaseModel):
+    """A chunk of text that lies entirely within one section"""
+    text: str
+    section: str
+    chapter: str
+
+
+def read_pdf_outline(pdf_path: Path) -> List[PdfSection]:
+    """
+    Segment a PDF into sections using its outline (bookmarks).
+
+    Each outline entry owns the pages from its own page up to the page
+    before the next entry. An entry followed by a child on the same page
+    has no pages of its own and is only kept as part of its children's
+    paths. Pages before the first entry become a front matter section.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        Sections in page order, or an empty list if the PDF has no outline
+    """
+    reader = PdfReader(pdf_path)
+    entries: List[Tuple[int, List[str]]] = []
+
+    def walk(items: list, parents: List[str]):
+        path = parents
+        for item in items:
+            if isinstance(item, list):
+                walk(item, path)
+                continue
+            try:
+                page_number = reader.get_destination_page_number(item) + 1
+            except Exception:
+                continue
+            path = parents + [str(item.title).strip()]
+            entries.append((page_number, path))
+
+    try:
+        walk(reader.outline, [])
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not read outline of {Path(pdf_path).name}: {e}[/yellow]")
         return []
 
-    chunks = []
-    start = 0
-    content_length = len(content)
+    if not entries:
+        return []
 
-    while start < content_length:
-        end = start + chunk_size
+    # Stable sort keeps parents ahead of children that start on the same page
+    entries.sort(key=lambda entry: entry[0])
+    page_count = len(reader.pages)
 
-        # Try to break at paragraph boundaries
-        if end < content_length:
-            # Look for paragraph break near the end
-            search_start = max(start, end - 200)
-            paragraph_break = content.rfind('\n\n', search_start, end)
+    sections = []
+    if entries[0][0] > 1:
+        sections.append(PdfSection(path=[], start_page=1, end_page=entries[0][0] - 1))
 
-            if paragraph_break > start:
-                end = paragraph_break
+    for index, (start_page, path) in enumerate(entries):
+        end_page = entries[index + 1][0] - 1 if index + 1 < len(entries) else page_count
+        if end_page >= start_page:
+            sections.append(PdfSection(path=path, start_page=start_page, end_page=end_page))
 
-        chunk = content[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
+    return sections
 
-        # Move to next chunk with overlap
-        start = end - overlap if end < content_length else content_length
 
-    console.print(f"[dim]Split content into {len(chunks)} chunks[/dim]")
+def chunk_pdf_sections(
+    pdf_path: Path,
+    chunk_size: int = 8000,
+    overlap: int = 200,
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+    content_defined: bool = False,
+    normalize: bool = False
+) -> List[SectionChunk]:
+    """
+    Chunk a PDF section by section, so no chunk crosses a section boundary.
+
+    Page text is read through the page cache. Each chunk carries the exact
+    outline path of the section it came from.
+
+    Args:
+        pdf_path: Path to the PDF file
+        chunk_size: Maximum characters per chunk
+        overlap: Overlap size between consecutive chunks of a section
+        max_workers: Worker processes used on a page cache miss
+        cache_dir: Page cache directory
+        content_defined: Use content-defined boundaries within each section
+            (chunk_size is then the maximum and overlap is ignored)
+        normalize: Strip running headers, page numbers and hyphenation from
+            the pages first (see normalize_pdf_pages)
+
+    Returns:
+        Chunks in page order, or an empty list if the PDF has no outline
+    """
+    sections = read_pdf_outline(pdf_path)
+    if not sections:
+        return []
+
+    items = load_pdf_page_items(pdf_path, max_workers, cache_dir=cache_dir)
+    if normalize:
+        texts, _ = normalize_pdf_pages([text for _, text in items])
+        items = [(number, text) for (number, _), text in zip(items, texts) if text]
+    page_numbers = [page_number for page_number, _ in items]
+
+    chunks = []
+    for section in sections:
+        first = bisect.bisect_left(page_numbers, section.start_page)
+        last = bisect.bisect_right(page_numbers, section.end_page)
+        texts = [text for _, text in items[first:last]]
+        chapter = section.path[0] if section.path else FRONT_MATTER_SECTION
+
+        if content_defined:
+            section_text = "\n\n".join(texts)
+            spans = iter_content_defined_spans(section_text, chunk_size // 2, max_size=chunk_size)
+            section_chunks = (span.text(section_text) for span in spans)
+        else:
+            section_chunks = iter_chunks(texts, chunk_size, overlap)
+
+        for text in section_chunks:
+            chunks.append(SectionChunk(text=text, section=section.label, chapter=chapter))
+
+    console.print(
+        f"[dim]Split {len(sections)} outline sections into {len(chunks)} chunks[/dim]"
+    )
     return chunks
 
 
-def validate_skill_structure(
-    skill_data: Annotated[str, Field(description="JSON string of skill data")]
+# Tools below hand agents compact handles instead of document text: a
+# document id, page ranges, chunk ids and short previews. Agents fetch the
+# chunks they need one at a time, so tool results stay small however large
+# the book is. The text itself stays in this process, in the document
+# registry of the current scope (see document_scope).
+DOCUMENT_PREVIEW_CHARS = 160
+DOCUMENT_READ_LIMIT = 12000
+_MAX_OPEN_DOCUMENTS = 8
+
+
+class OpenDocument(BaseModel):
+    """Text and chunk layout of a PDF opened through open_pdf_document"""
+    document_id: str
+    pdf_path: str
+    page_count: int
+    content: str
+    page_numbers: List[int]
+    page_starts: List[int]
+    spans: List[ChunkSpan]
+    sections: List[PdfSection]
+
+    def pages_of(self, span: ChunkSpan) -> Tuple[int, int]:
+        """First and last page a span of content falls on"""
+        first = bisect.bisect_right(self.page_starts, span.start) - 1
+        last = bisect.bisect_right(self.page_starts, max(span.end - 1, span.start)) - 1
+        return self.page_numbers[max(first, 0)], self.page_numbers[max(last, 0)]
+
+
+class DocumentRegistry:
+    """
+    Documents opened in one scope (a workflow run or a book).
+
+    Holds at most max_documents documents and closes the least recently
+    used one when another is opened. Safe to use from tool threads.
+    """
+
+    def __init__(self, max_documents: int = _MAX_OPEN_DOCUMENTS):
+        """
+        Initialize the registry.
+
+        Args:
+            max_documents: Documents kept open at once
+        """
+        self.max_documents = max_documents
+        self._documents: Dict[str, OpenDocument] = {}
+        self._closed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, document: OpenDocument):
+        """Register a document, closing the least recently used if full"""
+        with self._lock:
+            self._documents.pop(document.document_id, None)
+            self._documents[document.document_id] = document
+            self._closed.discard(document.document_id)
+            while len(self._documents) > self.max_documents:
+                closed = next(iter(self._documents))
+                del self._documents[closed]
+                self._closed.add(closed)
+
+    def get(self, document_id: str) -> Optional[OpenDocument]:
+        """Look up a document and mark it as recently used"""
+        with self._lock:
+            document = self._documents.pop(document_id, None)
+            if document is not None:
+                self._documents[document_id] = document
+            return document
+
+    def missing_reason(self, document_id: str) -> str:
+        """Explain why a document id is not open"""
+        if document_id in self._closed:
+            return (
+                f"Document {document_id} was closed because more than "
+                f"{self.max_documents} documents were open. Call open_pdf_document again."
+            )
+        return f"Unknown document id: {document_id}. Call open_pdf_document first."
+
+    def clear(self):
+        """Close every document"""
+        with self._lock:
+            self._documents.clear()
+            self._closed.clear()
+
+
+# Registry for tool calls outside any document_scope (e.g. scripts)
+_default_documents = DocumentRegistry()
+_current_documents: ContextVar[Optional[DocumentRegistry]] = ContextVar(
+    "current_documents", default=None
+)
+
+
+def current_documents() -> DocumentRegistry:
+    """Document registry of the current scope"""
+    registry = _current_documents.get()
+    return _default_documents if registry is None else registry
+
+
+@contextmanager
+def document_scope(max_documents: int = _MAX_OPEN_DOCUMENTS) -> Iterator[DocumentRegistry]:
+    """
+    Give the enclosed code its own document registry.
+
+    Tool calls made inside the scope, including from tasks and worker
+    threads started in it, only see documents opened in it. The documents
+    are closed when the scope exits.
+
+    Args:
+        max_documents: Documents kept open at once
+
+    Yields:
+        The scope's registry
+    """
+    registry = DocumentRegistry(max_documents)
+    token = _current_documents.set(registry)
+    try:
+        yield registry
+    finally:
+        _current_documents.reset(token)
+        registry.clear()
+
+
+def get_open_document(document_id: str) -> Optional[OpenDocument]:
+    """Look up a document opened with open_pdf_document in the current scope"""
+    return current_documents().get(document_id)
+
+
+def _preview(text: str, limit: int = DOCUMENT_PREVIEW_CHARS) -> str:
+    """Collapse whitespace and cut text down to a short preview"""
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def _capped(text: str, max_chars: int) -> str:
+    """Cut text to max_chars, saying how much was left out"""
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}\n\n[... {len(text) - max_chars:,} more characters not shown]"
+
+
+def open_pdf_document(
+    pdf_path: Annotated[str, Field(description="Path to PDF file")],
+    chunk_size: Annotated[int, Field(description="Maximum chunk size in characters")] = 8000,
+    overlap: Annotated[int, Field(description="Overlap between chunks")] = 200,
+    normalize: Annotated[bool, Field(description="Strip running headers, page numbers and hyphenation")] = True
 ) -> Dict[str, Any]:
     """
-    Validate that a skill has all required fields and proper structure.
+    Open a PDF and return a handle to it instead of its text.
+
+    Page text is read through the page cache and split into chunks that
+    later calls refer to by id. The document id is derived from the file's
+    content hash, so reopening the same book returns the same id. The
+    document is only visible within the current document_scope.
 
     Args:
-        skill_data: JSON string containing skill information
+        pdf_path: Path to the PDF file
+        chunk_size: Maximum characters per chunk
+        overlap: Overlap size between consecutive chunks
+        normalize: Normalize page text first (see normalize_pdf_pages)
 
     Returns:
-        Validation result with is_valid flag and error messages
+        Document id, page and chunk counts and the outline sections with
+        their page ranges, or an error
     """
-    required_fields = [
-        "name", "description", "category", "difficulty",
-        "key_concepts", "source_section"
-    ]
+    try:
+        path = Path(pdf_path)
+        if not path.exists():
+            return {"error": f"PDF file not found at {pdf_path}"}
+
+        document_id = f"doc_{file_sha256(path)[:16]}"
+        items = load_pdf_page_items(path)
+        if normalize:
+            texts, _ = normalize_pdf_pages([text for _, text in items])
+            items = [(number, text) for (number, _), text in zip(items, texts) if text]
+
+        page_starts = []
+        offset = 0
+        for _, text in items:
+            page_starts.append(offset)
+            offset += len(text) + 2
+        content = "\n\n".join(text for _, text in items)
+
+        document = OpenDocument(
+            document_id=document_id,
+            pdf_path=str(path),
+            page_count=len(PdfReader(path).pages),
+            content=content,
+            page_numbers=[number for number, _ in items],
+            page_starts=page_starts,
+            spans=list(iter_chunk_spans(content, chunk_size, overlap)),
+            sections=read_pdf_outline(path)
+        )
+    except Exception as e:
+        return {"error": f"Error opening PDF: {str(e)}"}
+
+    current_documents().add(document)
+
+    console.print(
+        f"[dim]Opened {path.name} as {document_id}: "
+        f"{len(items)} pages, {len(document.spans)} chunks[/dim]"
+    )
+    return {
+        "document_id": document_id,
+        "file": path.name,
+        "page_count": document.page_count,
+        "pages_with_text": len(items),
+        "characters": len(content),
+        "chunk_count": len(document.spans),
+        "sections": [
+            {"section": section.label, "start_page": section.start_page, "end_page": section.end_page}
+            for section in document.sections
+        ]
+    }
+
+
+def list_document_chunks(
+    document_id: Annotated[str, Field(description="Document id from open_pdf_document")],
+    start: Annotated[int, Field(description="First chunk id to list")] = 0,
+    limit: Annotated[int, Field(description="Maximum chunks to list")] = 20
+) -> Dict[str, Any]:
+    """
+    List chunk ids of an open document with page ranges and short previews.
+
+    Args:
+        document_id: Id returned by open_pdf_document
+        start: First chunk id to list
+        limit: Maximum number of chunks to list
+
+    Returns:
+        Chunk entries and the id to continue from (None after the last chunk)
+    """
+    document = get_open_document(document_id)
+    if document is None:
+        return {"error": current_documents().missing_reason(document_id)}
+
+    start = max(start, 0)
+    end = min(start + max(limit, 1), len(document.spans))
+    chunks = []
+    for chunk_id in range(start, end):
+        span = document.spans[chunk_id]
+        start_page, end_page = document.pages_of(span)
+        chunks.append({
+            "chunk_id": chunk_id,
+            "start_page": start_page,
+            "end_page": end_page,
+            "characters": span.end - span.start,
+            "preview": _preview(span.text(document.content, DOCUMENT_PREVIEW_CHARS * 2))
+        })
+
+    return {
+        "document_id": document_id,
+        "chunk_count": len(document.spans),
+        "chunks": chunks,
+        "next_start": end if end < len(document.spans) else None
+    }
+
+
+def read_document_chunk(
+    document_id: Annotated[str, Field(description="Document id from open_pdf_document")],
+    chunk_id: Annotated[int, Field(description="Chunk id from list_document_chunks")],
+    max_chars: Annotated[int, Field(description="Maximum characters to return")] = DOCUMENT_READ_LIMIT
+) -> str:
+    """
+    Fetch the text of one chunk of an open document.
+
+    Args:
+        document_id: Id returned by open_pdf_document
+        chunk_id: Chunk id returned by list_document_chunks
+        max_chars: Maximum characters to return
+
+    Returns:
+        Chunk text, or an error message
+    """
+    document = get_open_document(document_id)
+    if document is None:
+        return f"Error: {current_documents().missing_reason(document_id)}"
+    if not 0 <= chunk_id < len(document.spans):
+        return f"Error: chunk_id must be between 0 and {len(document.spans) - 1}"
+
+    return _capped(document.spans[chunk_id].text(document.content), max_chars)
+
+
+def read_document_pages(
+    document_id: Annotated[str, Field(description="Document id from open_pdf_document")],
+    start_page: Annotated[int, Field(description="First page to read (1-based)")],
+    end_page: Annotated[Optional[int], Field(description="Last page to read, inclusive")] = None,
+    max_chars: Annotated[int, Field(description="Maximum characters to return")] = DOCUMENT_READ_LIMIT
+) -> str:
+    """
+    Fetch the text of a page range of an open document.
+
+    Args:
+        document_id: Id returned by open_pdf_document
+        start_page: First page to read (1-based)
+        end_page: Last page to read, inclusive (defaults to start_page)
+        max_chars: Maximum characters to return
 
-    valid_difficulties = ["beginner", "intermediate", "advanced"]
+    Returns:
+        Page text, or an error message
+    """
+    document = get_open_document(document_id)
+    if document is None:
+        return f"Error: {current_documents().missing_reason(document_id)}"
 
     try:
-        skill = json.loads(skill_data)
+        end_page = _resolve_page_range(
+            document.page_count, start_page, start_page if end_page is None else end_page
+        )
+    except ValueError as e:
+        return f"Error: {str(e)}"
+
+    first = bisect.bisect_left(document.page_numbers, start_page)
+    last = bisect.bisect_right(document.page_numbers, end_page)
+    if first == last:
+        return f"Pages {start_page}-{end_page} have no text"
+
+    end = document.page_starts[last] - 2 if last < len(document.page_starts) else len(document.content)
+    return _capped(document.content[document.page_starts[first]:end], max_chars)
+
+
+# Bump when score_chunk's rules change so identify results filtered by the
+# old rules are not reused
+CHUNK_FILTER_VERSION = 3
+
+_PAGE_REFERENCE_LINE = re.compile(r"(\.{2,}|\s|,)\s*\d{1,4}(\s*[-–,]\s*\d{1,4})*\s*$")
+_CITATION_LINE = re.compile(r"\b(1[89]|20)\d{2}[a-z]?\)?\.?\s*$")
+# Front/back matter notices and headings, matched against whole short lines
+# only so ordinary prose ("the value is printed in the console") never counts
+_BOILERPLATE_LINE = re.compile(
+    r"(copyright\s*(©|\(c\)|\d{4}).*|©\s*\d{4}.*|all rights reserved\.?"
+    r"|isbn(-1[03])?:?\s*[\dx-]{10,}.*|library of congress cataloging\b.*"
+    r"|printed (and bound )?in (the )?(united states|usa|u\.s\.a\.|great britain|the uk|china|canada)\b.*"
+    r"|(acknowledg(e)?ments?|dedication|bibliography|table of contents|contents|index|references))",
+    re.IGNORECASE
+)
+_BOILERPLATE_MAX_LINE = 80
+_WORD = re.compile(r"[A-Za-z][A-Za-z'-]*")
+
+
+class ChunkScore(BaseModel):
+    """How likely a chunk is to teach something, from local text signals"""
+    score: float
+    instructional: bool
+    reason: str
+    signals: Dict[str, float]
+
+
+def score_chunk(text: str, threshold: float = 0.2) -> ChunkScore:
+    """
+    Score a chunk for instructional content without calling a model.
 
-        errors = []
+    Prose and code lines raise the score. Lines that end in page numbers
+    (tables of contents, indexes) or publication years (bibliographies) and
+    short front/back matter lines (copyright, ISBN, "Index") lower it, in
+    proportion to the share of the chunk they make up. A chunk with any
+    code line is always instructional.
 
-        # Check required fields
-        for field in required_fields:
-            if field not in skill:
-                errors.append(f"Missing required field: {field}")
+    Args:
+        text: Chunk text
+        threshold: Minimum score for a chunk to count as instructional
 
-        # Validate difficulty level
-        if "difficulty" in skill and skill["difficulty"] not in valid_difficulties:
-            errors.append(
-                f"Invalid difficulty: {skill['difficulty']}. "
-                f"Must be one of: {', '.join(valid_difficulties)}"
-            )
+    Returns:
+        Score in [0, 1], the verdict, the deciding signal and all signals
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return ChunkScore(score=0.0, instructional=False, reason="empty", signals={})
+
+    code = prose = page_refs = citations = boilerplate_chars = 0
+    for line in lines:
+        stripped = line.strip()
+        if is_code_line(line):
+            code += 1
+        elif len(stripped) <= _BOILERPLATE_MAX_LINE and _BOILERPLATE_LINE.fullmatch(stripped):
+            boilerplate_chars += len(stripped)
+        elif _CITATION_LINE.search(line):
+            citations += 1
+        elif _PAGE_REFERENCE_LINE.search(line) and len(line) < 100:
+            page_refs += 1
+        else:
+            words = _WORD.findall(line)
+            if len(words) >= 6 and len(words) >= 0.7 * len(line.split()):
+                prose += 1
+
+    signals = {
+        "code_density": code / len(lines),
+        "prose_ratio": prose / len(lines),
+        "page_reference_density": page_refs / len(lines),
+        "citation_density": citations / len(lines),
+        "boilerplate_share": boilerplate_chars / sum(len(line.strip()) for line in lines)
+    }
+    penalties = {
+        "page references": 1.5 * signals["page_reference_density"],
+        "citations": 1.5 * signals["citation_density"],
+        "front/back matter": 1.5 * signals["boilerplate_share"]
+    }
+    raw = 1.5 * signals["code_density"] + signals["prose_ratio"] - sum(penalties.values())
+    score = round(max(0.0, min(1.0, raw)), 3)
 
-        # Validate key_concepts is a non-empty list
-        if "key_concepts" in skill:
-            if not isinstance(skill["key_concepts"], list):
-                errors.append("key_concepts must be a list")
-            elif len(skill["key_concepts"]) == 0:
-                errors.append("key_concepts cannot be empty")
+    instructional = score >= threshold or code > 0
+    if instructional:
+        reason = "instructional"
+    else:
+        worst = max(penalties, key=penalties.get)
+        reason = worst if penalties[worst] > 0 else "little prose or code"
 
-        # Validate name and description have content
-        if "name" in skill and not skill["name"].strip():
-            errors.append("name cannot be empty")
+    return ChunkScore(score=score, instructional=instructional, reason=reason, signals=signals)
 
-        if "description" in skill and not skill["description"].strip():
-            errors.append("description cannot be empty")
 
-        result = {
-            "is_valid": len(errors) == 0,
-            "errors": errors,
-            "skill": skill if len(errors) == 0 else None
-        }
+REQUIRED_SKILL_FIELDS = (
+    "name", "description", "category", "difficulty",
+    "key_concepts", "source_section"
+)
+VALID_DIFFICULTIES = ("beginner", "intermediate", "advanced")
 
-        return result
+_INVALID_DIFFICULTY = "Invalid difficulty: {}. Must be one of: " + ", ".join(VALID_DIFFICULTIES)
+_MISSING_FIELD = tuple((field, f"Missing required field: {field}") for field in REQUIRED_SKILL_FIELDS)
+
+
+def _skill_fields(skill: Any) -> Dict[str, Any]:
+    """Field mapping of a skill dict or model, without serializing it"""
+    return skill if isinstance(skill, dict) else vars(skill)
+
+
+def _skill_errors(skill: Dict[str, Any]) -> List[str]:
+    """
+    Check a skill's fields against the schema.
+
+    Args:
+        skill: Mapping of field name to value (a parsed dict or a model's __dict__)
+
+    Returns:
+        Error messages, empty if the skill is valid
+    """
+    errors = [message for field, message in _MISSING_FIELD if field not in skill]
+
+    difficulty = skill.get("difficulty")
+    if "difficulty" in skill and difficulty not in VALID_DIFFICULTIES:
+        errors.append(_INVALID_DIFFICULTY.format(difficulty))
+
+    if "key_concepts" in skill:
+        key_concepts = skill["key_concepts"]
+        if not isinstance(key_concepts, list):
+            errors.append("key_concepts must be a list")
+        elif not key_concepts:
+            errors.append("key_concepts cannot be empty")
+
+    if "name" in skill and not (isinstance(skill["name"], str) and skill["name"].strip()):
+        errors.append("name cannot be empty")
+
+    if "description" in skill and not (isinstance(skill["description"], str) and skill["description"].strip()):
+        errors.append("description cannot be empty")
 
+    return errors
+
+
+def validate_skill_structure(
+    skill_data: Annotated[str, Field(description="JSON string of skill data")]
+) -> Dict[str, Any]:
+    """
+    Validate that a skill has all required fields and proper structure.
+
+    Args:
+        skill_data: JSON string containing skill information
+
+    Returns:
+        Validation result with is_valid flag and error messages
+    """
+    try:
+        skill = json.loads(skill_data)
     except json.JSONDecodeError as e:
         return {
             "is_valid": False,
@@ -166,6 +1136,66 @@ def validate_skill_structure(
             "skill": None
         }
 
+    if not isinstance(skill, dict):
+        return {
+            "is_valid": False,
+            "errors": ["Skill must be a JSON object"],
+            "skill": None
+        }
+
+    errors = _skill_errors(skill)
+    return {
+        "is_valid": len(errors) == 0,
+        "errors": errors,
+        "skill": skill if len(errors) == 0 else None
+    }
+
+
+class SkillValidationIssue(BaseModel):
+    """Validation errors for one skill in a batch"""
+    index: int = Field(description="Position of the skill in the batch")
+    name: Optional[str] = Field(default=None, description="Skill name, if present")
+    errors: List[str]
+
+
+class SkillValidationReport(BaseModel):
+    """Result of validating a batch of skills"""
+    total: int
+    valid_indices: List[int] = Field(default_factory=list)
+    issues: List[SkillValidationIssue] = Field(default_factory=list)
+
+    @property
+    def invalid_count(self) -> int:
+        """Number of skills that failed validation"""
+        return len(self.issues)
+
+
+def validate_skills_batch(skills: List[Any]) -> SkillValidationReport:
+    """
+    Validate a list of skills in one pass.
+
+    Pydantic models are checked through their field dictionaries, so no
+    JSON serialization or parsing happens per skill.
+
+    Args:
+        skills: Skill models or plain dictionaries
+
+    Returns:
+        Report with indices of valid skills and errors for invalid ones
+    """
+    valid_indices = []
+    issues = []
+
+    for index, skill in enumerate(skills):
+        fields = _skill_fields(skill)
+        errors = _skill_errors(fields)
+        if errors:
+            issues.append(SkillValidationIssue(index=index, name=fields.get("name"), errors=errors))
+        else:
+            valid_indices.append(index)
+
+    return SkillValidationReport(total=len(skills), valid_indices=valid_indices, issues=issues)
+
 
 def check_skill_similarity(
     skill1_name: Annotated[str, Field(description="Name of first skill")],
@@ -175,7 +1205,8 @@ def check_skill_similarity(
     """
     Check if two skills are similar enough to be duplicates.
 
-    Uses simple string similarity based on character overlap.
+    Uses cosine similarity of character trigram counts, so shared words
+    matter more than shared letters.
 
     Args:
         skill1_name: First skill name
@@ -189,18 +1220,13 @@ def check_skill_similarity(
     name1 = skill1_name.lower().strip()
     name2 = skill2_name.lower().strip()
 
-    # Simple character-based similarity
-    # For production, consider using more sophisticated algorithms
-    set1 = set(name1)
-    set2 = set(name2)
+    from .similarity import tfidf_matrix
 
-    if not set1 or not set2:
+    vectors = tfidf_matrix([name1, name2], use_idf=False)
+    if not (vectors.row(0)[0].size and vectors.row(1)[0].size):
         return {"is_similar": False, "similarity_score": 0.0}
 
-    intersection = len(set1 & set2)
-    union = len(set1 | set2)
-
-    similarity = intersection / union if union > 0 else 0.0
+    similarity = vectors.dot(0, 1)
 
     # Also check for substring match
     if name1 in name2 or name2 in name1:
@@ -212,6 +1238,54 @@ def check_skill_similarity(
     }
 
 
+def find_similar_skills(
+    skills_json: Annotated[str, Field(description="JSON array of skills with name fields")],
+    threshold: Annotated[float, Field(description="Similarity threshold (0-1)")] = 0.8,
+    top_k: Annotated[int, Field(description="Neighbours compared per skill")] = 5
+) -> Dict[str, Any]:
+    """
+    Find likely duplicate pairs across a whole list of skills.
+
+    Skill names are embedded as character n-gram TF-IDF vectors and each
+    skill is compared with its top-k nearest neighbours, instead of calling
+    check_skill_similarity for every pair.
+
+    Args:
+        skills_json: JSON array of skill objects
+        threshold: Minimum cosine similarity for a pair to be reported
+        top_k: Number of nearest neighbours considered per skill
+
+    Returns:
+        Dictionary with duplicate pairs (indices, names, score), most
+        similar first; pass each pair's skills to merge_skill_duplicates
+    """
+    from .similarity import similar_pairs, tfidf_matrix, top_k_neighbors
+
+    try:
+        skills = json.loads(skills_json)
+    except json.JSONDecodeError as e:
+        return {"error": f"Invalid JSON: {str(e)}", "pairs": []}
+
+    if not isinstance(skills, list) or not all(isinstance(skill, dict) for skill in skills):
+        return {"error": "Skills must be a JSON array of objects", "pairs": []}
+
+    names = [str(skill.get("name", "")) for skill in skills]
+    indices, scores = top_k_neighbors(tfidf_matrix(names), k=top_k)
+
+    return {
+        "pairs": [
+            {
+                "first": first,
+                "second": second,
+                "first_name": names[first],
+                "second_name": names[second],
+                "similarity_score": score
+            }
+            for first, second, score in similar_pairs(indices, scores, threshold)
+        ]
+    }
+
+
 def categorize_skill_content(
     skill_description: Annotated[str, Field(description="Skill description text")],
     key_concepts: Annotated[List[str], Field(description="List of key concepts")]
@@ -293,6 +1367,93 @@ def categorize_skill_content(
         return "General Python"
 
 
+# Page layout, compiled once into bound format methods
+_SKILL_PAGE = (
+    "# {name}\n"
+    "\n"
+    "**Tracks**: {tracks}\n"
+    "**Difficulty**: {difficulty}\n"
+    "**Category**: {category}\n"
+    "\n"
+    "## Description\n"
+    "\n"
+    "{description}\n"
+    "\n"
+    "## Key Concepts\n"
+    "\n"
+    "{key_concepts}"
+    "{links}"
+    "\n"
+    "## Learning Resources\n"
+    "\n"
+    "- **{source_book}**: {source_section}\n"
+    "\n"
+    "---\n"
+    "\n"
+    "*Source: {source_book}*"
+).format
+_LINK_SECTION = "\n## {title}\n\n{items}".format
+_LINK_ITEM = "- [{0}](./{1}.md)\n".format
+
+_SLUG_INVALID = re.compile(r'[^\w\s-]')
+_SLUG_SEPARATORS = re.compile(r'[-\s]+')
+
+
+def render_skill_markdown(skill: Any, tracks: Optional[List[str]] = None) -> str:
+    """
+    Render a skill page directly from a skill object.
+
+    Args:
+        skill: Skill model or dictionary
+        tracks: Learning tracks; defaults to the skill's own tracks
+
+    Returns:
+        Formatted markdown content
+    """
+    fields = _skill_fields(skill)
+    if tracks is None:
+        tracks = fields.get("tracks") or []
+
+    links = ""
+    prerequisites = fields.get("prerequisites")
+    if prerequisites:
+        links += _LINK_SECTION(
+            title="Prerequisites",
+            items="".join(_LINK_ITEM(name, cached_slugify(name)) for name in prerequisites)
+        )
+    related_skills = fields.get("related_skills")
+    if related_skills:
+        links += _LINK_SECTION(
+            title="Related Skills",
+            items="".join(_LINK_ITEM(name, cached_slugify(name)) for name in related_skills)
+        )
+
+    return _SKILL_PAGE(
+        name=fields.get("name", "Untitled Skill"),
+        tracks=", ".join(tracks) if tracks else "General",
+        difficulty=fields.get("difficulty", "unknown"),
+        category=fields.get("category", "Uncategorized"),
+        description=fields.get("description", "No description available."),
+        key_concepts="".join(f"- {concept}\n" for concept in fields.get("key_concepts", [])),
+        links=links,
+        source_book=fields.get("source_book", "Unknown source"),
+        source_section=fields.get("source_section", "Unknown section")
+    )
+
+
+def render_skills_markdown(skills: List[Any]) -> List[str]:
+    """
+    Render pages for a batch of skills, each with its own tracks.
+
+    Args:
+        skills: Skill models or dictionaries
+
+    Returns:
+        Markdown content per skill, in input order
+    """
+    return [render_skill_markdown(skill) for skill in skills]
+
+
 def generate_skill_markdown(
     skill_data: Annotated[str, Field(description="JSON string of skill data")],
     tracks: Annotated[List[str], Field(description="Learning tracks this skill belongs to")]
@@ -309,55 +1470,11 @@ def generate_skill_markdown(
     """
     try:
         skill = json.loads(skill_data)
-
-        # Build markdown content
-        lines = [
-            f"# {skill.get('name', 'Untitled Skill')}",
-            "",
-            f"**Tracks**: {', '.join(tracks) if tracks else 'General'}",
-            f"**Difficulty**: {skill.get('difficulty', 'unknown')}",
-            f"**Category**: {skill.get('category', 'Uncategorized')}",
-            "",
-            "## Description",
-            "",
-            skill.get('description', 'No description available.'),
-            "",
-            "## Key Concepts",
-            ""
-        ]
-
-        # Add key concepts
-        for concept in skill.get('key_concepts', []):
-            lines.append(f"- {concept}")
-
-        # Add prerequisites if present
-        if 'prerequisites' in skill and skill['prerequisites']:
-            lines.extend(["", "## Prerequisites", ""])
-            for prereq in skill['prerequisites']:
-                prereq_slug = slugify(prereq)
-                lines.append(f"- [{prereq}](./{prereq_slug}.md)")
-
-        # Add related skills if present
-        if 'related_skills' in skill and skill['related_skills']:
-            lines.extend(["", "## Related Skills", ""])
-            for related in skill['related_skills']:
-                related_slug = slugify(related)
-                lines.append(f"- [{related}](./{related_slug}.md)")
-
-        # Add source information
-        lines.extend(["", "## Learning Resources", ""])
-        source_book = skill.get('source_book', 'Unknown source')
-        source_section = skill.get('source_section', 'Unknown section')
-        lines.append(f"- **{source_book}**: {source_section}")
-
-        # Footer
-        lines.extend(["", "---", "", f"*Source: {source_book}*"])
-
-        return "\n".join(lines)
-
     except json.JSONDecodeError as e:
         return f"Error: Invalid JSON - {str(e)}"
 
+    return render_skill_markdown(skill, tracks)
+
 
 def slugify(text: Annotated[str, Field(description="Text to convert to URL-friendly slug")]) -> str:
     """
@@ -370,11 +1487,15 @@ def slugify(text: Annotated[str, Field(description="Text to convert to URL-frien
         Slugified text
     """
     text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '-', text)
+    text = _SLUG_INVALID.sub('', text)
+    text = _SLUG_SEPARATORS.sub('-', text)
     return text.strip('-')
 
 
+# Skill names repeat across prerequisite and related links
+cached_slugify = lru_cache(maxsize=65536)(slugify)
+
+
 def extract_code_blocks(
     markdown_text: Annotated[str, Field(description="Markdown text to parse")]
 ) -> List[Dict[str, str]]:
@@ -402,6 +1523,81 @@ def extract_code_blocks(
     return code_blocks
 
 
+def skill_provenance(skills: List[Any]) -> Dict[str, List[str]]:
+    """
+    Collect the books and sections a group of skills came from.
+
+    Skills that were already merged contribute their own provenance.
+
+    Args:
+        skills: Skill models or dictionaries
+
+    Returns:
+        Dictionary with unique "merged_from" books and "source_sections",
+        in first-seen order
+    """
+    books: Dict[str, None] = {}
+    sections: Dict[str, None] = {}
+
+    for skill in skills:
+        fields = _skill_fields(skill)
+        books.update(dict.fromkeys(fields.get("merged_from") or [fields.get("source_book")]))
+        sections.update(dict.fromkeys(fields.get("source_sections") or [fields.get("source_section")]))
+
+    books.pop(None, None)
+    sections.pop(None, None)
+    return {"merged_from": list(books), "source_sections": list(sections)}
+
+
+def merge_skill_cluster(skills: List[Any]) -> Any:
+    """
+    Merge a cluster of duplicate skills into one in a single pass.
+
+    The first skill is the base. List fields are unioned and the longest
+    description wins; on a tie the first-seen description is kept, so the
+    base's description only changes when another is strictly longer.
+    Provenance (merged_from, source_sections) is recorded when the skill
+    type has those fields.
+
+    Args:
+        skills: Non-empty list of skill models or dictionaries
+
+    Returns:
+        Merged skill of the same type as the first skill
+    """
+    base = skills[0]
+    if len(skills) == 1:
+        return base
+
+    key_concepts, prerequisites, related_skills = set(), set(), set()
+    descriptions = []
+
+    for skill in skills:
+        fields = _skill_fields(skill)
+        key_concepts.update(fields.get("key_concepts") or [])
+        prerequisites.update(fields.get("prerequisites") or [])
+        related_skills.update(fields.get("related_skills") or [])
+        descriptions.append(fields.get("description") or "")
+
+    # max() returns the first of equally long descriptions
+    description = max(descriptions, key=len)
+
+    merged = {
+        "key_concepts": sorted(key_concepts),
+        "prerequisites": sorted(prerequisites),
+        "related_skills": sorted(related_skills),
+        "description": description,
+        **skill_provenance(skills)
+    }
+
+    if isinstance(base, dict):
+        return {**base, **merged}
+
+    # Only set fields the model declares
+    model_fields = type(base).model_fields
+    return base.model_copy(update={k: v for k, v in merged.items() if k in model_fields})
+
+
 def merge_skill_duplicates(
     skill1_json: Annotated[str, Field(description="First skill as JSON")],
     skill2_json: Annotated[str, Field(description="Second skill as JSON")]
@@ -419,51 +1615,21 @@ def merge_skill_duplicates(
     try:
         skill1 = json.loads(skill1_json)
         skill2 = json.loads(skill2_json)
-
-        # Start with skill1 as base
-        merged = skill1.copy()
-
-        # Merge key_concepts (unique values)
-        concepts1 = set(skill1.get('key_concepts', []))
-        concepts2 = set(skill2.get('key_concepts', []))
-        merged['key_concepts'] = sorted(list(concepts1 | concepts2))
-
-        # Merge prerequisites
-        prereqs1 = set(skill1.get('prerequisites', []))
-        prereqs2 = set(skill2.get('prerequisites', []))
-        merged['prerequisites'] = sorted(list(prereqs1 | prereqs2))
-
-        # Merge related_skills
-        related1 = set(skill1.get('related_skills', []))
-        related2 = set(skill2.get('related_skills', []))
-        merged['related_skills'] = sorted(list(related1 | related2))
-
-        # Use longer description
-        desc1 = skill1.get('description', '')
-        desc2 = skill2.get('description', '')
-        merged['description'] = desc1 if len(desc1) > len(desc2) else desc2
-
-        # Track merged sources
-        sources = []
-        if 'source_book' in skill1:
-            sources.append(skill1['source_book'])
-        if 'source_book' in skill2 and skill2['source_book'] not in sources:
-            sources.append(skill2['source_book'])
-
-        merged['merged_from'] = sources
-
-        return json.dumps(merged, indent=2)
-
     except json.JSONDecodeError as e:
         return json.dumps({"error": f"Invalid JSON: {str(e)}"})
 
+    return json.dumps(merge_skill_cluster([skill1, skill2]), indent=2)
+
 
 # Tool registry for easy access
 AVAILABLE_TOOLS = [
-    extract_pdf_text,
-    chunk_content,
+    open_pdf_document,
+    list_document_chunks,
+    read_document_chunk,
+    read_document_pages,
     validate_skill_structure,
     check_skill_similarity,
+    find_similar_skills,
     categorize_skill_content,
     generate_skill_markdown,
     slugify,
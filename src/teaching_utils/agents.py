@@ -12,12 +12,15 @@ from pydantic import BaseModel, Field
 from rich.console import Console
 
 from .agent_tools import (
-    extract_pdf_text,
-    chunk_content,
+    open_pdf_document,
+    list_document_chunks,
+    read_document_chunk,
+    read_document_pages,
     validate_skill_structure,
     categorize_skill_content,
     generate_skill_markdown,
     check_skill_similarity,
+    find_similar_skills,
     merge_skill_duplicates
 )
 
@@ -44,9 +47,11 @@ PDF_EXTRACTOR_AGENT = AgentRole(
     instructions="""You are an expert at extracting and structuring content from technical PDF books.
 
 Your responsibilities:
-1. Extract text from PDF files using the extract_pdf_text tool
-2. Chunk large content into manageable pieces using chunk_content tool
-3. Clean and structure the extracted text
+1. Open PDF files with the open_pdf_document tool, which returns a document id,
+   page counts and outline sections rather than the text itself
+2. Browse chunk ids, page ranges and short previews with list_document_chunks
+3. Fetch only the chunks or pages you need with read_document_chunk and
+   read_document_pages
 4. Identify chapter boundaries and sections
 5. Preserve code blocks, examples, and technical formatting
 
@@ -55,15 +60,17 @@ Guidelines:
 - Identify and mark code examples clearly
 - Note chapter/section headings for reference
 - Handle OCR artifacts and formatting issues
-- Return well-structured, readable text
+- Never copy whole chunks into your reply; refer to them by chunk id
 
 Output format:
 Return a JSON object with:
-- "content": The extracted and cleaned text
-- "chapters": List of identified chapters/sections
+- "content": The cleaned text, only when the text was given to you in the prompt
+- "document_id": The id returned by open_pdf_document, when you opened a PDF
+- "chapters": List of identified chapters/sections with their page ranges
+  and chunk ids
 - "metadata": Any relevant metadata (page count, etc.)
 """,
-    tools=[extract_pdf_text, chunk_content]
+    tools=[open_pdf_document, list_document_chunks, read_document_chunk, read_document_pages]
 )
 
 
@@ -175,7 +182,9 @@ VALIDATOR_AGENT = AgentRole(
 
 Your responsibilities:
 1. Validate skill structure using validate_skill_structure tool
-2. Check for duplicate/similar skills using check_skill_similarity tool
+2. Check for duplicate/similar skills using find_similar_skills (whole batches)
+   or check_skill_similarity (a single pair), and combine duplicates with
+   merge_skill_duplicates
 3. Ensure completeness and quality
 4. Suggest improvements to descriptions
 5. Verify difficulty levels are appropriate
@@ -202,7 +211,7 @@ For each skill, return:
 
 If a skill has issues, provide specific, actionable feedback.
 """,
-    tools=[validate_skill_structure, check_skill_similarity, merge_skill_duplicates]
+    tools=[validate_skill_structure, find_similar_skills, check_skill_similarity, merge_skill_duplicates]
 )
 
 
@@ -0,0 +1,225 @@
+"""
+Versioned Stage Artifacts for Resumable Workflows
+
+Persists the output of each workflow stage (extracted text, raw skills,
+validated skills, categorized skills) so a resumed workflow can reload
+completed stages instead of recomputing them. Artifacts can also be
+registered under an input fingerprint so later runs with identical inputs
+reuse them, like a build system.
+"""
+
+import hashlib
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+from rich.console import Console
+
+
+console = Console()
+
+
+# Bump when the on-disk layout of artifacts changes
+ARTIFACT_FORMAT_VERSION = 1
+
+
+def compute_fingerprint(*parts: Any) -> str:
+    """
+    Fingerprint a set of stage inputs.
+
+    Args:
+        parts: JSON-serializable inputs (hashes, parameters, versions)
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding of the inputs
+    """
+    encoded = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 of a string (e.g. agent instructions)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path: Path, block_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of a file's content, read in blocks.
+
+    Args:
+        path: File to hash
+        block_size: Bytes read per block
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """Stores stage outputs as versioned files referenced from step results"""
+
+    def __init__(self, root: Path):
+        """
+        Initialize artifact store.
+
+        Args:
+            root: Directory for storing artifact files
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def save_text(self, workflow_id: str, step_id: str, text: str) -> Dict[str, Any]:
+        """
+        Save a text artifact (e.g. extracted book content).
+
+        Args:
+            workflow_id: Workflow identifier
+            step_id: Step that produced the text
+
+        Returns:
+            Artifact reference to store in the step result
+        """
+        path = self._next_path(workflow_id, step_id, ".txt")
+        path.write_text(text, encoding="utf-8")
+        return self._make_ref(path, "text", len(text))
+
+    def save_records(
+        self,
+        workflow_id: str,
+        step_id: str,
+        records: List[Any]
+    ) -> Dict[str, Any]:
+        """
+        Save a list of records (e.g. skills) as a JSON artifact.
+
+        Args:
+            workflow_id: Workflow identifier
+            step_id: Step that produced the records
+            records: Pydantic models or plain dictionaries
+
+        Returns:
+            Artifact reference to store in the step result
+        """
+        data = [
+            record.model_dump(mode="json") if isinstance(record, BaseModel) else record
+            for record in records
+        ]
+        path = self._next_path(workflow_id, step_id, ".json")
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return self._make_ref(path, "records", len(data))
+
+    def register(self, stage: str, fingerprint: str, ref: Dict[str, Any]):
+        """
+        Record that an artifact is the output of a stage for given inputs.
+
+        Args:
+            stage: Stage name (extract, identify, ...)
+            fingerprint: Fingerprint of the stage inputs
+            ref: Artifact reference produced by save_text/save_records
+        """
+        path = self._index_path(stage, fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({**ref, "fingerprint": fingerprint}), encoding="utf-8")
+
+    def lookup(self, stage: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Find an artifact previously registered for identical stage inputs.
+
+        Args:
+            stage: Stage name
+            fingerprint: Fingerprint of the stage inputs
+
+        Returns:
+            Artifact reference, or None if no usable artifact exists
+        """
+        path = self._index_path(stage, fingerprint)
+        if not path.exists():
+            return None
+
+        try:
+            ref = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return None
+
+        if ref.get("format_version") != ARTIFACT_FORMAT_VERSION:
+            return None
+        if not (self.root / ref["path"]).exists():
+            return None
+        return ref
+
+    def clear_stage(self, stage: str, workflow_id: Optional[str] = None) -> int:
+        """
+        Forget every artifact registered for a stage.
+
+        Args:
+            stage: Stage name
+            workflow_id: Also delete the artifacts stored under this workflow
+                id (e.g. a shared cache directory)
+
+        Returns:
+            Number of index entries removed
+        """
+        removed = 0
+        for path in (self.root / "_index" / stage).glob("*.json"):
+            path.unlink()
+            removed += 1
+
+        if workflow_id is not None:
+            shutil.rmtree(self.root / workflow_id, ignore_errors=True)
+        return removed
+
+    def load_text(self, ref: Dict[str, Any]) -> str:
+        """Load a text artifact from its reference"""
+        return self._resolve(ref, "text").read_text(encoding="utf-8")
+
+    def load_records(self, ref: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Load a records artifact from its reference"""
+        return json.loads(self._resolve(ref, "records").read_text(encoding="utf-8"))
+
+    def _make_ref(self, path: Path, kind: str, count: int) -> Dict[str, Any]:
+        """Build the reference stored in a workflow step result"""
+        return {
+            "path": path.relative_to(self.root).as_posix(),
+            "kind": kind,
+            "version": int(path.stem.rsplit(".v", 1)[1]),
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "count": count,
+            "created_at": datetime.now().isoformat()
+        }
+
+    def _resolve(self, ref: Dict[str, Any], kind: str) -> Path:
+        """Validate a reference and return the artifact path"""
+        if ref.get("kind") != kind:
+            raise ValueError(f"Expected {kind} artifact, got {ref.get('kind')}")
+        if ref.get("format_version") != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported artifact format: {ref.get('format_version')}")
+
+        path = self.root / ref["path"]
+        if not path.exists():
+            raise FileNotFoundError(f"Artifact not found: {path}")
+        return path
+
+    def _index_path(self, stage: str, fingerprint: str) -> Path:
+        """Get path of the fingerprint index entry for a stage"""
+        return self.root / "_index" / stage / f"{fingerprint}.json"
+
+    def _next_path(self, workflow_id: str, step_id: str, suffix: str) -> Path:
+        """Get path for the next version of a step's artifact"""
+        directory = self.root / workflow_id
+        directory.mkdir(parents=True, exist_ok=True)
+
+        versions = [
+            int(p.stem.rsplit(".v", 1)[1])
+            for p in directory.glob(f"{step_id}.v*{suffix}")
+            if p.stem.rsplit(".v", 1)[1].isdigit()
+        ]
+        version = max(versions, default=0) + 1
+        return directory / f"{step_id}.v{version}{suffix}"
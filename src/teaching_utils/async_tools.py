@@ -0,0 +1,157 @@
+"""
+Async Adapters for Agent Tools
+
+Agent tools are plain synchronous functions. Called directly from an async
+agent loop, a tool that parses a PDF or chunks a whole book blocks the event
+loop and every concurrent agent call with it. This module wraps tools as
+coroutines that run heavy tools in a thread or process pool, keep trivial
+tools inline, and record how long each call takes.
+"""
+
+import asyncio
+import functools
+import inspect
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from rich.console import Console
+
+from .telemetry import TelemetryRecorder
+
+
+console = Console()
+
+
+TOOL_EXECUTION_MODES = ("inline", "thread", "process")
+
+# Where each tool runs; tools not listed are cheap and run inline. Tools
+# that keep state in this process (the open-document registry) must not
+# run in a process pool.
+DEFAULT_TOOL_MODES: Dict[str, str] = {
+    "extract_pdf_text": "thread",
+    "open_pdf_document": "thread",
+    "chunk_content": "process",
+    "find_similar_skills": "process",
+    "extract_code_blocks": "thread",
+}
+
+
+class AsyncToolRunner:
+    """Runs synchronous tools from async code without blocking the event loop"""
+
+    def __init__(
+        self,
+        telemetry: Optional[TelemetryRecorder] = None,
+        modes: Optional[Dict[str, str]] = None,
+        process_workers: Optional[int] = None
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            telemetry: Recorder that receives a timing record per tool call
+                (a private recorder is used if None)
+            modes: Per-tool overrides of DEFAULT_TOOL_MODES
+            process_workers: Size of the process pool, created on first use
+                (defaults to one per CPU core)
+        """
+        self.modes = {**DEFAULT_TOOL_MODES, **(modes or {})}
+        invalid = sorted(name for name, mode in self.modes.items() if mode not in TOOL_EXECUTION_MODES)
+        if invalid:
+            raise ValueError(
+                f"Invalid execution mode for {', '.join(invalid)}; "
+                f"must be one of: {', '.join(TOOL_EXECUTION_MODES)}"
+            )
+
+        self.telemetry = telemetry or TelemetryRecorder()
+        self.process_workers = process_workers or os.cpu_count() or 1
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def mode_for(self, tool: Callable[..., Any]) -> str:
+        """Where a tool runs: inline, thread or process"""
+        return self.modes.get(tool.__name__, "inline")
+
+    async def call(self, tool: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a synchronous tool according to its execution mode.
+
+        Args:
+            tool: Tool function
+            *args: Positional arguments for the tool
+            **kwargs: Keyword arguments for the tool
+
+        Returns:
+            The tool's result, unchanged
+        """
+        mode = self.mode_for(tool)
+        start = time.perf_counter()
+        error = None
+
+        try:
+            if mode == "thread":
+                return await asyncio.to_thread(tool, *args, **kwargs)
+            if mode == "process":
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(
+                        self._get_process_pool(), functools.partial(tool, *args, **kwargs)
+                    )
+                except BrokenProcessPool:
+                    console.print(
+                        f"[yellow]Warning: Process pool failed, running {tool.__name__} "
+                        f"in a thread[/yellow]"
+                    )
+                    self.shutdown()
+                    mode = "thread"
+                    return await asyncio.to_thread(tool, *args, **kwargs)
+            return tool(*args, **kwargs)
+
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            self.telemetry.record_tool_call(
+                tool.__name__, mode, time.perf_counter() - start, error
+            )
+
+    def wrap(self, tool: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a synchronous tool as a coroutine function.
+
+        The wrapper keeps the tool's name, docstring and signature, so agent
+        frameworks build the same tool schema from it. Tools that are
+        already coroutine functions are returned unchanged.
+
+        Args:
+            tool: Tool function
+
+        Returns:
+            Async version of the tool
+        """
+        if inspect.iscoroutinefunction(tool):
+            return tool
+
+        @functools.wraps(tool)
+        async def run_tool(*args: Any, **kwargs: Any) -> Any:
+            return await self.call(tool, *args, **kwargs)
+
+        return run_tool
+
+    def wrap_all(self, tools: Iterable[Callable[..., Any]]) -> List[Callable[..., Any]]:
+        """Wrap every tool in a list (e.g. an AgentRole's tools)"""
+        return [self.wrap(tool) for tool in tools]
+
+    def shutdown(self):
+        """Stop the process pool, if one was started"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(cancel_futures=True)
+            self._process_pool = None
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use"""
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+        return self._process_pool
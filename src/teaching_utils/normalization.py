@@ -0,0 +1,233 @@
+"""
+Deterministic Text Normalization for Extracted PDF Pages
+
+Removes text that costs tokens without carrying content before a book is
+chunked: running headers and footers repeated across pages, bare page
+numbers, words hyphenated across line breaks and runs of whitespace. Lines
+that look like code keep their exact spacing, and hyphenated compounds keep
+their hyphen.
+"""
+
+import re
+from collections import Counter
+from typing import List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+from rich.console import Console
+
+from .telemetry import estimate_tokens
+
+
+console = Console()
+
+
+# Bump when normalization rules change so cached extracted text is rebuilt
+NORMALIZATION_VERSION = 4
+
+CODE_LINE = re.compile(
+    r"^\s*(>>>|\.\.\.\s|def |class |import |from \S+ import |return\b|@\w|print\()"
+    r"|^\s*[\w.\[\]'\"]+\s*[-+*/]?=[^=]"
+    r"|\w\(.*\)\s*$"
+)
+_PAGE_NUMBER_LINE = re.compile(r"^\s*(page\s+)?\d{1,4}\s*$", re.IGNORECASE)
+# Letters in any script, so "pré-" + "étude" is handled like ASCII words
+_HYPHENATED_END = re.compile(r"([^\W\d_]+)-$")
+_LEADING_WORD = re.compile(r"[^\W\d_]+")
+_COMPOUND_WORD = re.compile(r"\b[^\W\d_]+-[^\W\d_]+\b")
+# First parts that are almost always hyphenated (self-contained, well-known)
+_COMPOUND_PREFIXES = {"all", "built", "cross", "ex", "half", "high", "low", "self", "third", "well"}
+_SPACE_RUN = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_DIGITS = re.compile(r"\d+")
+# Letters a repeated edge line needs to count as a running header, so lines
+# that repeat only through their numbers ("In [#]:", "Example #", table
+# rows) are kept
+_MIN_HEADER_LETTERS = 8
+
+
+class NormalizationReport(BaseModel):
+    """What normalization removed from one book"""
+    chars_before: int = 0
+    chars_after: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+    header_lines_removed: int = 0
+    page_numbers_removed: int = 0
+    hyphenations_joined: int = 0
+
+    @property
+    def char_reduction(self) -> float:
+        """Fraction of characters removed"""
+        return 1 - self.chars_after / self.chars_before if self.chars_before else 0.0
+
+
+def is_code_line(line: str) -> bool:
+    """Whether a line looks like source code (indented or code syntax)"""
+    return line.startswith(("    ", "\t")) or bool(CODE_LINE.search(line))
+
+
+def _edge_key(line: str) -> str:
+    """Compare header/footer lines ignoring page numbers and spacing"""
+    return _DIGITS.sub("#", " ".join(line.split()).lower())
+
+
+def _header_signature(line: str, page_index: int) -> Optional[Tuple[str, Optional[int]]]:
+    """
+    What a running header or footer line must repeat across pages.
+
+    The line needs _MIN_HEADER_LETTERS letters, and a number may only sit
+    at its start or end, like a page number ("Python Basics 12"), not
+    inside it ("Out: 9 items"). A page number grows with the page, so the
+    signature holds the number's offset from the page index; lines whose
+    numbers do not track the page ("result is 16") do not repeat.
+
+    Returns:
+        (edge key, page-number offset or None), or None if the line
+        cannot be a header
+    """
+    key = _edge_key(line)
+    if sum(c.isalpha() for c in key) < _MIN_HEADER_LETTERS or "#" in key.strip("# "):
+        return None
+    if "#" not in key:
+        return key, None
+
+    numbers = _DIGITS.findall(line)
+    number = numbers[-1] if key.endswith("#") else numbers[0]
+    return key, int(number) - page_index
+
+
+def _edge_lines(lines: List[str], depth: int) -> List[int]:
+    """Indices of the first and last non-blank lines of a page"""
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    return sorted(set(filled[:depth] + filled[-depth:]))
+
+
+def _next_to_code(lines: List[str], index: int) -> bool:
+    """Whether the nearest non-blank line before or after a line is code"""
+    for step in (-1, 1):
+        i = index + step
+        while 0 <= i < len(lines) and not lines[i].strip():
+            i += step
+        if 0 <= i < len(lines) and is_code_line(lines[i]):
+            return True
+    return False
+
+
+def _join_hyphenated(first: str, second: str, compounds: Set[str]) -> str:
+    """
+    Join a line ending in a hyphen with the line that continues the word.
+
+    The hyphen is dropped (``exam-`` + ``ple`` gives ``example``) unless the
+    word is a compound: it appears hyphenated elsewhere in the book or starts
+    with a prefix from _COMPOUND_PREFIXES (``self-`` + ``contained`` stays
+    ``self-contained``).
+    """
+    head = _HYPHENATED_END.search(first).group(1).lower()
+    tail = _LEADING_WORD.match(second).group(0)
+    if head in _COMPOUND_PREFIXES or f"{head}-{tail}" in compounds:
+        return first + second
+    return first[:-1] + second
+
+
+def normalize_pdf_pages(
+    pages: List[str],
+    edge_depth: int = 2,
+    min_repeat_fraction: float = 0.3
+) -> Tuple[List[str], NormalizationReport]:
+    """
+    Normalize extracted page text before chunking.
+
+    A line among the first or last ``edge_depth`` lines of a page is a
+    running header or footer when, ignoring digits, it appears at the edge
+    of at least ``min_repeat_fraction`` of pages (and at least three), has a
+    title rather than only numbers, and any number in it follows the page
+    number (see _header_signature). Headers are kept on a page where they
+    are the only prose.
+    Bare page numbers at page edges are also removed, unless they sit next
+    to code (where they are likely program output). Words broken with a
+    hyphen at a line end are rejoined, keeping the hyphen for compounds, and
+    spaces are collapsed, except on lines that look like code.
+
+    Args:
+        pages: Text of each page, in order
+        edge_depth: Lines at the top and bottom of a page checked for headers
+        min_repeat_fraction: Share of pages a header or footer must repeat on
+
+    Returns:
+        Normalized pages aligned with the input (pages left with no text
+        are empty strings) and a report of what was removed
+    """
+    report = NormalizationReport(
+        chars_before=sum(len(page) for page in pages),
+        tokens_before=sum(estimate_tokens(page) for page in pages)
+    )
+
+    split_pages = [page.splitlines() for page in pages]
+    edge_counts = Counter(
+        signature
+        for page_index, lines in enumerate(split_pages)
+        for signature in {
+            _header_signature(lines[i], page_index) for i in _edge_lines(lines, edge_depth)
+        }
+        if signature is not None
+    )
+    min_repeats = max(3, int(len(pages) * min_repeat_fraction))
+    repeated = {signature for signature, count in edge_counts.items() if count >= min_repeats}
+    compounds = {word.lower() for page in pages for word in _COMPOUND_WORD.findall(page)}
+
+    normalized = []
+    for page_index, lines in enumerate(split_pages):
+        drop, headers = set(), set()
+        for i in _edge_lines(lines, edge_depth):
+            if _PAGE_NUMBER_LINE.match(lines[i]):
+                if not _next_to_code(lines, i):
+                    drop.add(i)
+                    report.page_numbers_removed += 1
+            elif _header_signature(lines[i], page_index) in repeated and not is_code_line(lines[i]):
+                headers.add(i)
+
+        # Never remove every prose line of a page as header/footer
+        prose = {
+            i for i, line in enumerate(lines)
+            if line.strip() and i not in drop and not is_code_line(line)
+        }
+        if headers and prose - headers:
+            drop |= headers
+            report.header_lines_removed += len(headers)
+
+        kept: List[str] = []
+        previous_is_prose = False
+        for i, line in enumerate(lines):
+            if i in drop:
+                continue
+            if is_code_line(line):
+                kept.append(line.rstrip())
+                previous_is_prose = False
+                continue
+
+            line = _SPACE_RUN.sub(" ", line).strip()
+            if (previous_is_prose and _HYPHENATED_END.search(kept[-1])
+                    and line[:1].islower() and _LEADING_WORD.match(line)):
+                kept[-1] = _join_hyphenated(kept[-1], line, compounds)
+                report.hyphenations_joined += 1
+            else:
+                kept.append(line)
+            previous_is_prose = bool(line)
+
+        text = _BLANK_LINES.sub("\n\n", "\n".join(kept)).strip("\n")
+        normalized.append(text if text.strip() else "")
+
+    report.chars_after = sum(len(page) for page in normalized)
+    report.tokens_after = sum(estimate_tokens(page) for page in normalized)
+    return normalized, report
+
+
+def print_normalization_report(name: str, report: NormalizationReport):
+    """Print a one-line summary of a book's normalization"""
+    console.print(
+        f"[green]✓ Normalized {name}: {report.chars_before:,} → {report.chars_after:,} chars "
+        f"(-{report.char_reduction:.1%}), ~{report.tokens_before:,} → ~{report.tokens_after:,} tokens; "
+        f"{report.header_lines_removed} header/footer lines, "
+        f"{report.page_numbers_removed} page numbers, "
+        f"{report.hyphenations_joined} hyphenations[/green]"
+    )
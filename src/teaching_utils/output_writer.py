@@ -0,0 +1,199 @@
+"""
+Bulk Output Writer for Generated Skill Files
+
+Writes rendered markdown for a whole catalog at once. Files whose content
+is unchanged are left untouched (so their mtimes do not trigger rebuilds),
+additional copies of the same file (one per track) are hard links or
+symlinks to a single written file, and writes run in a thread pool.
+"""
+
+import hashlib
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from pydantic import BaseModel
+from rich.console import Console
+
+
+console = Console()
+
+
+LINK_MODES = ("hardlink", "symlink", "copy")
+
+
+class WriteReport(BaseModel):
+    """Counts of what a bulk write changed on disk"""
+    written: int = 0
+    linked: int = 0
+    skipped: int = 0
+    removed: int = 0
+    failed: int = 0
+
+    def merge(self, other: "WriteReport"):
+        """Add another report's counts to this one"""
+        for field in type(self).model_fields:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+
+def _content_matches(path: Path, data: bytes, digest: bytes) -> bool:
+    """Check whether a file already holds the given content"""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return hashlib.sha256(path.read_bytes()).digest() == digest
+    except OSError:
+        return False
+
+
+def _same_file(path: Path, target: Path) -> bool:
+    """Check whether path is already a link to target"""
+    try:
+        return os.path.samefile(path, target)
+    except OSError:
+        return False
+
+
+class BulkWriter:
+    """Collects files to write and writes them in one parallel pass"""
+
+    def __init__(
+        self,
+        root: Path,
+        link_mode: str = "hardlink",
+        max_workers: int = 8
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            root: Output directory; all planned paths must be inside it
+            link_mode: How extra copies of a file are created: "hardlink",
+                "symlink" or "copy"
+            max_workers: Threads used for writing
+        """
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"link_mode must be one of: {', '.join(LINK_MODES)}")
+
+        self.root = Path(root)
+        self.link_mode = link_mode
+        self.max_workers = max_workers
+        self._files: Dict[Path, Tuple[str, List[Path]]] = {}
+
+    def add(self, content: str, paths: Sequence[Path]):
+        """
+        Plan one rendered file and every path it should appear at.
+
+        Args:
+            content: File content
+            paths: Destination paths; the first one holds the real file
+        """
+        if not paths:
+            return
+        primary, *copies = [Path(path) for path in paths]
+        self._files[primary] = (content, copies)
+
+    def planned_paths(self) -> Set[Path]:
+        """All paths the writer will create or keep"""
+        paths = set(self._files)
+        for _, copies in self._files.values():
+            paths.update(copies)
+        return paths
+
+    def commit(self, prune_glob: Optional[str] = None) -> WriteReport:
+        """
+        Write all planned files.
+
+        Args:
+            prune_glob: If set, files under root matching this pattern that
+                were not planned are removed (e.g. skills that no longer exist)
+
+        Returns:
+            Report of written, linked, skipped, removed and failed files
+        """
+        for directory in {path.parent for path in self.planned_paths()}:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        report = WriteReport()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for result in executor.map(self._write_file, self._files.items()):
+                report.merge(result)
+
+        if prune_glob:
+            report.removed = self._prune(prune_glob)
+
+        self._files.clear()
+        return report
+
+    def _write_file(self, item: Tuple[Path, Tuple[str, List[Path]]]) -> WriteReport:
+        """Write one file and its copies, skipping anything already up to date"""
+        primary, (content, copies) = item
+        report = WriteReport()
+
+        try:
+            data = content.encode("utf-8")
+            if _content_matches(primary, data, hashlib.sha256(data).digest()):
+                report.skipped += 1
+            else:
+                # Replace rather than overwrite in place so existing hard
+                # links keep the old content until they are relinked below
+                temp = primary.with_name(f".{primary.name}.tmp")
+                temp.write_bytes(data)
+                os.replace(temp, primary)
+                report.written += 1
+
+            for copy in copies:
+                if self._place_copy(primary, copy, data):
+                    report.linked += 1
+                else:
+                    report.skipped += 1
+
+        except OSError as e:
+            console.print(f"[yellow]Warning: Could not write {primary}: {e}[/yellow]")
+            report.failed += 1
+
+        return report
+
+    def _place_copy(self, primary: Path, copy: Path, data: bytes) -> bool:
+        """
+        Make copy point at (or match) primary.
+
+        Returns:
+            True if the copy changed on disk
+        """
+        if self.link_mode == "copy":
+            if _content_matches(copy, data, hashlib.sha256(data).digest()):
+                return False
+            shutil.copyfile(primary, copy)
+            return True
+
+        if _same_file(copy, primary):
+            return False
+
+        if copy.is_symlink() or copy.exists():
+            copy.unlink()
+
+        if self.link_mode == "symlink":
+            copy.symlink_to(os.path.relpath(primary, copy.parent))
+            return True
+
+        try:
+            os.link(primary, copy)
+        except OSError:
+            # Hard links fail across devices and on some filesystems
+            shutil.copyfile(primary, copy)
+        return True
+
+    def _prune(self, pattern: str) -> int:
+        """Remove files matching pattern under root that were not planned"""
+        planned = {path.absolute() for path in self.planned_paths()}
+        removed = 0
+
+        for path in self.root.rglob(pattern):
+            if (path.is_file() or path.is_symlink()) and path.absolute() not in planned:
+                path.unlink()
+                removed += 1
+
+        return removed
@@ -0,0 +1,134 @@
+"""
+On-Disk Page Text Cache for PDFs
+
+Stores the extracted text of every non-blank page of a PDF in a single
+binary file keyed by the PDF's content hash and the text extractor version,
+so reference books are parsed once rather than on every run. Files are
+memory-mapped on load and only the requested pages are decoded, so a cached
+book loads in milliseconds.
+
+File layout (little-endian):
+    header   magic, format version, extractor version, page count, entry count
+    index    one (page number, offset, length) entry per stored page
+    text     UTF-8 page texts, back to back
+"""
+
+import mmap
+import os
+import struct
+import uuid
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from rich.console import Console
+
+
+console = Console()
+
+
+# Bump when the binary layout changes
+PAGE_CACHE_FORMAT_VERSION = 1
+
+DEFAULT_PDF_CACHE_DIR = Path(__file__).parent.parent.parent / "references" / "_pdf_cache"
+
+_MAGIC = b"PDFP"
+_HEADER = struct.Struct("<4sIIII")
+_ENTRY = struct.Struct("<IQQ")
+
+
+class PdfPageCache:
+    """Reads and writes per-page text for PDFs identified by content hash"""
+
+    def __init__(self, root: Optional[Path] = None, extractor_version: int = 1):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Cache directory (defaults to $PDF_CACHE_DIR or
+                references/_pdf_cache)
+            extractor_version: Version of the text extractor; entries written
+                by other versions are ignored
+        """
+        if root is None:
+            root = os.getenv("PDF_CACHE_DIR", str(DEFAULT_PDF_CACHE_DIR))
+        self.root = Path(root)
+        self.extractor_version = extractor_version
+
+    def path_for(self, pdf_hash: str) -> Path:
+        """Get the cache file path for a PDF"""
+        return self.root / f"{pdf_hash}.v{self.extractor_version}.pages"
+
+    def get(
+        self,
+        pdf_hash: str,
+        start_page: int = 1,
+        end_page: Optional[int] = None
+    ) -> Optional[Tuple[int, List[Tuple[int, str]]]]:
+        """
+        Load cached pages, decoding only those in the requested range.
+
+        Args:
+            pdf_hash: SHA-256 of the PDF file
+            start_page: First page to return (1-based)
+            end_page: Last page to return, inclusive
+
+        Returns:
+            (page_count, [(page_number, text), ...]) or None on a cache miss
+            or an unreadable entry
+        """
+        path = self.path_for(pdf_hash)
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, format_version, extractor_version, page_count, entries = \
+                    _HEADER.unpack_from(data, 0)
+                if (magic != _MAGIC
+                        or format_version != PAGE_CACHE_FORMAT_VERSION
+                        or extractor_version != self.extractor_version):
+                    return None
+
+                last = page_count if end_page is None else end_page
+                pages = []
+                for page_number, offset, length in _ENTRY.iter_unpack(
+                    data[_HEADER.size:_HEADER.size + entries * _ENTRY.size]
+                ):
+                    if start_page <= page_number <= last:
+                        pages.append((page_number, data[offset:offset + length].decode("utf-8")))
+                return page_count, pages
+
+        except (OSError, ValueError, struct.error, UnicodeDecodeError):
+            return None
+
+    def put(self, pdf_hash: str, page_count: int, pages: Sequence[Tuple[int, str]]):
+        """
+        Store every non-blank page of a PDF.
+
+        Args:
+            pdf_hash: SHA-256 of the PDF file
+            page_count: Total pages in the PDF, including blank ones
+            pages: (page_number, text) for each non-blank page, in order
+        """
+        encoded = [(page_number, text.encode("utf-8")) for page_number, text in pages]
+
+        offset = _HEADER.size + len(encoded) * _ENTRY.size
+        index = []
+        for page_number, data in encoded:
+            index.append(_ENTRY.pack(page_number, offset, len(data)))
+            offset += len(data)
+
+        path = self.path_for(pdf_hash)
+        # Unique per writer: threads of one process share the pid
+        temp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            with open(temp, "wb") as f:
+                f.write(_HEADER.pack(
+                    _MAGIC, PAGE_CACHE_FORMAT_VERSION, self.extractor_version,
+                    page_count, len(encoded)
+                ))
+                f.writelines(index)
+                f.writelines(data for _, data in encoded)
+            os.replace(temp, path)
+        except OSError as e:
+            temp.unlink(missing_ok=True)
+            console.print(f"[yellow]Warning: Could not write PDF page cache {path}: {e}[/yellow]")
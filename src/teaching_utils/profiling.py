@@ -0,0 +1,557 @@
+"""
+Stage Profilers for PDF-to-Skills Workflows
+
+Attributes wall-clock time to pipeline stages and books and splits it into
+CPU time on the event loop, blocking time on the loop (synchronous file I/O
+such as checkpoint writes) and awaited time (network calls, worker threads,
+queues). Also samples event-loop lag. Results are printed as a table and
+written as JSON and as folded stacks for flamegraph tools.
+
+A separate memory profiler snapshots tracemalloc at stage boundaries to
+report peak memory and the top allocation sites per stage and book, and can
+enforce a memory budget.
+"""
+
+import asyncio
+import json
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+from rich.console import Console
+from rich.table import Table
+
+
+console = Console()
+
+
+class StageProfile(BaseModel):
+    """Time spent in one stage of one book"""
+    book: str
+    stage: str
+    calls: int
+    wall_s: float
+    cpu_s: float
+    blocked_s: float
+    awaited_s: float
+
+
+class _SpanTotals:
+    """Mutable accumulator for a (book, stage) pair"""
+    __slots__ = ("calls", "wall", "running", "cpu")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.running = 0.0
+        self.cpu = 0.0
+
+
+class _SpanDriver:
+    """
+    Drives a coroutine step by step, charging each step to a span.
+
+    Time inside ``send``/``throw`` is time the coroutine ran on the loop;
+    time between steps is time it spent awaiting.
+    """
+
+    def __init__(self, profiler: "WorkflowProfiler", coro: Any, span: _SpanTotals, timed: bool):
+        self.profiler = profiler
+        self.coro = coro
+        self.span = span
+        self.timed = timed
+
+    def __await__(self):
+        profiler, coro, span = self.profiler, self.coro, self.span
+        start = time.perf_counter()
+        value, error = None, None
+
+        try:
+            while True:
+                with profiler._running(span):
+                    try:
+                        if error is None:
+                            yielded = coro.send(value)
+                        else:
+                            yielded = coro.throw(error)
+                    except StopIteration as stop:
+                        return stop.value
+
+                try:
+                    value, error = (yield yielded), None
+                except BaseException as e:
+                    value, error = None, e
+        finally:
+            if self.timed:
+                span.calls += 1
+                span.wall += time.perf_counter() - start
+
+
+class WorkflowProfiler:
+    """Opt-in profiler for a workflow run"""
+
+    def __init__(self, lag_interval: float = 0.05):
+        """
+        Initialize the profiler.
+
+        Args:
+            lag_interval: Seconds between event-loop lag samples
+        """
+        self.lag_interval = lag_interval
+        self.lag_samples: List[float] = []
+        self._spans: Dict[Tuple[str, str], _SpanTotals] = {}
+        self._active: Optional[_SpanTotals] = None
+        self._lag_task: Optional[asyncio.Task] = None
+        self._previous_factory = None
+        self._started_at = 0.0
+        self._process_cpu_start = 0.0
+        self.wall_s = 0.0
+        self.process_cpu_s = 0.0
+
+    def start(self):
+        """
+        Start lag sampling and attribute tasks to the span that created them.
+
+        Must be called from inside the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        self._started_at = time.perf_counter()
+        self._process_cpu_start = time.process_time()
+
+        self._previous_factory = loop.get_task_factory()
+        loop.set_task_factory(self._task_factory)
+        self._lag_task = loop.create_task(self._sample_lag())
+
+    async def stop(self):
+        """Stop lag sampling and restore the loop's task factory"""
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            await asyncio.gather(self._lag_task, return_exceptions=True)
+            self._lag_task = None
+
+        asyncio.get_running_loop().set_task_factory(self._previous_factory)
+        self.wall_s = time.perf_counter() - self._started_at
+        self.process_cpu_s = time.process_time() - self._process_cpu_start
+
+    def profile(self, awaitable: Awaitable[Any], stage: str, book: Optional[str] = None) -> Awaitable[Any]:
+        """
+        Wrap a coroutine so its time is charged to a stage.
+
+        Tasks the coroutine creates (e.g. concurrent chunk calls) are charged
+        to the same stage.
+
+        Args:
+            awaitable: Coroutine to profile
+            stage: Stage name
+            book: Book being processed, if any
+
+        Returns:
+            Awaitable producing the coroutine's result
+        """
+        return _SpanDriver(self, awaitable, self._span(stage, book), timed=True)
+
+    @contextmanager
+    def measure(self, stage: str, book: Optional[str] = None) -> Iterator[None]:
+        """
+        Charge a synchronous block to a stage.
+
+        Args:
+            stage: Stage name
+            book: Book being processed, if any
+        """
+        span = self._span(stage, book)
+        start = time.perf_counter()
+        try:
+            with self._running(span):
+                yield
+        finally:
+            span.calls += 1
+            span.wall += time.perf_counter() - start
+
+    def record(self, stage: str, book: Optional[str], wall_s: float, cpu_s: float):
+        """
+        Record an externally measured span (e.g. a subprocess).
+
+        Args:
+            stage: Stage name
+            book: Book or group name, if any
+            wall_s: Elapsed seconds
+            cpu_s: CPU seconds used
+        """
+        span = self._span(stage, book)
+        span.calls += 1
+        span.wall += wall_s
+        span.running += cpu_s
+        span.cpu += cpu_s
+
+    def stages(self) -> List[StageProfile]:
+        """Per-book, per-stage timings in first-seen order"""
+        return [
+            StageProfile(
+                book=book,
+                stage=stage,
+                calls=span.calls,
+                wall_s=round(span.wall, 4),
+                cpu_s=round(span.cpu, 4),
+                blocked_s=round(max(span.running - span.cpu, 0.0), 4),
+                awaited_s=round(max(span.wall - span.running, 0.0), 4)
+            )
+            for (book, stage), span in self._spans.items()
+        ]
+
+    def summarize(self) -> Dict[str, Any]:
+        """
+        Build the profile report.
+
+        Returns:
+            Dictionary with run totals, per-stage and per-book totals,
+            per-book stage timings and event-loop lag statistics
+        """
+        stages = self.stages()
+
+        def totals(key: str) -> Dict[str, Dict[str, float]]:
+            grouped: Dict[str, Dict[str, float]] = {}
+            for profile in stages:
+                entry = grouped.setdefault(getattr(profile, key), dict.fromkeys(
+                    ("wall_s", "cpu_s", "blocked_s", "awaited_s"), 0.0
+                ))
+                for field in entry:
+                    entry[field] = round(entry[field] + getattr(profile, field), 4)
+            return grouped
+
+        loop_cpu = sum(profile.cpu_s for profile in stages)
+        lags = sorted(self.lag_samples)
+
+        return {
+            "wall_s": round(self.wall_s, 4),
+            "process_cpu_s": round(self.process_cpu_s, 4),
+            # CPU not spent on the event loop thread ran in worker threads
+            "worker_thread_cpu_s": round(max(self.process_cpu_s - loop_cpu, 0.0), 4),
+            "by_stage": totals("stage"),
+            "by_book": totals("book"),
+            "stages": [profile.model_dump() for profile in stages],
+            "loop_lag": {
+                "samples": len(lags),
+                "mean_ms": round(statistics.fmean(lags) * 1000, 3) if lags else 0.0,
+                "p95_ms": round(lags[int(0.95 * (len(lags) - 1))] * 1000, 3) if lags else 0.0,
+                "max_ms": round(lags[-1] * 1000, 3) if lags else 0.0
+            }
+        }
+
+    def write_report(self, path: Path) -> Path:
+        """
+        Write the JSON report and a folded-stack file next to it.
+
+        The ``.folded`` file has one ``book;stage;kind microseconds`` line
+        per stack and can be loaded by flamegraph.pl, speedscope or inferno.
+
+        Args:
+            path: Destination of the JSON report
+
+        Returns:
+            Path to the JSON report
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.summarize(), indent=2), encoding="utf-8")
+
+        lines = []
+        for profile in self.stages():
+            for kind in ("cpu", "blocked", "awaited"):
+                micros = int(getattr(profile, f"{kind}_s") * 1_000_000)
+                if micros:
+                    lines.append(f"{profile.book};{profile.stage};{kind} {micros}")
+        folded = path.with_suffix(".folded")
+        folded.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        console.print(f"[dim]Profile saved to {path} (flamegraph: {folded})[/dim]")
+        return path
+
+    def print_summary(self):
+        """Print per-stage profile table to console"""
+        summary = self.summarize()
+
+        table = Table(title="Profile by Stage")
+        table.add_column("Stage", style="cyan")
+        table.add_column("Wall (s)", justify="right")
+        table.add_column("CPU (s)", justify="right")
+        table.add_column("Blocked (s)", justify="right")
+        table.add_column("Awaited (s)", justify="right")
+
+        for stage, stats in summary["by_stage"].items():
+            table.add_row(
+                stage,
+                f"{stats['wall_s']:.2f}",
+                f"{stats['cpu_s']:.2f}",
+                f"{stats['blocked_s']:.2f}",
+                f"{stats['awaited_s']:.2f}"
+            )
+        console.print(table)
+
+        lag = summary["loop_lag"]
+        console.print(
+            f"Run wall time: {summary['wall_s']:.2f}s | process CPU: {summary['process_cpu_s']:.2f}s "
+            f"(worker threads: {summary['worker_thread_cpu_s']:.2f}s) | "
+            f"loop lag mean/p95/max: {lag['mean_ms']:.1f}/{lag['p95_ms']:.1f}/{lag['max_ms']:.1f} ms"
+        )
+
+    def _span(self, stage: str, book: Optional[str]) -> _SpanTotals:
+        """Get the accumulator for a stage of a book"""
+        key = (book or "_workflow", stage)
+        span = self._spans.get(key)
+        if span is None:
+            span = self._spans[key] = _SpanTotals()
+        return span
+
+    @contextmanager
+    def _running(self, span: _SpanTotals) -> Iterator[None]:
+        """
+        Charge time running on the loop thread to a span.
+
+        Nested spans get the time exclusively: it is removed from the span
+        that was running when they started.
+        """
+        parent = self._active
+        self._active = span
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            cpu = time.thread_time() - cpu_start
+            span.running += elapsed
+            span.cpu += cpu
+            if parent is not None:
+                parent.running -= elapsed
+                parent.cpu -= cpu
+            self._active = parent
+
+    def _task_factory(self, loop, coro, **kwargs):
+        """Create tasks whose steps are charged to the creating span"""
+        span = self._active
+        if span is not None:
+            coro = self._attributed(_SpanDriver(self, coro, span, timed=False))
+
+        if self._previous_factory is not None:
+            return self._previous_factory(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    @staticmethod
+    async def _attributed(driver: _SpanDriver) -> Any:
+        return await driver
+
+    async def _sample_lag(self):
+        """Measure how late the loop wakes up from a fixed sleep"""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self.lag_samples.append(max(time.perf_counter() - start - self.lag_interval, 0.0))
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """Raised when a run's peak traced memory exceeds the configured budget"""
+
+
+class AllocationSite(BaseModel):
+    """Memory allocated at one source line during a stage"""
+    location: str
+    size_diff_kb: float
+    count_diff: int
+
+
+class StageMemory(BaseModel):
+    """Memory measured at the end of one stage of one book"""
+    book: str
+    stage: str
+    traced_current_mb: float
+    traced_peak_mb: float
+    rss_peak_mb: float
+    top_allocations: List[AllocationSite]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class MemoryProfiler:
+    """
+    Opt-in tracemalloc instrumentation taken at stage boundaries.
+
+    Peaks are reset at each boundary, so a stage's peak covers the time
+    since the previous boundary. With several books in flight, boundaries
+    interleave and a stage's numbers include concurrent work.
+    """
+
+    _IGNORED = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>")
+    )
+
+    def __init__(self, budget_mb: Optional[float] = None, top_n: int = 5, frames: int = 1):
+        """
+        Initialize the memory profiler.
+
+        Args:
+            budget_mb: Maximum allowed peak traced memory in MB (no limit if None)
+            top_n: Allocation sites reported per stage
+            frames: Stack frames stored per allocation
+        """
+        self.budget_mb = budget_mb
+        self.top_n = top_n
+        self.frames = frames
+        self.stages: List[StageMemory] = []
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+
+    def start(self):
+        """Start tracing allocations (if not already) and take a baseline snapshot"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._previous = self._snapshot()
+
+    def stop(self):
+        """Stop tracing if this profiler started it"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._previous = None
+
+    def checkpoint(self, stage: str, book: Optional[str] = None) -> Optional[StageMemory]:
+        """
+        Record memory at the end of a stage.
+
+        Args:
+            stage: Stage that just finished
+            book: Book being processed, if any
+
+        Returns:
+            The recorded measurement, or None if not tracing
+        """
+        if self._previous is None or not tracemalloc.is_tracing():
+            return None
+
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        snapshot = self._snapshot()
+
+        top = [
+            AllocationSite(
+                location=str(stat.traceback[0]),
+                size_diff_kb=round(stat.size_diff / 1024, 1),
+                count_diff=stat.count_diff
+            )
+            for stat in snapshot.compare_to(self._previous, "lineno")[:self.top_n]
+            if stat.size_diff > 0
+        ]
+        self._previous = snapshot
+
+        measurement = StageMemory(
+            book=book or "_workflow",
+            stage=stage,
+            traced_current_mb=round(current / (1024 * 1024), 2),
+            traced_peak_mb=round(peak / (1024 * 1024), 2),
+            rss_peak_mb=round(peak_rss_mb(), 2),
+            top_allocations=top
+        )
+        self.stages.append(measurement)
+        return measurement
+
+    @property
+    def peak_mb(self) -> float:
+        """Highest traced peak over all stages"""
+        return max((stage.traced_peak_mb for stage in self.stages), default=0.0)
+
+    def check_budget(self):
+        """
+        Fail if the peak traced memory exceeded the budget.
+
+        Raises:
+            MemoryBudgetExceeded: If a budget is set and was exceeded
+        """
+        if self.budget_mb is None or self.peak_mb <= self.budget_mb:
+            return
+
+        worst = max(self.stages, key=lambda stage: stage.traced_peak_mb)
+        raise MemoryBudgetExceeded(
+            f"Peak traced memory {self.peak_mb:.1f} MB exceeds budget of "
+            f"{self.budget_mb:.1f} MB (stage '{worst.stage}' of {worst.book})"
+        )
+
+    def summarize(self) -> Dict[str, Any]:
+        """
+        Build the memory report.
+
+        Returns:
+            Dictionary with peak figures, budget and per-stage measurements
+        """
+        return {
+            "traced_peak_mb": self.peak_mb,
+            "rss_peak_mb": round(peak_rss_mb(), 2),
+            "budget_mb": self.budget_mb,
+            "within_budget": self.budget_mb is None or self.peak_mb <= self.budget_mb,
+            "stages": [stage.model_dump() for stage in self.stages]
+        }
+
+    def write_report(self, path: Path) -> Path:
+        """
+        Write the memory report as JSON.
+
+        Args:
+            path: Destination file
+
+        Returns:
+            Path to the written report
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.summarize(), indent=2), encoding="utf-8")
+
+        console.print(f"[dim]Memory report saved to {path}[/dim]")
+        return path
+
+    def print_summary(self):
+        """Print per-stage memory table to console"""
+        if not self.stages:
+            return
+
+        table = Table(title="Memory by Stage")
+        table.add_column("Book", style="cyan")
+        table.add_column("Stage", style="cyan")
+        table.add_column("Current (MB)", justify="right")
+        table.add_column("Peak (MB)", justify="right")
+        table.add_column("Top Allocation Site")
+
+        for stage in self.stages:
+            top = stage.top_allocations[0] if stage.top_allocations else None
+            table.add_row(
+                stage.book,
+                stage.stage,
+                f"{stage.traced_current_mb:.1f}",
+                f"{stage.traced_peak_mb:.1f}",
+                f"{Path(top.location).name} (+{top.size_diff_kb:.0f} KB)" if top else ""
+            )
+        console.print(table)
+
+        budget = f" / budget {self.budget_mb:.1f} MB" if self.budget_mb is not None else ""
+        console.print(
+            f"Peak traced memory: {self.peak_mb:.1f} MB{budget} | "
+            f"peak RSS: {peak_rss_mb():.1f} MB"
+        )
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        """Take a snapshot without tracemalloc and import machinery noise"""
+        return tracemalloc.take_snapshot().filter_traces(self._IGNORED)
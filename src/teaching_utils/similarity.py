@@ -0,0 +1,586 @@
+"""
+Skill Similarity: MinHash/LSH Clustering and TF-IDF Neighbours
+
+Shingles skill names and key concepts, summarizes each skill with a MinHash
+signature and buckets signatures with locality-sensitive hashing, so that
+candidate duplicates are found in near-linear time instead of comparing
+every pair of skills in the catalog. For graded scores, skills can also be
+embedded as sparse n-gram TF-IDF vectors and scored in blocks against an
+inverted index to find each skill's top-k nearest neighbours.
+"""
+
+import re
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from rich.console import Console
+
+
+console = Console()
+
+
+_HASH_SHIFT = np.uint64(32)
+# Slack below the threshold for MinHash estimates (about 2.5 standard
+# deviations at 128 permutations) before the exact check
+_ESTIMATE_MARGIN = 0.1
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# Words that do not change what a skill name means
+_NAME_STOPWORDS = frozenset({
+    "a", "an", "and", "by", "for", "from", "in", "into", "of", "on", "or",
+    "the", "to", "using", "via", "with"
+})
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase a skill name and collapse punctuation and whitespace"""
+    return " ".join(_WORD_PATTERN.findall(name.lower()))
+
+
+def name_tokens(name: str) -> List[str]:
+    """Content words of a skill name, in order, with plural -s removed"""
+    tokens = []
+    for word in _WORD_PATTERN.findall(name.lower()):
+        if word in _NAME_STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def _within_one_edit(first: str, second: str) -> bool:
+    """Whether two words differ by at most one insertion, deletion or substitution"""
+    if abs(len(first) - len(second)) > 1:
+        return False
+    if len(first) > len(second):
+        first, second = second, first
+    for i, (a, b) in enumerate(zip(first, second)):
+        if a != b:
+            skip = 0 if len(first) == len(second) else -1
+            return first[i + 1 + skip:] == second[i + 1:]
+    return True
+
+
+def names_match(first: str, second: str) -> bool:
+    """
+    Whether two skill names name the same skill, compared token by token.
+
+    Stopwords and plural "s" are ignored. Every remaining word must match
+    its counterpart exactly, except that words of five or more letters may
+    differ by one edit ("visualisation" / "visualization"). Numbers must
+    match exactly, so "Skill 41" and "Skill 414" stay apart, as do
+    "List comprehensions" and "Set comprehensions".
+
+    Args:
+        first: Skill name
+        second: Skill name
+
+    Returns:
+        True if the names match
+    """
+    tokens_a, tokens_b = name_tokens(first), name_tokens(second)
+    if len(tokens_a) != len(tokens_b):
+        return False
+    return all(
+        a == b or (a.isalpha() and b.isalpha() and min(len(a), len(b)) >= 5 and _within_one_edit(a, b))
+        for a, b in zip(tokens_a, tokens_b)
+    )
+
+
+def skill_shingles(
+    name: str,
+    key_concepts: Iterable[str] = (),
+    shingle_size: int = 3
+) -> Set[str]:
+    """
+    Build the shingle set describing a skill.
+
+    Character n-grams of the name's content words (see name_tokens)
+    tolerate plurals, stopwords and small wording changes; key concepts
+    contribute whole words.
+
+    Args:
+        name: Skill name
+        key_concepts: Key concepts of the skill
+        shingle_size: Character n-gram length for the name
+
+    Returns:
+        Set of shingles (never empty)
+    """
+    text = " ".join(name_tokens(name))
+    padded = f" {text} "
+    shingles = {
+        "n:" + padded[i:i + shingle_size]
+        for i in range(max(len(padded) - shingle_size + 1, 1))
+    }
+    for concept in key_concepts:
+        shingles.update("k:" + word for word in _WORD_PATTERN.findall(concept.lower()))
+    return shingles
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick the LSH band layout whose S-curve threshold is closest to the target.
+
+    A pair with Jaccard similarity s becomes a candidate with probability
+    1 - (1 - s^rows)^bands, which rises steeply around (1/bands)^(1/rows).
+
+    Args:
+        num_perm: Signature length
+        threshold: Target Jaccard similarity
+
+    Returns:
+        Tuple of (bands, rows) with bands * rows == num_perm
+    """
+    layouts = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(layouts, key=lambda layout: abs((1 / layout[0]) ** (1 / layout[1]) - threshold))
+
+
+class _DisjointSet:
+    """Union-find over integer ids with path halving"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Keep the earliest item as root so clusters list it first
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            self.parent[root_b] = root_a
+
+
+class SkillSimilarityIndex:
+    """MinHash/LSH index that groups near-duplicate skills into clusters"""
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        num_perm: int = 128,
+        bands: Optional[int] = None,
+        shingle_size: int = 3,
+        seed: int = 1,
+        batch_size: int = 512,
+        bucket_window: int = 64
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            threshold: Minimum Jaccard similarity of two skills' shingle
+                sets for them to be considered duplicates
+            num_perm: Number of MinHash permutations (signature length)
+            bands: Number of LSH bands; derived from the threshold if omitted
+            shingle_size: Character n-gram length for skill names
+            seed: Seed for the MinHash permutations
+            batch_size: Skills hashed per vectorized batch
+            bucket_window: Neighbours each bucket member is compared with,
+                which bounds the work for very large buckets
+        """
+        if bands is None:
+            bands, rows = choose_bands(num_perm, threshold)
+        elif num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        else:
+            rows = num_perm // bands
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        self.batch_size = batch_size
+        self.bucket_window = bucket_window
+
+        rng = np.random.default_rng(seed)
+        high = np.iinfo(np.uint64).max
+        self._perm_a = rng.integers(1, high, size=(num_perm, 1), dtype=np.uint64) | np.uint64(1)
+        self._perm_b = rng.integers(0, high, size=(num_perm, 1), dtype=np.uint64)
+        self._band_mix = rng.integers(1, high, size=rows, dtype=np.uint64) | np.uint64(1)
+
+    def signatures(self, shingle_sets: Sequence[Set[str]]) -> np.ndarray:
+        """
+        Compute MinHash signatures for a list of shingle sets.
+
+        Args:
+            shingle_sets: Non-empty shingle sets
+
+        Returns:
+            Array of shape (len(shingle_sets), num_perm)
+        """
+        signatures = np.empty((len(shingle_sets), self.num_perm), dtype=np.uint64)
+
+        for start in range(0, len(shingle_sets), self.batch_size):
+            batch = shingle_sets[start:start + self.batch_size]
+            hashes = np.fromiter(
+                (zlib.crc32(s.encode("utf-8")) for shingles in batch for s in shingles),
+                dtype=np.uint64
+            )
+            offsets = np.cumsum([0] + [len(shingles) for shingles in batch[:-1]])
+
+            # Multiply-shift hashing; uint64 wrap-around is part of the hash
+            with np.errstate(over="ignore"):
+                permuted = (self._perm_a * hashes + self._perm_b) >> _HASH_SHIFT
+            signatures[start:start + len(batch)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+
+        return signatures
+
+    def find_clusters(self, skills: Sequence[Any]) -> List[List[int]]:
+        """
+        Group near-duplicate skills.
+
+        Skills with the same normalized name are always grouped. Other pairs
+        are candidates when they share an LSH bucket, and are grouped only
+        when the exact Jaccard similarity of their shingle sets reaches the
+        threshold and their names match token by token (see names_match).
+
+        Args:
+            skills: Objects with ``name`` and ``key_concepts`` attributes
+
+        Returns:
+            Clusters of skill indices (singletons included), ordered by
+            first occurrence, each listing its indices in input order
+        """
+        count = len(skills)
+        clusters = _DisjointSet(count)
+
+        first_by_name = {}
+        representatives = []
+        for index, skill in enumerate(skills):
+            name = normalize_name(skill.name)
+            first = first_by_name.setdefault(name, index) if name else index
+            if first != index:
+                clusters.union(first, index)
+            else:
+                representatives.append(index)
+
+        # Near-duplicates are searched among one skill per distinct name
+        if len(representatives) > 1:
+            shingle_sets = [
+                skill_shingles(skills[index].name, skills[index].key_concepts, self.shingle_size)
+                for index in representatives
+            ]
+            for a, b in self._candidate_pairs(self.signatures(shingle_sets)).tolist():
+                shared = len(shingle_sets[a] & shingle_sets[b])
+                jaccard = shared / (len(shingle_sets[a]) + len(shingle_sets[b]) - shared)
+                first, second = skills[representatives[a]], skills[representatives[b]]
+                if jaccard >= self.threshold and names_match(first.name, second.name):
+                    clusters.union(representatives[a], representatives[b])
+
+        groups = {}
+        for index in range(count):
+            groups.setdefault(clusters.find(index), []).append(index)
+        return list(groups.values())
+
+    def _candidate_pairs(self, signatures: np.ndarray) -> np.ndarray:
+        """
+        Find candidate pairs: skills that share an LSH bucket and whose
+        estimated similarity is close to the threshold.
+
+        Every pair of members in a bucket is a candidate; in buckets larger
+        than bucket_window, each member is paired with the next
+        bucket_window members only.
+
+        Args:
+            signatures: MinHash signatures
+
+        Returns:
+            Array of shape (pairs, 2) with candidate index pairs (first < second)
+        """
+        pairs = []
+
+        with np.errstate(over="ignore"):
+            banded = signatures.reshape(len(signatures), self.bands, self.rows)
+            band_keys = (banded * self._band_mix).sum(axis=2)
+
+        for keys in band_keys.T:
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+
+            # Pair members that are `offset` apart within the same bucket
+            for offset in range(1, self.bucket_window + 1):
+                same = np.flatnonzero(sorted_keys[offset:] == sorted_keys[:-offset])
+                if not len(same):
+                    break
+                first, second = order[same], order[same + offset]
+                low, high = np.minimum(first, second), np.maximum(first, second)
+                pairs.append(low.astype(np.int64) * len(signatures) + high)
+
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+
+        encoded = np.unique(np.concatenate(pairs))
+        candidates = np.stack(np.divmod(encoded, len(signatures)), axis=1)
+
+        # Cheap pre-check on the signatures; the margin keeps pairs whose
+        # estimate falls just short through sampling noise
+        similarity = (signatures[candidates[:, 0]] == signatures[candidates[:, 1]]).mean(axis=1)
+        return candidates[similarity >= self.threshold - _ESTIMATE_MARGIN]
+
+
+def text_features(text: str, analyzer: str = "char", ngram_size: int = 3) -> List[str]:
+    """
+    Split text into the features used for TF-IDF vectors.
+
+    Args:
+        text: Text to featurize (e.g. a skill name)
+        analyzer: "char" for character n-grams within word boundaries,
+            "token" for words
+        ngram_size: Character n-gram length for the "char" analyzer
+
+    Returns:
+        Features, with repeats (term frequency matters)
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    if analyzer == "token":
+        return words
+    if analyzer != "char":
+        raise ValueError(f"Unknown analyzer: {analyzer}")
+
+    features = []
+    for word in words:
+        padded = f" {word} "
+        features.extend(
+            padded[i:i + ngram_size]
+            for i in range(max(len(padded) - ngram_size + 1, 1))
+        )
+    return features
+
+
+class SparseVectors:
+    """L2-normalized row vectors in compressed sparse row (CSR) layout"""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, num_features: int):
+        """
+        Initialize from CSR arrays.
+
+        Args:
+            indptr: Row start offsets into indices/data (length rows + 1)
+            indices: Column of each stored value, sorted within a row
+            data: Stored values
+            num_features: Number of columns
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.num_features = num_features
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def row(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Columns and values stored for one row"""
+        start, stop = self.indptr[index], self.indptr[index + 1]
+        return self.indices[start:stop], self.data[start:stop]
+
+    def dot(self, first: int, second: int) -> float:
+        """Dot product (cosine similarity) of two rows"""
+        columns_a, values_a = self.row(first)
+        columns_b, values_b = self.row(second)
+        _, position_a, position_b = np.intersect1d(
+            columns_a, columns_b, assume_unique=True, return_indices=True
+        )
+        return float(values_a[position_a] @ values_b[position_b])
+
+    def to_dense(self) -> np.ndarray:
+        """Expand to a dense float32 array of shape (rows, num_features)"""
+        dense = np.zeros((len(self), self.num_features), dtype=np.float32)
+        rows = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense
+
+
+def tfidf_matrix(
+    texts: Sequence[str],
+    analyzer: str = "char",
+    ngram_size: int = 3,
+    use_idf: bool = True
+) -> SparseVectors:
+    """
+    Embed texts as L2-normalized sparse TF-IDF vectors.
+
+    Every distinct feature gets its own column (no hashing), so unrelated
+    features never collide and inflate scores on large catalogs.
+
+    Args:
+        texts: Texts to embed
+        analyzer: "char" or "token" (see text_features)
+        ngram_size: Character n-gram length for the "char" analyzer
+        use_idf: Weight features by smoothed inverse document frequency
+
+    Returns:
+        Sparse vectors, one row per text; rows of texts without features
+        are empty
+    """
+    vocabulary: Dict[str, int] = {}
+    rows, columns = [], []
+    for row, text in enumerate(texts):
+        features = text_features(text, analyzer, ngram_size)
+        rows.extend([row] * len(features))
+        columns.extend(vocabulary.setdefault(f, len(vocabulary)) for f in features)
+
+    count = len(texts)
+    num_features = max(len(vocabulary), 1)
+    cells, counts = np.unique(
+        np.asarray(rows, dtype=np.int64) * num_features + np.asarray(columns, dtype=np.int64),
+        return_counts=True
+    )
+    row_ids, column_ids = np.divmod(cells, num_features)
+
+    # Sublinear term frequency
+    data = np.log1p(counts).astype(np.float32)
+
+    if use_idf:
+        document_frequency = np.bincount(column_ids, minlength=num_features)
+        idf = np.log((1 + count) / (1 + document_frequency)) + 1
+        data *= idf[column_ids].astype(np.float32)
+
+    norms = np.sqrt(np.bincount(row_ids, weights=data.astype(np.float64) ** 2, minlength=count))
+    data /= norms[row_ids].astype(np.float32)
+
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_ids, minlength=count), out=indptr[1:])
+    return SparseVectors(indptr, column_ids, data, num_features)
+
+
+def top_k_neighbors(
+    vectors: SparseVectors,
+    k: int = 5,
+    block_size: int = 1024,
+    dense_features: int = 256,
+    max_products: int = 1 << 22,
+    max_block_scores: int = 1 << 23
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find each row's k most similar other rows by cosine similarity.
+
+    Rows are scored a block at a time. The most common features (such as
+    frequent n-grams) are scored with a dense matrix product; all other
+    features are scored through an inverted index (columns to the rows that
+    use them), so rare features only touch the rows that share them. Blocks
+    shrink as the row count grows so each holds at most ``max_block_scores``
+    float32 scores (plus their int64 positions during selection): about
+    100 MB by default, whatever the catalog size.
+
+    Args:
+        vectors: Sparse vectors from tfidf_matrix
+        k: Neighbours per row
+        block_size: Maximum rows scored at once
+        dense_features: Most common features scored densely (n x
+            dense_features float32 matrix)
+        max_products: Soft cap on inverted-index products per block
+        max_block_scores: Cap on block rows x n, bounding block memory
+
+    Returns:
+        Tuple of (indices, scores), each of shape (n, min(k, n - 1)), with
+        neighbours sorted by descending similarity
+    """
+    count = len(vectors)
+    k = min(k, count - 1)
+    indices = np.empty((count, max(k, 0)), dtype=np.int64)
+    scores = np.empty((count, max(k, 0)), dtype=np.float32)
+    if k <= 0:
+        return indices, scores
+
+    row_of_entry = np.repeat(np.arange(count), np.diff(vectors.indptr))
+    frequency = np.bincount(vectors.indices, minlength=vectors.num_features)
+
+    # Dense part: the most common features
+    dense_columns = np.argsort(-frequency, kind="stable")[:dense_features]
+    dense_position = np.full(vectors.num_features, -1, dtype=np.int64)
+    dense_position[dense_columns] = np.arange(len(dense_columns))
+    is_dense = dense_position[vectors.indices] >= 0
+    dense = np.zeros((count, len(dense_columns)), dtype=np.float32)
+    dense[row_of_entry[is_dense], dense_position[vectors.indices[is_dense]]] = vectors.data[is_dense]
+
+    # Sparse part: everything else, with an inverted index over its columns
+    sparse_rows = row_of_entry[~is_dense]
+    sparse_columns = vectors.indices[~is_dense]
+    sparse_data = vectors.data[~is_dense]
+    sparse_indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sparse_rows, minlength=count), out=sparse_indptr[1:])
+
+    order = np.argsort(sparse_columns, kind="stable")
+    posting_rows = sparse_rows[order]
+    posting_data = sparse_data[order]
+    posting_length = np.bincount(sparse_columns, minlength=vectors.num_features)
+    posting_start = np.concatenate(([0], np.cumsum(posting_length)[:-1]))
+
+    # Inverted-index work per row is the total length of the postings it walks
+    entry_work = posting_length[sparse_columns]
+    row_work = np.bincount(sparse_rows, weights=entry_work, minlength=count)
+
+    block_size = max(1, min(block_size, max_block_scores // count))
+    start = 0
+    while start < count:
+        cumulative = np.cumsum(row_work[start:start + block_size])
+        stop = start + max(int(np.searchsorted(cumulative, max_products, side="right")), 1)
+
+        first, last = sparse_indptr[start], sparse_indptr[stop]
+        lengths = entry_work[first:last]
+        entry_offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = (
+            np.arange(int(lengths.sum())) - entry_offsets
+            + np.repeat(posting_start[sparse_columns[first:last]], lengths)
+        )
+        # Scores are accumulated in float32 in a single block-sized array
+        block = dense[start:stop] @ dense.T
+        np.add.at(
+            block.reshape(-1),
+            np.repeat(sparse_rows[first:last] - start, lengths) * count + posting_rows[positions],
+            np.repeat(sparse_data[first:last], lengths) * posting_data[positions]
+        )
+
+        # Negate in place: most scores are exactly zero, and selecting the k
+        # smallest negated scores avoids numpy's slow path for tied maxima.
+        # A row is not its own neighbour.
+        np.negative(block, out=block)
+        block[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        candidates = np.argpartition(block, k - 1, axis=1)[:, :k]
+        candidate_scores = -np.take_along_axis(block, candidates, axis=1)
+        ranked = np.argsort(-candidate_scores, axis=1)
+        indices[start:stop] = np.take_along_axis(candidates, ranked, axis=1)
+        scores[start:stop] = np.take_along_axis(candidate_scores, ranked, axis=1)
+        start = stop
+
+    return indices, scores
+
+
+def similar_pairs(
+    indices: np.ndarray,
+    scores: np.ndarray,
+    threshold: float
+) -> List[Tuple[int, int, float]]:
+    """
+    Turn top-k neighbour results into unique pairs above a threshold.
+
+    Args:
+        indices: Neighbour indices from top_k_neighbors
+        scores: Neighbour scores from top_k_neighbors
+        threshold: Minimum cosine similarity
+
+    Returns:
+        List of (i, j, score) with i < j, sorted by descending score
+    """
+    rows, positions = np.nonzero(scores >= threshold)
+    firsts = np.minimum(rows, indices[rows, positions])
+    seconds = np.maximum(rows, indices[rows, positions])
+    pair_scores = scores[rows, positions]
+
+    unique = {}
+    for first, second, score in zip(firsts.tolist(), seconds.tolist(), pair_scores.tolist()):
+        unique[(first, second)] = score
+
+    return sorted(
+        ((first, second, round(score, 3)) for (first, second), score in unique.items()),
+        key=lambda pair: -pair[2]
+    )
@@ -294,6 +294,41 @@ class StateManager:
 
         return step
 
+    def skip_step(
+        self,
+        state: WorkflowState,
+        step_id: str,
+        reason: Optional[str] = None,
+        save: bool = True
+    ) -> WorkflowStep:
+        """
+        Mark a step as skipped (e.g. its output is already up to date).
+
+        Args:
+            state: Workflow state
+            step_id: Step identifier
+            reason: Optional reason stored in step metadata
+            save: Whether to save checkpoint immediately
+
+        Returns:
+            Updated WorkflowStep
+        """
+        step = self.get_step(state, step_id)
+        if not step:
+            raise ValueError(f"Step not found: {step_id}")
+
+        step.status = StepStatus.SKIPPED
+        step.completed_at = datetime.now()
+        if reason:
+            step.metadata["skip_reason"] = reason
+
+        console.print(f"[dim]⊘ Skipped: {step.name}{f' ({reason})' if reason else ''}[/dim]")
+
+        if save:
+            self.save_checkpoint(state)
+
+        return step
+
     def get_next_pending_step(self, state: WorkflowState) -> Optional[WorkflowStep]:
         """
         Get the next pending step to execute.
@@ -345,7 +380,11 @@ class StateManager:
         console.print(f"Checkpoint: #{state.checkpoint_number}")
 
         summary = self.get_workflow_summary(state)
-        console.print(f"\nProgress: {summary['completed']}/{summary['total_steps']} steps completed")
+        # Skipped steps are up to date, so they count as done
+        done = summary['completed'] + summary['skipped']
+        console.print(f"\nProgress: {done}/{summary['total_steps']} steps done")
+        if summary['skipped'] > 0:
+            console.print(f"[dim]Up to date (skipped): {summary['skipped']}[/dim]")
 
         if summary['failed'] > 0:
             console.print(f"[red]Failed: {summary['failed']}[/red]")
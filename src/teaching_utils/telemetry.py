@@ -0,0 +1,498 @@
+"""
+Per-Call LLM Telemetry for PDF-to-Skills Pipeline
+
+Records token usage, latency, retries, cache hits and cost for every agent
+invocation so pipeline optimizations can be measured instead of guessed.
+Calls the pipeline avoids (pre-filtered or cached chunks) are recorded with
+an estimate of the prompt tokens they would have cost, and tool calls made
+on behalf of agents are timed along with where they ran.
+"""
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from rich.console import Console
+from rich.table import Table
+
+
+console = Console()
+
+
+class AgentCallRecord(BaseModel):
+    """Telemetry for a single agent invocation"""
+    role: str = Field(description="Agent role name (e.g. SkillIdentifierAgent)")
+    stage: str = Field(description="Pipeline stage (extract, identify, categorize, ...)")
+    book: Optional[str] = Field(default=None, description="Book being processed")
+    started_at: datetime = Field(default_factory=datetime.now)
+    latency_s: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    retries: int = 0
+    success: bool = True
+    error: Optional[str] = None
+
+    @property
+    def cache_hit(self) -> bool:
+        """Whether any prompt tokens were served from the provider cache"""
+        return self.cached_tokens > 0
+
+
+class SkippedCallRecord(BaseModel):
+    """An agent call the pipeline decided not to make"""
+    role: str
+    stage: str
+    book: Optional[str] = None
+    reason: str = Field(description="Why the call was skipped (prefilter, chunk_cache, ...)")
+    estimated_prompt_tokens: int = 0
+
+
+class ToolCallRecord(BaseModel):
+    """Timing for a single tool invocation"""
+    tool: str
+    mode: str = Field(description="Where the tool ran (inline, thread, process)")
+    started_at: datetime = Field(default_factory=datetime.now)
+    duration_s: float = 0.0
+    success: bool = True
+    error: Optional[str] = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text and code (about 4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+def extract_usage(response: Any) -> Tuple[int, int, int]:
+    """
+    Pull token counts out of an agent response or run object.
+
+    Understands agent_framework responses (``usage_details`` with
+    ``input_token_count``/``output_token_count``) and Azure AI Agents /
+    OpenAI style objects (``usage`` with ``prompt_tokens``/``completion_tokens``).
+
+    Args:
+        response: Agent response, thread run, or usage object
+
+    Returns:
+        Tuple of (prompt_tokens, completion_tokens, cached_tokens)
+    """
+    usage = getattr(response, "usage_details", None) or getattr(response, "usage", None) or response
+    if usage is None:
+        return 0, 0, 0
+
+    prompt = getattr(usage, "input_token_count", None)
+    if prompt is None:
+        prompt = getattr(usage, "prompt_tokens", None)
+    completion = getattr(usage, "output_token_count", None)
+    if completion is None:
+        completion = getattr(usage, "completion_tokens", None)
+
+    # Cached prompt tokens are reported in different places per SDK
+    cached = 0
+    for details_name in ("prompt_tokens_details", "prompt_token_details"):
+        details = getattr(usage, details_name, None)
+        if details is not None:
+            cached = getattr(details, "cached_tokens", 0) or 0
+            break
+    additional = getattr(usage, "additional_counts", None)
+    if not cached and isinstance(additional, dict):
+        cached = sum(
+            value for key, value in additional.items()
+            if "cached" in key and isinstance(value, int)
+        )
+
+    return int(prompt or 0), int(completion or 0), int(cached)
+
+
+class TelemetryRecorder:
+    """Collects agent call telemetry and writes run-level reports"""
+
+    def __init__(
+        self,
+        prompt_cost_per_1k: float = 0.0,
+        completion_cost_per_1k: float = 0.0,
+        cached_cost_per_1k: Optional[float] = None
+    ):
+        """
+        Initialize the recorder.
+
+        Args:
+            prompt_cost_per_1k: Price per 1,000 uncached prompt tokens
+            completion_cost_per_1k: Price per 1,000 completion tokens
+            cached_cost_per_1k: Price per 1,000 cached prompt tokens
+                (defaults to the uncached prompt price)
+        """
+        self.prompt_cost_per_1k = prompt_cost_per_1k
+        self.completion_cost_per_1k = completion_cost_per_1k
+        self.cached_cost_per_1k = (
+            prompt_cost_per_1k if cached_cost_per_1k is None else cached_cost_per_1k
+        )
+        self.records: List[AgentCallRecord] = []
+        self.skipped: List[SkippedCallRecord] = []
+        self.tool_calls: List[ToolCallRecord] = []
+
+    async def run_agent(
+        self,
+        agent: Any,
+        prompt: str,
+        role: str,
+        stage: str,
+        book: Optional[str] = None,
+        max_retries: int = 0,
+        retry_delay: float = 1.0
+    ) -> Any:
+        """
+        Invoke ``agent.run`` and record its telemetry.
+
+        Failed calls are retried with exponential backoff. The final
+        exception is re-raised after being recorded.
+
+        Args:
+            agent: Agent exposing an async ``run(prompt)`` method
+            prompt: Prompt to send
+            role: Agent role name
+            stage: Pipeline stage
+            book: Book being processed, if any
+            max_retries: Number of retries after the first failure
+            retry_delay: Initial delay between retries in seconds
+
+        Returns:
+            The agent response, unchanged
+        """
+        record = AgentCallRecord(role=role, stage=stage, book=book)
+        start = time.perf_counter()
+
+        try:
+            while True:
+                try:
+                    response = await agent.run(prompt)
+                    break
+                except Exception:
+                    if record.retries >= max_retries:
+                        raise
+                    await asyncio.sleep(retry_delay * (2 ** record.retries))
+                    record.retries += 1
+        except Exception as e:
+            record.success = False
+            record.error = str(e)
+            raise
+        else:
+            self.record_usage(record, response)
+            return response
+        finally:
+            record.latency_s = time.perf_counter() - start
+            self.records.append(record)
+
+    @contextmanager
+    def track(
+        self,
+        role: str,
+        stage: str,
+        book: Optional[str] = None
+    ) -> Iterator[AgentCallRecord]:
+        """
+        Track a synchronous agent call.
+
+        Callers fill in token usage with ``record_usage`` inside the block.
+
+        Args:
+            role: Agent role name
+            stage: Pipeline stage
+            book: Book being processed, if any
+
+        Yields:
+            The AgentCallRecord being populated
+        """
+        record = AgentCallRecord(role=role, stage=stage, book=book)
+        start = time.perf_counter()
+
+        try:
+            yield record
+        except Exception as e:
+            record.success = False
+            record.error = str(e)
+            raise
+        finally:
+            record.latency_s = time.perf_counter() - start
+            self.records.append(record)
+
+    @staticmethod
+    def record_usage(record: AgentCallRecord, response: Any):
+        """Copy token usage from a response onto a call record"""
+        prompt, completion, cached = extract_usage(response)
+        record.prompt_tokens = prompt
+        record.completion_tokens = completion
+        record.cached_tokens = cached
+
+    def record_skipped(
+        self,
+        role: str,
+        stage: str,
+        reason: str,
+        prompt: str,
+        book: Optional[str] = None
+    ):
+        """
+        Record an agent call that was not made.
+
+        Args:
+            role: Agent role name
+            stage: Pipeline stage
+            reason: Why the call was skipped
+            prompt: Prompt that would have been sent (used to estimate tokens)
+            book: Book being processed, if any
+        """
+        self.skipped.append(SkippedCallRecord(
+            role=role,
+            stage=stage,
+            book=book,
+            reason=reason,
+            estimated_prompt_tokens=estimate_tokens(prompt)
+        ))
+
+    def record_tool_call(
+        self,
+        tool: str,
+        mode: str,
+        duration_s: float,
+        error: Optional[str] = None
+    ):
+        """
+        Record one tool invocation.
+
+        Args:
+            tool: Tool function name
+            mode: Where the tool ran (inline, thread, process)
+            duration_s: Wall-clock time from call to result
+            error: Error message if the tool raised
+        """
+        self.tool_calls.append(ToolCallRecord(
+            tool=tool,
+            mode=mode,
+            duration_s=duration_s,
+            success=error is None,
+            error=error
+        ))
+
+    def call_cost(self, record: AgentCallRecord) -> float:
+        """Estimated cost of a single call"""
+        uncached = max(record.prompt_tokens - record.cached_tokens, 0)
+        return (
+            uncached * self.prompt_cost_per_1k
+            + record.cached_tokens * self.cached_cost_per_1k
+            + record.completion_tokens * self.completion_cost_per_1k
+        ) / 1000
+
+    def _aggregate(self, records: List[AgentCallRecord]) -> Dict[str, Any]:
+        """Aggregate a list of records into summary statistics"""
+        latencies = [r.latency_s for r in records]
+        return {
+            "calls": len(records),
+            "failed_calls": sum(1 for r in records if not r.success),
+            "retries": sum(r.retries for r in records),
+            "prompt_tokens": sum(r.prompt_tokens for r in records),
+            "completion_tokens": sum(r.completion_tokens for r in records),
+            "cached_tokens": sum(r.cached_tokens for r in records),
+            "cache_hits": sum(1 for r in records if r.cache_hit),
+            "total_latency_s": round(sum(latencies), 3),
+            "max_latency_s": round(max(latencies), 3) if latencies else 0.0,
+            "cost": round(sum(self.call_cost(r) for r in records), 6)
+        }
+
+    def _aggregate_skipped(self, records: List[SkippedCallRecord]) -> Dict[str, Any]:
+        """Aggregate skipped calls into estimated savings"""
+        tokens = sum(r.estimated_prompt_tokens for r in records)
+        by_reason = defaultdict(int)
+        for record in records:
+            by_reason[record.reason] += 1
+        return {
+            "calls": len(records),
+            "estimated_prompt_tokens": tokens,
+            "estimated_cost": round(tokens * self.prompt_cost_per_1k / 1000, 6),
+            "by_reason": dict(sorted(by_reason.items()))
+        }
+
+    @staticmethod
+    def _aggregate_tools(records: List[ToolCallRecord]) -> Dict[str, Any]:
+        """Aggregate tool calls into timing statistics"""
+        durations = [r.duration_s for r in records]
+        return {
+            "calls": len(records),
+            "failed_calls": sum(1 for r in records if not r.success),
+            "modes": sorted({r.mode for r in records}),
+            "total_s": round(sum(durations), 6),
+            "mean_s": round(sum(durations) / len(durations), 6) if durations else 0.0,
+            "max_s": round(max(durations), 6) if durations else 0.0
+        }
+
+    def summarize(self) -> Dict[str, Any]:
+        """
+        Build run-level summary with per-stage, per-book and per-role breakdowns.
+
+        Returns:
+            Dictionary suitable for JSON serialization
+        """
+        by_stage = defaultdict(list)
+        by_book = defaultdict(list)
+        by_role = defaultdict(list)
+        by_book_stage = defaultdict(lambda: defaultdict(list))
+        skipped_by_book = defaultdict(list)
+        tools = defaultdict(list)
+
+        for record in self.records:
+            book = record.book or "_unassigned"
+            by_stage[record.stage].append(record)
+            by_book[book].append(record)
+            by_role[record.role].append(record)
+            by_book_stage[book][record.stage].append(record)
+
+        for record in self.skipped:
+            skipped_by_book[record.book or "_unassigned"].append(record)
+
+        for record in self.tool_calls:
+            tools[record.tool].append(record)
+
+        return {
+            "totals": self._aggregate(self.records),
+            "by_stage": {k: self._aggregate(v) for k, v in sorted(by_stage.items())},
+            "by_book": {
+                book: {
+                    **self._aggregate(records),
+                    "stages": {
+                        stage: self._aggregate(stage_records)
+                        for stage, stage_records in sorted(by_book_stage[book].items())
+                    }
+                }
+                for book, records in sorted(by_book.items())
+            },
+            "by_role": {k: self._aggregate(v) for k, v in sorted(by_role.items())},
+            "skipped": {
+                "totals": self._aggregate_skipped(self.skipped),
+                "by_book": {
+                    book: self._aggregate_skipped(records)
+                    for book, records in sorted(skipped_by_book.items())
+                }
+            },
+            "tools": {k: self._aggregate_tools(v) for k, v in sorted(tools.items())}
+        }
+
+    def write_report(self, path: Path) -> Path:
+        """
+        Write the run-level telemetry report as JSON.
+
+        Args:
+            path: Destination file
+
+        Returns:
+            Path to the written report
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        report = {
+            "generated_at": datetime.now().isoformat(),
+            "pricing_per_1k_tokens": {
+                "prompt": self.prompt_cost_per_1k,
+                "cached_prompt": self.cached_cost_per_1k,
+                "completion": self.completion_cost_per_1k
+            },
+            **self.summarize(),
+            "calls": [r.model_dump(mode="json") for r in self.records],
+            "skipped_calls": [r.model_dump(mode="json") for r in self.skipped],
+            "tool_calls": [r.model_dump(mode="json") for r in self.tool_calls]
+        }
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+        console.print(f"[dim]Telemetry report saved to {path}[/dim]")
+        return path
+
+    def print_summary(self):
+        """Print per-stage telemetry table (plus calls avoided and tool timings) to console"""
+        if not self.records and not self.skipped and not self.tool_calls:
+            return
+
+        summary = self.summarize()
+
+        table = Table(title="Agent Calls by Stage")
+        table.add_column("Stage", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Retries", justify="right")
+        table.add_column("Prompt Tokens", justify="right")
+        table.add_column("Completion Tokens", justify="right")
+        table.add_column("Cache Hits", justify="right")
+        table.add_column("Latency (s)", justify="right")
+        table.add_column("Cost", justify="right", style="green")
+
+        rows = list(summary["by_stage"].items()) + [("total", summary["totals"])]
+        for stage, stats in rows:
+            table.add_row(
+                stage,
+                str(stats["calls"]),
+                str(stats["retries"]),
+                str(stats["prompt_tokens"]),
+                str(stats["completion_tokens"]),
+                str(stats["cache_hits"]),
+                f"{stats['total_latency_s']:.1f}",
+                f"{stats['cost']:.4f}"
+            )
+
+        console.print(table)
+
+        if self.skipped:
+            self._print_skipped(summary["skipped"])
+        if self.tool_calls:
+            self._print_tools(summary["tools"])
+
+    @staticmethod
+    def _print_skipped(skipped: Dict[str, Any]):
+        """Print calls avoided per book"""
+        table = Table(title="Agent Calls Avoided by Book")
+        table.add_column("Book", style="cyan")
+        table.add_column("Calls Saved", justify="right")
+        table.add_column("Reasons")
+        table.add_column("Est. Prompt Tokens", justify="right")
+        table.add_column("Est. Cost", justify="right", style="green")
+
+        rows = list(skipped["by_book"].items()) + [("total", skipped["totals"])]
+        for book, stats in rows:
+            table.add_row(
+                book,
+                str(stats["calls"]),
+                ", ".join(f"{reason} {count}" for reason, count in stats["by_reason"].items()),
+                str(stats["estimated_prompt_tokens"]),
+                f"{stats['estimated_cost']:.4f}"
+            )
+
+        console.print(table)
+
+    @staticmethod
+    def _print_tools(tools: Dict[str, Dict[str, Any]]):
+        """Print tool call timings"""
+        table = Table(title="Tool Calls")
+        table.add_column("Tool", style="cyan")
+        table.add_column("Ran", style="dim")
+        table.add_column("Calls", justify="right")
+        table.add_column("Failed", justify="right")
+        table.add_column("Total (s)", justify="right")
+        table.add_column("Mean (ms)", justify="right")
+        table.add_column("Max (ms)", justify="right")
+
+        for tool, stats in tools.items():
+            table.add_row(
+                tool,
+                ", ".join(stats["modes"]),
+                str(stats["calls"]),
+                str(stats["failed_calls"]),
+                f"{stats['total_s']:.2f}",
+                f"{stats['mean_s'] * 1000:.1f}",
+                f"{stats['max_s'] * 1000:.1f}"
+            )
+
+        console.print(table)
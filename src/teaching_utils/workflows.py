@@ -7,8 +7,11 @@ manages specialist agents to process PDFs and extract Python skills.
 
 import asyncio
 import json
+from contextlib import AsyncExitStack, contextmanager, nullcontext
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import (
+    List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, NamedTuple, Set, Tuple
+)
 from datetime import datetime
 
 from rich.console import Console
@@ -16,12 +19,18 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from pydantic import BaseModel, Field
 
 from .agent_config import AgentConfiguration, get_config
+from .agent_tools import CHUNK_FILTER_VERSION, ChunkSpan, document_scope
+from .artifacts import ArtifactStore, compute_fingerprint, file_sha256, hash_text
+from .async_tools import AsyncToolRunner
+from .normalization import NormalizationReport
+from .output_writer import BulkWriter, WriteReport
+from .profiling import MemoryProfiler, WorkflowProfiler
 from .state_manager import StateManager, WorkflowState, StepStatus
+from .telemetry import TelemetryRecorder
 from .agents import (
     PDF_EXTRACTOR_AGENT,
     SKILL_IDENTIFIER_AGENT,
     CATEGORIZER_AGENT,
-    VALIDATOR_AGENT,
     MARKDOWN_GENERATOR_AGENT
 )
 
@@ -29,6 +38,10 @@ from .agents import (
 console = Console()
 
 
+# Characters of each chunk included in the identify prompt
+IDENTIFY_CHUNK_LIMIT = 6000
+
+
 class BookToProcess(BaseModel):
     """Represents a book to process"""
     filename: str
@@ -51,6 +64,21 @@ class ExtractedSkill(BaseModel):
     related_skills: List[str] = Field(default_factory=list)
     tracks: List[str] = Field(default_factory=list)
     validation_score: Optional[float] = None
+    merged_from: List[str] = Field(default_factory=list)
+    source_sections: List[str] = Field(default_factory=list)
+    source_span: Optional[List[int]] = None
+
+
+class BookChunk(NamedTuple):
+    """A chunk to send to the identifier, kept as a view until it is sent"""
+    source: str
+    span: ChunkSpan
+    section: Optional[str] = None
+    offsets_in_book: bool = True
+
+    def text(self, limit: Optional[int] = None) -> str:
+        """Materialize the chunk's text (at most limit characters)"""
+        return self.span.text(self.source, limit)
 
 
 class SkillExtractionWorkflow:
@@ -64,7 +92,9 @@ class SkillExtractionWorkflow:
     def __init__(
         self,
         config: Optional[AgentConfiguration] = None,
-        checkpoint_dir: Optional[Path] = None
+        checkpoint_dir: Optional[Path] = None,
+        profile: bool = False,
+        memory_profile: bool = False
     ):
         """
         Initialize the workflow.
@@ -72,12 +102,40 @@ class SkillExtractionWorkflow:
         Args:
             config: Agent configuration (uses global if None)
             checkpoint_dir: Directory for checkpoints (uses config default if None)
+            profile: Attribute run time to stages and books and write a profile
+                report (JSON, folded stacks) with the run outputs
+            memory_profile: Snapshot memory at stage boundaries, write a memory
+                report and fail the run if MEMORY_BUDGET_MB is exceeded
         """
         self.config = config or get_config()
         self.state_manager = StateManager(
             checkpoint_dir or self.config.checkpoint_dir
         )
         self.workflow_state: Optional[WorkflowState] = None
+        self.artifacts = ArtifactStore(self.state_manager.checkpoint_dir / "artifacts")
+        if self.config.chunk_cache == "clear":
+            removed = self.artifacts.clear_stage("identify_chunk", workflow_id="_chunks")
+            console.print(f"[dim]Cleared {removed} cached chunk answers[/dim]")
+
+        # Global governor shared by every agent call in the workflow
+        self._agent_slots = asyncio.Semaphore(self.config.max_concurrent_agents)
+        self._progress: Optional[Progress] = None
+        self.telemetry = TelemetryRecorder(
+            prompt_cost_per_1k=self.config.prompt_token_cost,
+            completion_cost_per_1k=self.config.completion_token_cost,
+            cached_cost_per_1k=self.config.cached_token_cost
+        )
+        # Agent tools run off the event loop when they are heavy
+        self.tools = AsyncToolRunner(
+            telemetry=self.telemetry,
+            modes=self.config.tool_modes,
+            process_workers=self.config.tool_process_workers
+        )
+        self.profiler = WorkflowProfiler() if profile else None
+        self.normalization_reports: Dict[str, NormalizationReport] = {}
+        self.memory_profiler = (
+            MemoryProfiler(budget_mb=self.config.memory_budget_mb) if memory_profile else None
+        )
 
     async def run(
         self,
@@ -85,7 +143,9 @@ class SkillExtractionWorkflow:
         references_dir: Path,
         output_dir: Path,
         workflow_id: Optional[str] = None,
-        resume: bool = True
+        resume: bool = True,
+        max_concurrent_books: Optional[int] = None,
+        streaming: bool = False
     ) -> Dict[str, Any]:
         """
         Run the complete skill extraction workflow.
@@ -96,6 +156,10 @@ class SkillExtractionWorkflow:
             output_dir: Directory for output files
             workflow_id: Optional workflow ID (generated if None)
             resume: Whether to resume from checkpoint if available
+            max_concurrent_books: Books processed at once (uses config default if None).
+                Agent calls across all books share the max_concurrent_agents limit.
+            streaming: Stream skills through identify/validate/categorize queues
+                instead of finishing each stage before the next one starts
 
         Returns:
             Dictionary with workflow results
@@ -122,43 +186,388 @@ class SkillExtractionWorkflow:
             console.print("[bold yellow]Resuming from checkpoint...[/bold yellow]")
             self.state_manager.print_workflow_status(self.workflow_state)
 
-        # Process each book
-        all_skills = []
-
-        for book in books:
-            try:
-                book.pdf_path = references_dir / book.filename
-
-                if not book.pdf_path.exists():
-                    console.print(f"[red]PDF not found: {book.pdf_path}[/red]")
-                    continue
-
-                skills = await self._process_single_book(book, output_dir)
-                all_skills.extend(skills)
-
-            except Exception as e:
-                console.print(f"[red]Error processing {book.filename}: {e}[/red]")
-                import traceback
-                traceback.print_exc()
-                continue
-
-        # Deduplicate and organize skills
-        organized_skills = await self._organize_skills(all_skills, output_dir)
-
-        # Generate final outputs
-        await self._generate_outputs(organized_skills, output_dir)
+        if self.profiler is not None:
+            self.profiler.start()
+        if self.memory_profiler is not None:
+            self.memory_profiler.start()
+        try:
+            # Documents opened by agent tools belong to this run
+            with document_scope():
+                organized_skills, write_report = await self._process_books(
+                    books, references_dir, output_dir, max_concurrent_books, streaming
+                )
+        finally:
+            self.tools.shutdown()
+            if self.profiler is not None:
+                await self.profiler.stop()
+            if self.memory_profiler is not None:
+                self.memory_profiler.stop()
 
         # Mark workflow complete
         console.print("\n[bold green]✓ Workflow completed successfully![/bold green]")
         self.state_manager.print_workflow_status(self.workflow_state)
 
-        return {
+        # Write telemetry report
+        self.telemetry.print_summary()
+        telemetry_path = self.telemetry.write_report(
+            output_dir / "_metadata" / f"telemetry_{workflow_id}.json"
+        )
+
+        telemetry = self.telemetry.summarize()
+        results = {
             "workflow_id": workflow_id,
             "total_books": len(books),
             "total_skills": len(organized_skills),
-            "output_dir": str(output_dir)
+            "output_dir": str(output_dir),
+            "outputs": write_report.model_dump(),
+            "telemetry_report": str(telemetry_path),
+            "telemetry": telemetry["totals"],
+            "skipped_calls": telemetry["skipped"]["totals"],
+            "tool_calls": telemetry["tools"],
+            "normalization": {
+                book: report.model_dump()
+                for book, report in self.normalization_reports.items()
+            }
         }
 
+        # Write profile report
+        if self.profiler is not None:
+            self.profiler.print_summary()
+            results["profile_report"] = str(self.profiler.write_report(
+                output_dir / "_metadata" / f"profile_{workflow_id}.json"
+            ))
+
+        # Write memory report, then enforce the budget
+        if self.memory_profiler is not None:
+            self.memory_profiler.print_summary()
+            results["memory_report"] = str(self.memory_profiler.write_report(
+                output_dir / "_metadata" / f"memory_{workflow_id}.json"
+            ))
+            self.memory_profiler.check_budget()
+
+        return results
+
+    async def _process_books(
+        self,
+        books: List[BookToProcess],
+        references_dir: Path,
+        output_dir: Path,
+        max_concurrent_books: Optional[int],
+        streaming: bool
+    ) -> Tuple[List[ExtractedSkill], WriteReport]:
+        """
+        Process every book, then organize the skills and write outputs.
+
+        Args:
+            books: List of books to process
+            references_dir: Directory containing PDF files
+            output_dir: Directory for output files
+            max_concurrent_books: Books processed at once (uses config default if None)
+            streaming: Stream skills through stage queues
+
+        Returns:
+            Tuple of (organized skills, output write report)
+        """
+        # Process books, several at once if configured
+        book_slots = asyncio.Semaphore(
+            max_concurrent_books or self.config.max_concurrent_books
+        )
+
+        async def process_book(book: BookToProcess) -> List[ExtractedSkill]:
+            async with book_slots:
+                try:
+                    book.pdf_path = references_dir / book.filename
+
+                    if not book.pdf_path.exists():
+                        console.print(f"[red]PDF not found: {book.pdf_path}[/red]")
+                        return []
+
+                    # ...and to this book, when books run concurrently
+                    with document_scope():
+                        return await self._process_single_book(book, output_dir)
+
+                except Exception as e:
+                    console.print(f"[red]Error processing {book.filename}: {e}[/red]")
+                    import traceback
+                    traceback.print_exc()
+                    return []
+
+        if streaming:
+            all_skills = [
+                skill async for skill in self.stream(books, references_dir)
+            ]
+        else:
+            with self._shared_progress():
+                book_results = await asyncio.gather(
+                    *(process_book(book) for book in books)
+                )
+
+            all_skills = [skill for skills in book_results for skill in skills]
+
+        # Deduplicate and organize skills (after every book has finished)
+        self._start_step("organize_all")
+        organized_skills = await self._profiled(
+            self._organize_skills(all_skills, output_dir), "organize"
+        )
+        self._complete_step(
+            "organize_all", {"organized_skills": len(organized_skills)}, stage="organize"
+        )
+
+        # Generate final outputs
+        self._start_step("generate_outputs")
+        write_report = await self._profiled(
+            self._generate_outputs(organized_skills, output_dir), "outputs"
+        )
+        self._complete_step("generate_outputs", write_report.model_dump(), stage="outputs")
+
+        return organized_skills, write_report
+
+    async def stream(
+        self,
+        books: List[BookToProcess],
+        references_dir: Path,
+        queue_size: Optional[int] = None
+    ) -> AsyncIterator[ExtractedSkill]:
+        """
+        Stream categorized skills as soon as each one is ready.
+
+        Chunks, raw skills and validated skills flow through bounded queues
+        between identify, validate and categorize workers, so a full queue
+        slows the stage feeding it. Steps are checkpointed per book when a
+        workflow state is active (e.g. when called from ``run``).
+
+        Usage:
+            async for skill in workflow.stream(books, references_dir):
+                ...
+
+        Wrap the stream in ``contextlib.aclosing`` when breaking out early so
+        the workers are stopped immediately.
+
+        Args:
+            books: Books to process
+            references_dir: Directory containing PDF files
+            queue_size: Capacity of each inter-stage queue (uses config default if None)
+
+        Yields:
+            Categorized skills in completion order
+        """
+        queue_size = queue_size or self.config.stream_queue_size
+        worker_count = self.config.max_concurrent_agents
+
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        validate_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        categorize_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        output_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        # Per-book counters used to checkpoint each stage when it drains
+        progress: Dict[str, Dict[str, Any]] = {}
+        done = object()
+
+        def advance(book: BookToProcess):
+            """Complete any stage of a book whose upstream has drained"""
+            state = progress[book.output_name]
+            if state["chunks_left"] == 0 and not state["identified"]:
+                state["identified"] = True
+                self._complete_step(
+                    f"identify_{book.output_name}",
+                    {"skills_found": len(state["raw"])},
+                    state["raw"],
+                    stage="identify",
+                    fingerprint=state["fingerprints"]["identify"],
+                    book=book.output_name
+                )
+            if state["identified"] and state["to_validate"] == 0 and not state["validated"]:
+                state["validated"] = True
+                self._complete_step(
+                    f"validate_{book.output_name}",
+                    {"valid_skills": len(state["validated_skills"])},
+                    state["validated_skills"],
+                    stage="validate",
+                    fingerprint=state["fingerprints"]["validate"],
+                    book=book.output_name
+                )
+            if state["validated"] and state["to_categorize"] == 0 and not state["categorized"]:
+                state["categorized"] = True
+                self._complete_step(
+                    f"categorize_{book.output_name}",
+                    {"categorized_skills": len(state["categorized_skills"])},
+                    state["categorized_skills"],
+                    stage="categorize",
+                    fingerprint=state["fingerprints"]["categorize"],
+                    book=book.output_name
+                )
+
+        async def produce_chunks():
+            for book in books:
+                step_id = f"extract_{book.output_name}"
+                try:
+                    book.pdf_path = references_dir / book.filename
+                    if not book.pdf_path.exists():
+                        console.print(f"[red]PDF not found: {book.pdf_path}[/red]")
+                        continue
+
+                    # Stages overlap while streaming, so only a finished book
+                    # or its extracted text can be reused
+                    fingerprints = await self._profiled(
+                        self._stage_fingerprints(book), "fingerprint", book.output_name
+                    )
+                    with self._measure("checkpoint", book.output_name):
+                        start, output = self._resume_point(
+                            book, fingerprints, usable={"extract", "categorize"}
+                        )
+
+                    if start == len(fingerprints):
+                        for skill in output:
+                            await output_queue.put(skill)
+                        continue
+
+                    content = output
+                    if content is None:
+                        self._start_step(step_id, book=book.output_name)
+                        content = await self._profiled(
+                            self._extract_pdf_content(book), "extract", book.output_name
+                        )
+                        self._complete_step(
+                            step_id,
+                            {"content_length": len(content)},
+                            content,
+                            stage="extract",
+                            fingerprint=fingerprints["extract"],
+                            book=book.output_name
+                        )
+
+                    # Segmentation errors (e.g. a broken outline) fail this
+                    # book's identify step without ending the stream
+                    step_id = f"identify_{book.output_name}"
+                    chunks = self._prefilter_chunks(
+                        book, await self._segment_content(book, content)
+                    )
+
+                except Exception as e:
+                    console.print(f"[red]Error processing {book.filename}: {e}[/red]")
+                    self._fail_step(step_id, str(e))
+                    continue
+
+                progress[book.output_name] = {
+                    "fingerprints": fingerprints,
+                    "chunks_left": len(chunks),
+                    "to_validate": 0,
+                    "to_categorize": 0,
+                    "raw": [],
+                    "validated_skills": [],
+                    "categorized_skills": [],
+                    "identified": False,
+                    "validated": False,
+                    "categorized": False
+                }
+                for stage in ("identify", "validate", "categorize"):
+                    self._start_step(f"{stage}_{book.output_name}", book=book.output_name)
+                advance(book)
+
+                for chunk in chunks:
+                    await chunk_queue.put((book, chunk))
+
+        async def identify_worker(agent):
+            while (item := await chunk_queue.get()) is not done:
+                book, chunk = item
+                state = progress[book.output_name]
+                try:
+                    skills = await self._profiled(
+                        self._identify_chunk(agent, book, chunk),
+                        "identify",
+                        book.output_name
+                    )
+                except Exception as e:
+                    console.print(f"[yellow]Warning: Error processing chunk: {e}[/yellow]")
+                    skills = []
+
+                state["raw"].extend(skill.model_copy() for skill in skills)
+                state["to_validate"] += len(skills)
+                if skills:
+                    await validate_queue.put((book, skills))
+                state["chunks_left"] -= 1
+                advance(book)
+
+        async def validate_worker():
+            while (item := await validate_queue.get()) is not done:
+                book, skills = item
+                state = progress[book.output_name]
+                with self._measure("validate", book.output_name):
+                    valid_skills = self._filter_valid_skills(skills)
+                for skill in valid_skills:
+                    state["validated_skills"].append(skill.model_copy())
+                    state["to_categorize"] += 1
+                    await categorize_queue.put((book, skill))
+                state["to_validate"] -= len(skills)
+                advance(book)
+
+        async def categorize_worker(agent):
+            while (item := await categorize_queue.get()) is not done:
+                book, skill = item
+                await self._profiled(
+                    self._categorize_skill(agent, skill), "categorize", book.output_name
+                )
+                state = progress[book.output_name]
+                state["categorized_skills"].append(skill)
+                await output_queue.put(skill)
+                state["to_categorize"] -= 1
+                advance(book)
+
+        async def supervise(identifier, categorizer):
+            # A task group cancels the producer and every other worker as
+            # soon as one of them fails, so no stage is left blocked on a
+            # queue that nothing drains
+            try:
+                async with asyncio.TaskGroup() as group:
+                    identifiers = [
+                        group.create_task(identify_worker(identifier))
+                        for _ in range(worker_count)
+                    ]
+                    validator = group.create_task(validate_worker())
+                    categorizers = [
+                        group.create_task(categorize_worker(categorizer))
+                        for _ in range(worker_count)
+                    ]
+
+                    # Shut stages down in order so every queued item is processed
+                    await produce_chunks()
+                    for _ in identifiers:
+                        await chunk_queue.put(done)
+                    await asyncio.gather(*identifiers)
+                    await validate_queue.put(done)
+                    await validator
+                    for _ in categorizers:
+                        await categorize_queue.put(done)
+                    await asyncio.gather(*categorizers)
+            except BaseExceptionGroup as group_error:
+                await output_queue.put(done)
+                raise group_error.exceptions[0]
+
+            await output_queue.put(done)
+
+        async with AsyncExitStack() as stack:
+            identifier = await stack.enter_async_context(self.config.create_agent(
+                instructions=SKILL_IDENTIFIER_AGENT.instructions,
+                name=SKILL_IDENTIFIER_AGENT.name,
+                tools=self.tools.wrap_all(SKILL_IDENTIFIER_AGENT.tools)
+            ))
+            categorizer = await stack.enter_async_context(self.config.create_agent(
+                instructions=CATEGORIZER_AGENT.instructions,
+                name=CATEGORIZER_AGENT.name,
+                tools=self.tools.wrap_all(CATEGORIZER_AGENT.tools)
+            ))
+
+            supervisor = asyncio.create_task(supervise(identifier, categorizer))
+            try:
+                while (skill := await output_queue.get()) is not done:
+                    yield skill
+                # Surface errors raised outside the per-item handlers
+                await supervisor
+            finally:
+                if not supervisor.done():
+                    supervisor.cancel()
+                    await asyncio.gather(supervisor, return_exceptions=True)
+
     async def _process_single_book(
         self,
         book: BookToProcess,
@@ -176,104 +585,490 @@ class SkillExtractionWorkflow:
         """
         console.print(f"\n[bold blue]Processing: {book.filename}[/bold blue]")
 
-        # Step 1: Extract PDF content
-        step_id = f"extract_{book.output_name}"
-        if not self._is_step_complete(step_id):
-            self.state_manager.start_step(self.workflow_state, step_id)
+        stages = [
+            # Step 1: Extract PDF content
+            ("extract", lambda _: self._extract_pdf_content(book),
+             lambda content: {"content_length": len(content)}),
+            # Step 2: Identify skills
+            ("identify", lambda content: self._identify_skills(book, content),
+             lambda skills: {"skills_found": len(skills)}),
+            # Step 3: Validate skills
+            ("validate", lambda skills: self._validate_skills(skills),
+             lambda skills: {"valid_skills": len(skills)}),
+            # Step 4: Categorize skills
+            ("categorize", lambda skills: self._categorize_skills(skills),
+             lambda skills: {"categorized_skills": len(skills)})
+        ]
+
+        # Continue from the latest stage whose inputs are unchanged
+        fingerprints = await self._profiled(
+            self._stage_fingerprints(book), "fingerprint", book.output_name
+        )
+        with self._measure("checkpoint", book.output_name):
+            start, output = self._resume_point(book, fingerprints)
+
+        for stage, compute, summarize in stages[start:]:
+            output = await self._run_step(
+                f"{stage}_{book.output_name}",
+                lambda: compute(output),
+                summarize,
+                stage=stage,
+                fingerprint=fingerprints[stage],
+                book=book.output_name
+            )
 
-            try:
-                content = await self._extract_pdf_content(book)
-                self.state_manager.complete_step(
-                    self.workflow_state,
-                    step_id,
-                    {"content_length": len(content)}
-                )
-            except Exception as e:
-                self.state_manager.fail_step(self.workflow_state, step_id, str(e))
-                raise
+        return output
 
-        # Step 2: Identify skills
-        step_id = f"identify_{book.output_name}"
-        if not self._is_step_complete(step_id):
-            self.state_manager.start_step(self.workflow_state, step_id)
+    async def _run_step(
+        self,
+        step_id: str,
+        compute: Callable[[], Awaitable[Any]],
+        summarize: Callable[[Any], Dict[str, Any]],
+        stage: str,
+        fingerprint: str,
+        book: Optional[str] = None
+    ) -> Any:
+        """
+        Run a checkpointed stage and persist its output as an artifact.
 
-            try:
-                raw_skills = await self._identify_skills(book, content)
-                self.state_manager.complete_step(
-                    self.workflow_state,
-                    step_id,
-                    {"skills_found": len(raw_skills)}
-                )
-            except Exception as e:
-                self.state_manager.fail_step(self.workflow_state, step_id, str(e))
-                raise
+        Text outputs are stored as text artifacts and skill lists as record
+        artifacts; the artifact reference and input fingerprint are kept in
+        the step result.
+
+        Args:
+            step_id: Workflow step identifier
+            compute: Coroutine factory producing the stage output
+            summarize: Builds the step result summary from the output
+            stage: Stage name
+            fingerprint: Fingerprint of the stage inputs
+            book: Book being processed, for profiling
 
-        # Step 3: Validate skills
-        step_id = f"validate_{book.output_name}"
-        if not self._is_step_complete(step_id):
+        Returns:
+            Stage output (content string or list of skills)
+        """
+        with self._measure("checkpoint", book):
             self.state_manager.start_step(self.workflow_state, step_id)
 
-            try:
-                validated_skills = await self._validate_skills(raw_skills)
-                self.state_manager.complete_step(
-                    self.workflow_state,
-                    step_id,
-                    {"valid_skills": len(validated_skills)}
+        try:
+            output = await self._profiled(compute(), stage, book)
+            with self._measure("checkpoint", book):
+                result = summarize(output)
+                result["fingerprint"] = fingerprint
+                result["artifact"] = self._save_step_artifact(step_id, output, stage, fingerprint)
+                self.state_manager.complete_step(self.workflow_state, step_id, result)
+        except Exception as e:
+            self.state_manager.fail_step(self.workflow_state, step_id, str(e))
+            raise
+
+        self._memory_checkpoint(stage, book)
+        return output
+
+    async def _stage_fingerprints(self, book: BookToProcess) -> Dict[str, str]:
+        """
+        Fingerprint the inputs of each stage for a book.
+
+        Each fingerprint chains the previous stage's, so a change to the PDF,
+        chunker parameters, agent instructions or model deployment
+        invalidates that stage and everything after it.
+
+        Args:
+            book: Book to fingerprint (pdf_path must be set)
+
+        Returns:
+            Mapping of stage name to fingerprint
+        """
+        from .agent_tools import PDF_TEXT_EXTRACTOR_VERSION, SKILL_SCHEMA_VERSION
+        from .normalization import NORMALIZATION_VERSION
+
+        pdf_hash = await asyncio.to_thread(file_sha256, book.pdf_path)
+
+        extract_inputs = [pdf_hash, PDF_TEXT_EXTRACTOR_VERSION, self.config.pdf_cleanup_mode]
+        if self.config.normalize_text:
+            extract_inputs += ["normalized", NORMALIZATION_VERSION]
+        if self.config.pdf_cleanup_mode == "agent":
+            extract_inputs += [
+                hash_text(PDF_EXTRACTOR_AGENT.instructions),
+                self.config.deployment,
+                self.config.chunk_size,
+                # Outline segmentation skips cleanup
+                self.config.segmentation_mode
+            ]
+
+        extract = compute_fingerprint("extract", *extract_inputs)
+        identify = compute_fingerprint(
+            "identify",
+            extract,
+            self._chunker_params(),
+            hash_text(SKILL_IDENTIFIER_AGENT.instructions),
+            self.config.deployment
+        )
+        validate = compute_fingerprint("validate", identify, SKILL_SCHEMA_VERSION)
+        categorize = compute_fingerprint(
+            "categorize",
+            validate,
+            hash_text(CATEGORIZER_AGENT.instructions),
+            self.config.deployment
+        )
+
+        return {
+            "extract": extract,
+            "identify": identify,
+            "validate": validate,
+            "categorize": categorize
+        }
+
+    def _chunker_params(self) -> Dict[str, Any]:
+        """Parameters that determine how content is split into chunks"""
+        return {
+            "chunk_size": self.config.chunk_size,
+            "overlap": 200,
+            "chunking": self.config.chunking_mode,
+            "segmentation": self.config.segmentation_mode,
+            "filter_threshold": self.config.chunk_filter_threshold,
+            "filter_version": CHUNK_FILTER_VERSION
+        }
+
+    async def _segment_content(
+        self,
+        book: BookToProcess,
+        content: str
+    ) -> List[BookChunk]:
+        """
+        Split a book into chunks for skill identification.
+
+        Plain chunks are offset views into the extracted content, so no text
+        is copied until a chunk's prompt is built. In content-defined
+        chunking mode boundaries follow the text rather than fixed offsets,
+        with chunk_size as the maximum, so an edit to a book only changes
+        the chunks near it.
+
+        In outline mode chunks follow the PDF's bookmarks: no chunk crosses a
+        section boundary and each carries its section path. Outline chunks
+        are cut from the cached page text, normalized like the extracted
+        content; agent cleanup is skipped for these books at extraction.
+        Books without an outline fall back to plain chunking.
+
+        Args:
+            book: Book being processed (pdf_path must be set)
+            content: Extracted content
+
+        Returns:
+            Chunks in book order
+        """
+        from .agent_tools import chunk_pdf_sections, iter_chunk_spans, iter_content_defined_spans
+
+        content_defined = self.config.chunking_mode == "content"
+        if self.config.segmentation_mode == "outline":
+            sections = await asyncio.to_thread(
+                chunk_pdf_sections,
+                book.pdf_path,
+                self.config.chunk_size,
+                200,
+                self.config.pdf_extract_workers,
+                self.config.pdf_cache_dir,
+                content_defined,
+                self.config.normalize_text
+            )
+            if sections:
+                return [
+                    BookChunk(chunk.text, ChunkSpan(0, len(chunk.text)), chunk.section, False)
+                    for chunk in sections
+                ]
+            console.print(
+                f"[yellow]No outline in {book.filename}; using plain chunking[/yellow]"
+            )
+
+        if content_defined:
+            chunk_size = self.config.chunk_size
+            spans = iter_content_defined_spans(content, chunk_size // 2, max_size=chunk_size)
+        else:
+            spans = iter_chunk_spans(content, self.config.chunk_size)
+
+        return [BookChunk(content, span) for span in spans]
+
+    def _prefilter_chunks(self, book: BookToProcess, chunks: List[BookChunk]) -> List[BookChunk]:
+        """
+        Drop chunks that score as non-instructional before any agent call.
+
+        Front matter, tables of contents, indexes and bibliographies are
+        scored locally with score_chunk; skipped chunks are recorded in
+        telemetry with the prompt tokens they would have cost.
+
+        Args:
+            book: Book being processed
+            chunks: Chunks from _segment_content
+
+        Returns:
+            Chunks worth sending to the identifier
+        """
+        threshold = self.config.chunk_filter_threshold
+        if not threshold:
+            return chunks
+
+        from .agent_tools import score_chunk
+
+        kept = []
+        for chunk in chunks:
+            result = score_chunk(chunk.text(limit=IDENTIFY_CHUNK_LIMIT), threshold)
+            if result.instructional:
+                kept.append(chunk)
+            else:
+                self.telemetry.record_skipped(
+                    role=SKILL_IDENTIFIER_AGENT.name,
+                    stage="identify",
+                    reason="prefilter",
+                    prompt=self._identify_prompt(book, chunk),
+                    book=book.output_name
                 )
-            except Exception as e:
-                self.state_manager.fail_step(self.workflow_state, step_id, str(e))
-                raise
 
-        # Step 4: Categorize skills
-        step_id = f"categorize_{book.output_name}"
-        if not self._is_step_complete(step_id):
-            self.state_manager.start_step(self.workflow_state, step_id)
+        if len(kept) < len(chunks):
+            console.print(
+                f"[dim]{book.output_name}: skipped {len(chunks) - len(kept)}/{len(chunks)} "
+                f"non-instructional chunks[/dim]"
+            )
+        return kept
 
-            try:
-                categorized_skills = await self._categorize_skills(validated_skills)
+    def _resume_point(
+        self,
+        book: BookToProcess,
+        fingerprints: Dict[str, str],
+        usable: Optional[Set[str]] = None
+    ) -> Tuple[int, Any]:
+        """
+        Find the latest stage of a book whose output can be reused.
+
+        Outputs come from this workflow's checkpoint when the recorded
+        fingerprint matches, otherwise from any earlier run with identical
+        inputs. Earlier stages that were never run are marked skipped.
+
+        Args:
+            book: Book being processed
+            fingerprints: Stage fingerprints from _stage_fingerprints
+            usable: Restrict reuse to these stages (all stages if None)
+
+        Returns:
+            Tuple of (index of the first stage to run, reused output or None)
+        """
+        stages = list(fingerprints)
+
+        for index in reversed(range(len(stages))):
+            stage = stages[index]
+            if usable is not None and stage not in usable:
+                continue
+
+            output = self._load_stage_output(book, stage, fingerprints[stage])
+            if output is None:
+                continue
+
+            if self.workflow_state is not None:
+                for earlier in stages[:index]:
+                    step_id = f"{earlier}_{book.output_name}"
+                    if not self._is_step_complete(step_id):
+                        self.state_manager.skip_step(
+                            self.workflow_state, step_id, "up to date", save=False
+                        )
+                self.state_manager.save_checkpoint(self.workflow_state)
+
+            return index + 1, output
+
+        return 0, None
+
+    def _save_step_artifact(
+        self,
+        step_id: str,
+        output: Any,
+        stage: Optional[str] = None,
+        fingerprint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Persist a stage output, index it by fingerprint, and return its reference"""
+        workflow_id = self.workflow_state.workflow_id if self.workflow_state else "_stream"
+        if isinstance(output, str):
+            ref = self.artifacts.save_text(workflow_id, step_id, output)
+        else:
+            ref = self.artifacts.save_records(workflow_id, step_id, output)
+
+        if stage and fingerprint:
+            self.artifacts.register(stage, fingerprint, ref)
+        return ref
+
+    def _load_stage_output(
+        self,
+        book: BookToProcess,
+        stage: str,
+        fingerprint: str
+    ) -> Any:
+        """
+        Reload a stage output produced from identical inputs.
+
+        Checks this workflow's completed step first, then the fingerprint
+        index shared by all runs. A hit from the index completes the step.
+
+        Returns:
+            Stage output, or None if the stage must be (re)computed
+        """
+        step_id = f"{stage}_{book.output_name}"
+        step = None
+        if self.workflow_state is not None:
+            step = self.state_manager.get_step(self.workflow_state, step_id)
+
+        ref = None
+        from_checkpoint = (
+            step is not None
+            and step.status == StepStatus.COMPLETED
+            and (step.result or {}).get("fingerprint") == fingerprint
+        )
+        if from_checkpoint:
+            ref = step.result.get("artifact")
+        if ref is None:
+            ref = self.artifacts.lookup(stage, fingerprint)
+            from_checkpoint = False
+        if ref is None:
+            return None
+
+        try:
+            if ref["kind"] == "text":
+                output = self.artifacts.load_text(ref)
+            else:
+                output = [
+                    ExtractedSkill(**data)
+                    for data in self.artifacts.load_records(ref)
+                ]
+        except Exception as e:
+            console.print(f"[yellow]Could not load artifact for {step_id}: {e}[/yellow]")
+            return None
+
+        if from_checkpoint:
+            console.print(f"[dim]↺ Reusing {step_id} (artifact v{ref['version']})[/dim]")
+        else:
+            console.print(f"[dim]↺ {step_id} is up to date, reusing cached output[/dim]")
+            if step is not None:
                 self.state_manager.complete_step(
                     self.workflow_state,
                     step_id,
-                    {"categorized_skills": len(categorized_skills)}
+                    {"fingerprint": fingerprint, "artifact": ref, "cached": True}
                 )
-            except Exception as e:
-                self.state_manager.fail_step(self.workflow_state, step_id, str(e))
-                raise
 
-        return categorized_skills
+        return output
 
-    async def _extract_pdf_content(self, book: BookToProcess) -> str:
+    async def _extract_pdf_content(
+        self,
+        book: BookToProcess,
+        cleanup: Optional[bool] = None
+    ) -> str:
         """
-        Extract content from PDF using PDFExtractorAgent.
+        Extract text from a PDF locally, optionally cleaned up by PDFExtractorAgent.
+
+        Pages come from the on-disk page cache when this PDF has been read
+        before; otherwise they are parsed in shards across worker processes.
+        Either way the work runs in a worker thread so the event loop keeps
+        serving concurrent agent calls. Pages are then normalized (running
+        headers, page numbers, hyphenation, whitespace) unless disabled. The
+        agent is only invoked in cleanup mode, and not for books segmented by
+        their outline, whose chunks do not come from this content.
 
         Args:
             book: Book to process
+            cleanup: Run agent cleanup over the text (uses config default if None)
 
         Returns:
-            Extracted and structured content
+            Extracted content
         """
         console.print(f"[cyan]Extracting content from {book.filename}...[/cyan]")
 
+        from .agent_tools import load_pdf_pages
+        pages = await asyncio.to_thread(
+            load_pdf_pages,
+            book.pdf_path,
+            self.config.pdf_extract_workers,
+            cache_dir=self.config.pdf_cache_dir
+        )
+        if self.config.normalize_text:
+            from .normalization import normalize_pdf_pages, print_normalization_report
+            pages, report = normalize_pdf_pages(pages)
+            pages = [page for page in pages if page]
+            self.normalization_reports[book.output_name] = report
+            print_normalization_report(book.output_name, report)
+
+        content = "\n\n".join(pages)
+
+        console.print(f"[green]✓ Extracted {len(content)} characters[/green]")
+
+        if cleanup is None:
+            cleanup = self.config.pdf_cleanup_mode == "agent"
+        if cleanup and self.config.segmentation_mode == "outline":
+            # Outline chunks are cut from the page text, not from this
+            # content, so cleaning it would be paid for and thrown away
+            from .agent_tools import read_pdf_outline
+            if await asyncio.to_thread(read_pdf_outline, book.pdf_path):
+                console.print(
+                    f"[yellow]Skipping agent cleanup of {book.filename}: "
+                    f"outline segmentation reads section text from the pages[/yellow]"
+                )
+                cleanup = False
+        if cleanup:
+            content = await self._cleanup_pdf_content(book, content)
+
+        return content
+
+    async def _cleanup_pdf_content(self, book: BookToProcess, content: str) -> str:
+        """
+        Clean extracted text chunk by chunk with PDFExtractorAgent.
+
+        Chunks that fail, or whose reply has no JSON "content", keep their
+        locally extracted text.
+
+        Args:
+            book: Book being processed
+            content: Raw extracted text
+
+        Returns:
+            Cleaned content
+        """
+        from .agent_tools import chunk_content
+        chunks = chunk_content(content, self.config.chunk_size, overlap=0)
+
+        console.print(f"[cyan]Cleaning {len(chunks)} chunks with {PDF_EXTRACTOR_AGENT.name}...[/cyan]")
+
         async with self.config.create_agent(
             instructions=PDF_EXTRACTOR_AGENT.instructions,
-            name=PDF_EXTRACTOR_AGENT.name,
-            tools=PDF_EXTRACTOR_AGENT.tools
+            name=PDF_EXTRACTOR_AGENT.name
         ) as agent:
-            # Ask agent to extract PDF content
-            prompt = f"Extract all content from the PDF at: {book.pdf_path}"
-            response = await agent.run(prompt)
-
-            # For now, directly extract (in real implementation, use tools)
-            from pypdf import PdfReader
-            reader = PdfReader(book.pdf_path)
-            content = "\n\n".join(
-                page.extract_text()
-                for page in reader.pages
-                if page.extract_text().strip()
-            )
 
-            console.print(f"[green]✓ Extracted {len(content)} characters[/green]")
-            return content
+            async def clean_chunk(chunk: str) -> str:
+                try:
+                    prompt = f"""Clean and structure this extracted PDF text.
+Source book: {book.filename}
+
+Text:
+{chunk}"""
+                    response = await self._run_agent(
+                        agent, prompt,
+                        role=PDF_EXTRACTOR_AGENT.name,
+                        stage="extract",
+                        book=book.output_name
+                    )
+                    response_text = str(response)
+
+                    # Agent returns a JSON object with a "content" field;
+                    # anything else (e.g. a chat reply) keeps the raw text
+                    start = response_text.find('{')
+                    end = response_text.rfind('}') + 1
+                    if start >= 0 and end > start:
+                        parsed = json.loads(response_text[start:end])
+                        cleaned = parsed.get("content") if isinstance(parsed, dict) else None
+                        if isinstance(cleaned, str) and cleaned.strip():
+                            return cleaned
+                    return chunk
+
+                except Exception as e:
+                    console.print(f"[yellow]Warning: Cleanup failed for chunk: {e}[/yellow]")
+                    return chunk
+
+            cleaned = await asyncio.gather(*(clean_chunk(chunk) for chunk in chunks))
+
+        content = "\n\n".join(cleaned)
+        console.print(f"[green]✓ Cleaned content: {len(content)} characters[/green]")
+        return content
 
     async def _identify_skills(
         self,
@@ -292,71 +1087,156 @@ class SkillExtractionWorkflow:
         """
         console.print(f"[cyan]Identifying skills in {book.filename}...[/cyan]")
 
-        # Chunk content for processing
-        from .agent_tools import chunk_content
-        chunks = chunk_content(content, self.config.chunk_size)
+        chunks = self._prefilter_chunks(book, await self._segment_content(book, content))
 
-        all_skills = []
+        # Per-chunk results, reassembled in chunk order
+        chunk_results: List[List[ExtractedSkill]] = [[] for _ in chunks]
+        failed_chunks = 0
 
         # Process chunks with progress bar
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            console=console
-        ) as progress:
-            task = progress.add_task(
-                f"Processing {len(chunks)} chunks...",
-                total=len(chunks)
-            )
+        with self._progress_task(
+            f"{book.output_name}: {len(chunks)} chunks...",
+            total=len(chunks)
+        ) as (progress, task):
 
             # Create agent for skill identification
             async with self.config.create_agent(
                 instructions=SKILL_IDENTIFIER_AGENT.instructions,
                 name=SKILL_IDENTIFIER_AGENT.name,
-                tools=SKILL_IDENTIFIER_AGENT.tools
+                tools=self.tools.wrap_all(SKILL_IDENTIFIER_AGENT.tools)
             ) as agent:
 
-                # Process chunks (can be parallelized)
-                for chunk in chunks:
+                async def process_chunk(index: int, chunk: BookChunk):
                     try:
-                        prompt = f"""Extract Python skills from this content.
-Source book: {book.filename}
+                        return index, await self._identify_chunk(agent, book, chunk)
+                    except Exception as e:
+                        console.print(
+                            f"[yellow]Warning: Error processing chunk {index + 1}: {e}[/yellow]"
+                        )
+                        return index, None
 
-Content:
-{chunk[:6000]}
+                # Dispatch all chunks; concurrency is bounded by _run_agent
+                pending = [process_chunk(i, chunk) for i, chunk in enumerate(chunks)]
 
-Return a JSON array of skills."""
+                for next_result in asyncio.as_completed(pending):
+                    index, skills = await next_result
+                    if skills is None:
+                        failed_chunks += 1
+                    else:
+                        chunk_results[index] = skills
+                    progress.update(task, advance=1)
 
-                        response = await agent.run(prompt)
+        all_skills = [skill for skills in chunk_results for skill in skills]
 
-                        # Parse response for skills
-                        # Try to extract JSON array from response
-                        response_text = str(response)
-                        start = response_text.find('[')
-                        end = response_text.rfind(']') + 1
+        if failed_chunks:
+            console.print(f"[yellow]{failed_chunks}/{len(chunks)} chunks failed[/yellow]")
+        console.print(f"[green]✓ Identified {len(all_skills)} skills[/green]")
+        return all_skills
 
-                        if start >= 0 and end > start:
-                            skills_data = json.loads(response_text[start:end])
+    async def _identify_chunk(
+        self,
+        agent,
+        book: BookToProcess,
+        chunk: BookChunk
+    ) -> List[ExtractedSkill]:
+        """
+        Identify skills in a single content chunk.
 
-                            for skill_dict in skills_data:
-                                skill_dict['source_book'] = book.output_name
-                                all_skills.append(ExtractedSkill(**skill_dict))
+        The chunk's outline section, if known, replaces the source_section
+        guessed by the agent, and its offsets in the extracted content are
+        recorded as source_span.
 
-                    except Exception as e:
-                        console.print(f"[yellow]Warning: Error processing chunk: {e}[/yellow]")
+        Args:
+            agent: SkillIdentifierAgent instance
+            book: Book being processed
+            chunk: Chunk of extracted content
 
-                    progress.update(task, advance=1)
+        Returns:
+            Skills found in the chunk
+        """
+        prompt = self._identify_prompt(book, chunk)
+
+        # Identical prompts reuse earlier answers, so unchanged chunks of an
+        # edited book are not sent again
+        use_cache = self.config.chunk_cache != "off"
+        cache_key = compute_fingerprint(
+            "identify_chunk",
+            hash_text(prompt),
+            hash_text(SKILL_IDENTIFIER_AGENT.instructions),
+            self.config.deployment
+        )
+        cached = self.artifacts.lookup("identify_chunk", cache_key) if use_cache else None
+        if cached is not None:
+            self.telemetry.record_skipped(
+                role=SKILL_IDENTIFIER_AGENT.name,
+                stage="identify",
+                reason="chunk_cache",
+                prompt=prompt,
+                book=book.output_name
+            )
+            return self._chunk_skills(book, chunk, self.artifacts.load_records(cached))
 
-        console.print(f"[green]✓ Identified {len(all_skills)} skills[/green]")
-        return all_skills
+        response = await self._run_agent(
+            agent, prompt,
+            role=SKILL_IDENTIFIER_AGENT.name,
+            stage="identify",
+            book=book.output_name
+        )
+
+        # Parse response for skills
+        # Try to extract JSON array from response
+        response_text = str(response)
+        start = response_text.find('[')
+        end = response_text.rfind(']') + 1
+
+        parsed = None
+        if start >= 0 and end > start:
+            parsed = json.loads(response_text[start:end])
+        skills_data = parsed if isinstance(parsed, list) else []
+
+        skills = self._chunk_skills(book, chunk, skills_data)
+
+        # Only cache real answers; a refusal or truncated reply without a
+        # JSON array must not become "no skills" on every rerun
+        if use_cache and isinstance(parsed, list):
+            ref = self.artifacts.save_records("_chunks", f"identify_{cache_key[:16]}", skills_data)
+            self.artifacts.register("identify_chunk", cache_key, ref)
+        return skills
+
+    def _identify_prompt(self, book: BookToProcess, chunk: BookChunk) -> str:
+        """Build the SkillIdentifierAgent prompt for a chunk"""
+        location = f"\nSection: {chunk.section}" if chunk.section else ""
+        return f"""Extract Python skills from this content.
+Source book: {book.filename}{location}
+
+Content:
+{chunk.text(limit=IDENTIFY_CHUNK_LIMIT)}
+
+Return a JSON array of skills."""
+
+    def _chunk_skills(
+        self,
+        book: BookToProcess,
+        chunk: BookChunk,
+        skills_data: List[Dict[str, Any]]
+    ) -> List[ExtractedSkill]:
+        """Build skills from an identifier answer, adding where they came from"""
+        skills = []
+        for skill_dict in skills_data:
+            skill_dict = {**skill_dict, 'source_book': book.output_name}
+            if chunk.section:
+                skill_dict['source_section'] = chunk.section
+            if chunk.offsets_in_book:
+                skill_dict['source_span'] = list(chunk.span)
+            skills.append(ExtractedSkill(**skill_dict))
+        return skills
 
     async def _validate_skills(
         self,
         skills: List[ExtractedSkill]
     ) -> List[ExtractedSkill]:
         """
-        Validate skills using ValidatorAgent.
+        Validate skill structure in a single batch.
 
         Args:
             skills: Skills to validate
@@ -366,34 +1246,30 @@ Return a JSON array of skills."""
         """
         console.print(f"[cyan]Validating {len(skills)} skills...[/cyan]")
 
-        validated = []
+        validated = self._filter_valid_skills(skills)
 
-        async with self.config.create_agent(
-            instructions=VALIDATOR_AGENT.instructions,
-            name=VALIDATOR_AGENT.name,
-            tools=VALIDATOR_AGENT.tools
-        ) as agent:
+        console.print(f"[green]✓ Validated {len(validated)} skills[/green]")
+        return validated
 
-            for skill in skills:
-                try:
-                    # Validate skill structure
-                    skill_json = skill.model_dump_json()
+    def _filter_valid_skills(self, skills: List[ExtractedSkill]) -> List[ExtractedSkill]:
+        """
+        Validate a batch of skills and report the invalid ones.
 
-                    from .agent_tools import validate_skill_structure
-                    result = validate_skill_structure(skill_json)
+        Args:
+            skills: Skills to validate
 
-                    if result['is_valid']:
-                        validated.append(skill)
-                    else:
-                        console.print(f"[yellow]Skipping invalid skill: {skill.name}[/yellow]")
-                        for error in result['errors']:
-                            console.print(f"  - {error}")
+        Returns:
+            The valid skills, in their original order
+        """
+        from .agent_tools import validate_skills_batch
+        report = validate_skills_batch(skills)
 
-                except Exception as e:
-                    console.print(f"[yellow]Error validating {skill.name}: {e}[/yellow]")
+        for issue in report.issues:
+            console.print(f"[yellow]Skipping invalid skill: {issue.name}[/yellow]")
+            for error in issue.errors:
+                console.print(f"  - {error}")
 
-        console.print(f"[green]✓ Validated {len(validated)} skills[/green]")
-        return validated
+        return [skills[index] for index in report.valid_indices]
 
     async def _categorize_skills(
         self,
@@ -413,13 +1289,30 @@ Return a JSON array of skills."""
         async with self.config.create_agent(
             instructions=CATEGORIZER_AGENT.instructions,
             name=CATEGORIZER_AGENT.name,
-            tools=CATEGORIZER_AGENT.tools
+            tools=self.tools.wrap_all(CATEGORIZER_AGENT.tools)
         ) as agent:
 
-            for skill in skills:
-                try:
-                    # Ask agent to categorize
-                    prompt = f"""Map this skill to learning tracks:
+            # Skills are categorized independently; concurrency is bounded by
+            # _run_agent and each skill handles its own errors
+            await asyncio.gather(*(self._categorize_skill(agent, skill) for skill in skills))
+
+        console.print(f"[green]✓ Categorized {len(skills)} skills[/green]")
+        return skills
+
+    async def _categorize_skill(self, agent, skill: ExtractedSkill) -> ExtractedSkill:
+        """
+        Assign tracks to a single skill, falling back to keyword matching.
+
+        Args:
+            agent: CategorizerAgent instance
+            skill: Skill to categorize (updated in place)
+
+        Returns:
+            The categorized skill
+        """
+        try:
+            # Ask agent to categorize
+            prompt = f"""Map this skill to learning tracks:
 
 Skill: {skill.name}
 Description: {skill.description}
@@ -428,31 +1321,35 @@ Key Concepts: {', '.join(skill.key_concepts)}
 
 Return JSON with tracks array."""
 
-                    response = await agent.run(prompt)
-                    response_text = str(response)
+            response = await self._run_agent(
+                agent, prompt,
+                role=CATEGORIZER_AGENT.name,
+                stage="categorize",
+                book=skill.source_book
+            )
+            response_text = str(response)
 
-                    # Try to parse tracks from response
-                    start = response_text.find('{')
-                    end = response_text.rfind('}') + 1
+            # Try to parse tracks from response
+            start = response_text.find('{')
+            end = response_text.rfind('}') + 1
 
-                    if start >= 0 and end > start:
-                        mapping = json.loads(response_text[start:end])
-                        skill.tracks = mapping.get('tracks', ['automation'])
-                    else:
-                        # Fallback categorization
-                        from .agent_tools import categorize_skill_content
-                        category = categorize_skill_content(
-                            skill.description,
-                            skill.key_concepts
-                        )
-                        skill.tracks = [self._category_to_track(category)]
+            if start >= 0 and end > start:
+                mapping = json.loads(response_text[start:end])
+                skill.tracks = mapping.get('tracks', ['automation'])
+            else:
+                # Fallback categorization
+                from .agent_tools import categorize_skill_content
+                category = categorize_skill_content(
+                    skill.description,
+                    skill.key_concepts
+                )
+                skill.tracks = [self._category_to_track(category)]
 
-                except Exception as e:
-                    console.print(f"[yellow]Error categorizing {skill.name}: {e}[/yellow]")
-                    skill.tracks = ['automation']  # Default fallback
+        except Exception as e:
+            console.print(f"[yellow]Error categorizing {skill.name}: {e}[/yellow]")
+            skill.tracks = ['automation']  # Default fallback
 
-        console.print(f"[green]✓ Categorized {len(skills)} skills[/green]")
-        return skills
+        return skill
 
     async def _organize_skills(
         self,
@@ -471,21 +1368,19 @@ Return JSON with tracks array."""
         """
         console.print(f"\n[cyan]Organizing {len(skills)} skills...[/cyan]")
 
-        # Simple deduplication by name
-        unique_skills = {}
-        for skill in skills:
-            key = skill.name.lower().strip()
+        # Group near-duplicates and merge each group into its first skill
+        from .agent_tools import merge_skill_cluster
+        from .similarity import SkillSimilarityIndex
+        index = SkillSimilarityIndex(
+            threshold=self.config.dedup_threshold,
+            num_perm=self.config.dedup_num_perm
+        )
 
-            if key not in unique_skills:
-                unique_skills[key] = skill
-            else:
-                # Merge key concepts
-                existing = unique_skills[key]
-                existing.key_concepts = list(set(
-                    existing.key_concepts + skill.key_concepts
-                ))
+        organized = [
+            merge_skill_cluster([skills[position] for position in cluster])
+            for cluster in index.find_clusters(skills)
+        ]
 
-        organized = list(unique_skills.values())
         console.print(f"[green]✓ Organized into {len(organized)} unique skills[/green]")
 
         return organized
@@ -494,13 +1389,19 @@ Return JSON with tracks array."""
         self,
         skills: List[ExtractedSkill],
         output_dir: Path
-    ):
+    ) -> WriteReport:
         """
         Generate markdown files and indexes.
 
+        Each skill is rendered once and written to its first track; other
+        tracks get links to that file. Unchanged files are not rewritten.
+
         Args:
             skills: Organized skills
             output_dir: Output directory
+
+        Returns:
+            Counts of written, linked, skipped and removed files
         """
         console.print(f"\n[cyan]Generating output files...[/cyan]")
 
@@ -508,21 +1409,145 @@ Return JSON with tracks array."""
         skills_dir.mkdir(parents=True, exist_ok=True)
 
         # Generate individual skill files
-        from .agent_tools import generate_skill_markdown, slugify
-
-        for skill in skills:
-            skill_json = skill.model_dump_json()
-            markdown = generate_skill_markdown(skill_json, skill.tracks)
+        from .agent_tools import cached_slugify, render_skills_markdown
 
+        writer = BulkWriter(skills_dir, link_mode=self.config.output_link_mode)
+        for skill, markdown in zip(skills, render_skills_markdown(skills)):
             # Save to each track directory
-            for track in skill.tracks:
-                track_dir = skills_dir / track
-                track_dir.mkdir(parents=True, exist_ok=True)
+            slug = cached_slugify(skill.name)
+            writer.add(markdown, [skills_dir / track / f"{slug}.md" for track in skill.tracks])
 
-                skill_file = track_dir / f"{slugify(skill.name)}.md"
-                skill_file.write_text(markdown, encoding="utf-8")
+        report = await asyncio.to_thread(
+            writer.commit, "*.md" if self.config.prune_outputs else None
+        )
+
+        console.print(
+            f"[green]✓ Generated {len(skills)} skill files "
+            f"({report.written} written, {report.linked} linked, "
+            f"{report.skipped} unchanged, {report.removed} removed)[/green]"
+        )
+        return report
+
+    async def _run_agent(
+        self,
+        agent,
+        prompt: str,
+        role: str,
+        stage: str,
+        book: Optional[str] = None
+    ):
+        """
+        Run an agent prompt with retries, recording telemetry for the call.
+
+        At most ``max_concurrent_agents`` calls are in flight at once.
+
+        Args:
+            agent: Agent to invoke
+            prompt: Prompt text
+            role: Agent role name for telemetry
+            stage: Pipeline stage for telemetry
+            book: Book being processed, if any
+
+        Returns:
+            Agent response
+        """
+        async with self._agent_slots:
+            return await self.telemetry.run_agent(
+                agent,
+                prompt,
+                role=role,
+                stage=stage,
+                book=book,
+                max_retries=self.config.agent_max_retries
+            )
 
-        console.print(f"[green]✓ Generated {len(skills)} skill files[/green]")
+    def _start_step(self, step_id: str, book: Optional[str] = None):
+        """Mark a step started if a workflow state is being checkpointed"""
+        if self.workflow_state is not None:
+            with self._measure("checkpoint", book):
+                self.state_manager.start_step(self.workflow_state, step_id)
+
+    def _complete_step(
+        self,
+        step_id: str,
+        result: Optional[Dict[str, Any]] = None,
+        output: Any = None,
+        stage: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        book: Optional[str] = None
+    ):
+        """Save a step's output artifact and mark it completed if checkpointing"""
+        with self._measure("checkpoint", book):
+            result = dict(result or {})
+            if output is not None:
+                result["artifact"] = self._save_step_artifact(step_id, output, stage, fingerprint)
+            if fingerprint:
+                result["fingerprint"] = fingerprint
+            if self.workflow_state is not None:
+                self.state_manager.complete_step(self.workflow_state, step_id, result)
+        if stage is not None:
+            self._memory_checkpoint(stage, book)
+
+    def _profiled(self, awaitable: Awaitable[Any], stage: str, book: Optional[str] = None) -> Awaitable[Any]:
+        """Charge an awaitable's time to a stage when profiling is enabled"""
+        if self.profiler is None:
+            return awaitable
+        return self.profiler.profile(awaitable, stage, book)
+
+    def _memory_checkpoint(self, stage: str, book: Optional[str] = None):
+        """Snapshot memory at the end of a stage when memory profiling is enabled"""
+        if self.memory_profiler is not None:
+            self.memory_profiler.checkpoint(stage, book)
+
+    def _measure(self, stage: str, book: Optional[str] = None):
+        """Charge a synchronous block's time to a stage when profiling is enabled"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.measure(stage, book)
+
+    def _fail_step(self, step_id: str, error: str):
+        """Mark a step failed if a workflow state is being checkpointed"""
+        if self.workflow_state is not None:
+            self.state_manager.fail_step(self.workflow_state, step_id, error)
+
+    @contextmanager
+    def _shared_progress(self):
+        """Share one live progress display between concurrently processed books"""
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            console=console
+        ) as progress:
+            self._progress = progress
+            try:
+                yield progress
+            finally:
+                self._progress = None
+
+    @contextmanager
+    def _progress_task(self, description: str, total: int):
+        """
+        Add a task to the shared progress display, or a standalone one.
+
+        Yields:
+            Tuple of (progress, task_id)
+        """
+        if self._progress is not None:
+            task = self._progress.add_task(description, total=total)
+            try:
+                yield self._progress, task
+            finally:
+                self._progress.remove_task(task)
+            return
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            console=console
+        ) as progress:
+            yield progress, progress.add_task(description, total=total)
 
     def _generate_step_names(self, books: List[BookToProcess]) -> List[str]:
         """Generate step names for all books"""
@@ -0,0 +1,63 @@
+"""Tests for stage artifacts and input fingerprints"""
+
+import pytest
+
+from teaching_utils.artifacts import ArtifactStore, compute_fingerprint
+
+
+def test_fingerprint_is_canonical():
+    assert compute_fingerprint("a", {"x": 1, "y": 2}) == compute_fingerprint("a", {"y": 2, "x": 1})
+    assert compute_fingerprint("a", 1) != compute_fingerprint("a", 2)
+    assert compute_fingerprint("a", "b") != compute_fingerprint("ab")
+
+
+def test_text_and_records_round_trip(tmp_path):
+    store = ArtifactStore(tmp_path)
+    text_ref = store.save_text("wf", "extract_book", "book text")
+    records_ref = store.save_records("wf", "identify_book", [{"name": "Loops"}])
+
+    assert store.load_text(text_ref) == "book text"
+    assert store.load_records(records_ref) == [{"name": "Loops"}]
+    assert records_ref["count"] == 1
+    with pytest.raises(ValueError):
+        store.load_records(text_ref)
+
+
+def test_new_saves_get_new_versions(tmp_path):
+    store = ArtifactStore(tmp_path)
+    first = store.save_text("wf", "extract_book", "v1")
+    second = store.save_text("wf", "extract_book", "v2")
+
+    assert (first["version"], second["version"]) == (1, 2)
+    assert store.load_text(first) == "v1"
+
+
+def test_lookup_by_fingerprint(tmp_path):
+    store = ArtifactStore(tmp_path)
+    fingerprint = compute_fingerprint("book-sha", 8000, 200)
+    ref = store.save_records("wf", "identify_book", [{"name": "Loops"}])
+    store.register("identify", fingerprint, ref)
+
+    found = store.lookup("identify", fingerprint)
+    assert store.load_records(found) == [{"name": "Loops"}]
+    assert store.lookup("identify", compute_fingerprint("book-sha", 4000, 200)) is None
+    assert store.lookup("validate", fingerprint) is None
+
+
+def test_lookup_misses_when_artifact_is_gone(tmp_path):
+    store = ArtifactStore(tmp_path)
+    ref = store.save_text("wf", "extract_book", "text")
+    store.register("extract", "fp", ref)
+    (tmp_path / ref["path"]).unlink()
+
+    assert store.lookup("extract", "fp") is None
+
+
+def test_clear_stage(tmp_path):
+    store = ArtifactStore(tmp_path)
+    ref = store.save_records("_chunks", "chunk", [])
+    store.register("identify_chunk", "fp", ref)
+
+    assert store.clear_stage("identify_chunk", workflow_id="_chunks") == 1
+    assert store.lookup("identify_chunk", "fp") is None
+    assert not (tmp_path / "_chunks").exists()
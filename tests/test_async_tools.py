@@ -0,0 +1,90 @@
+"""Tests for running synchronous agent tools from async code"""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from teaching_utils.async_tools import AsyncToolRunner
+
+
+PARENT_PID = os.getpid()
+
+
+def where_am_i(value: int) -> tuple:
+    """Report the process and thread a call ran in"""
+    return value * 2, os.getpid(), threading.get_ident()
+
+
+def crash_in_worker(value: int) -> int:
+    """Kill a pool worker; succeed when called in the test process"""
+    if os.getpid() != PARENT_PID:
+        os._exit(1)
+    return value + 1
+
+
+def fail(value: int) -> int:
+    raise RuntimeError(f"bad value {value}")
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def runner():
+    runner = AsyncToolRunner(process_workers=1)
+    yield runner
+    runner.shutdown()
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_modes(runner, mode):
+    runner.modes["where_am_i"] = mode
+
+    async def call():
+        return await runner.call(where_am_i, 21), threading.get_ident()
+
+    (result, pid, thread), loop_thread = run(call())
+
+    assert result == 42
+    assert (pid == PARENT_PID) == (mode != "process")
+    if mode == "inline":
+        assert thread == loop_thread
+    if mode == "thread":
+        assert thread != loop_thread
+
+    record = runner.telemetry.tool_calls[-1]
+    assert (record.tool, record.mode, record.success) == ("where_am_i", mode, True)
+
+
+def test_wrap_keeps_name_and_runs(runner):
+    wrapped = runner.wrap(where_am_i)
+    assert wrapped.__name__ == "where_am_i"
+    assert wrapped.__doc__ == where_am_i.__doc__
+    assert asyncio.iscoroutinefunction(wrapped)
+    assert run(wrapped(value=1))[0] == 2
+
+
+def test_errors_are_recorded_and_raised(runner):
+    runner.modes["fail"] = "thread"
+    with pytest.raises(RuntimeError, match="bad value 3"):
+        run(runner.call(fail, 3))
+
+    record = runner.telemetry.tool_calls[-1]
+    assert not record.success
+    assert "bad value 3" in record.error
+
+
+def test_broken_process_pool_falls_back_to_thread(runner):
+    runner.modes["crash_in_worker"] = "process"
+
+    assert run(runner.call(crash_in_worker, 1)) == 2
+    assert runner.telemetry.tool_calls[-1].mode == "thread"
+    assert runner._process_pool is None
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError, match="Invalid execution mode"):
+        AsyncToolRunner(modes={"where_am_i": "gpu"})
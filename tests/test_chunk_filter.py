@@ -0,0 +1,56 @@
+"""Tests for the local chunk pre-filter"""
+
+from teaching_utils.agent_tools import score_chunk
+
+
+PROSE = (
+    "A list comprehension builds a new list by applying an expression to each item.\n"
+    "It is usually shorter and faster than the equivalent loop with append calls.\n"
+)
+
+
+def test_prose_is_instructional():
+    result = score_chunk(PROSE * 3)
+    assert result.instructional
+    assert result.score > 0.2
+
+
+def test_code_is_always_instructional():
+    result = score_chunk("Index\nContents\n>>> squares = [n * n for n in range(5)]\n")
+    assert result.instructional
+    assert result.signals["code_density"] > 0
+
+
+def test_prose_mentioning_boilerplate_words_is_not_penalized():
+    text = PROSE + (
+        "The index of the first element is zero, and the contents of the list can change.\n"
+        "Copyright notices and an ISBN appear on the title page of most printed books.\n"
+    )
+    result = score_chunk(text)
+    assert result.signals["boilerplate_share"] == 0
+    assert result.instructional
+
+
+def test_front_matter_is_filtered():
+    text = (
+        "Copyright © 2021 Example Press\n"
+        "All rights reserved.\n"
+        "ISBN 978-1-234-56789-0\n"
+        "Printed in the United States of America\n"
+    )
+    result = score_chunk(text)
+    assert not result.instructional
+    assert result.reason == "front/back matter"
+
+
+def test_table_of_contents_is_filtered():
+    text = "\n".join(f"Chapter {n}: Working with data ........ {n * 12}" for n in range(1, 15))
+    result = score_chunk(text)
+    assert not result.instructional
+    assert result.reason == "page references"
+
+
+def test_empty_chunk():
+    result = score_chunk("\n  \n")
+    assert not result.instructional
+    assert result.reason == "empty"
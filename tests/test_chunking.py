@@ -0,0 +1,56 @@
+"""Tests for offset-span and content-defined chunking"""
+
+from teaching_utils.agent_tools import (
+    ChunkSpan, chunk_content, iter_chunk_spans, iter_content_defined_spans
+)
+
+
+def sample_text(paragraphs=60):
+    return "\n\n".join(
+        f"  Paragraph {n} explains one idea about Python in a few sentences. " * 4
+        for n in range(paragraphs)
+    )
+
+
+def test_spans_match_chunk_content():
+    text = sample_text()
+    spans = list(iter_chunk_spans(text, chunk_size=1000, overlap=100))
+    assert [span.text(text) for span in spans] == chunk_content(text, 1000, 100)
+
+
+def test_spans_are_trimmed():
+    text = sample_text()
+    for span in iter_chunk_spans(text, chunk_size=1000, overlap=0):
+        chunk = span.text(text)
+        assert chunk == chunk.strip()
+
+
+def test_span_text_limit():
+    span = ChunkSpan(2, 10)
+    assert span.text("0123456789abc") == "23456789"
+    assert span.text("0123456789abc", limit=3) == "234"
+    assert span.text("0123456789abc", limit=100) == "23456789"
+
+
+def test_blank_content_has_no_spans():
+    assert list(iter_chunk_spans("   \n\n  ")) == []
+
+
+def test_content_defined_spans_respect_max_size():
+    text = sample_text(200)
+    spans = list(iter_content_defined_spans(text, target_size=1000))
+    assert spans
+    assert all(span.end - span.start <= 2000 for span in spans)
+    assert all(first.end <= second.start for first, second in zip(spans, spans[1:]))
+
+
+def test_content_defined_spans_are_stable_under_local_edits():
+    text = sample_text(200)
+    edited = text.replace("Paragraph 100 ", "Paragraph one hundred, edited, ", 1)
+
+    before = {span.text(text) for span in iter_content_defined_spans(text, target_size=1000)}
+    after = [span.text(edited) for span in iter_content_defined_spans(edited, target_size=1000)]
+
+    changed = [chunk for chunk in after if chunk not in before]
+    assert 1 <= len(changed) <= 2
+    assert len(after) - len(changed) >= len(before) - 3
@@ -0,0 +1,72 @@
+"""Tests for document handle tools"""
+
+import asyncio
+
+import pytest
+from conftest import make_pdf
+
+from teaching_utils.agent_tools import (
+    document_scope, get_open_document, list_document_chunks, open_pdf_document,
+    read_document_chunk, read_document_pages
+)
+
+
+@pytest.fixture(autouse=True)
+def page_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF_CACHE_DIR", str(tmp_path / "pdf_cache"))
+
+
+def test_open_and_read(sample_pdf):
+    with document_scope():
+        opened = open_pdf_document(str(sample_pdf), chunk_size=20, overlap=0)
+        document_id = opened["document_id"]
+        assert opened["page_count"] == 6
+        assert opened["pages_with_text"] == 5
+
+        listing = list_document_chunks(document_id, start=0, limit=2)
+        assert [chunk["chunk_id"] for chunk in listing["chunks"]] == [0, 1]
+        assert listing["chunks"][0]["start_page"] == 1
+        assert listing["next_start"] == 2
+
+        assert read_document_chunk(document_id, 0) == "Page 1 text"
+        assert read_document_chunk(document_id, 99).startswith("Error:")
+        assert read_document_pages(document_id, 3, 5) == "Page 3 text\n\nPage 5 text"
+        assert read_document_pages(document_id, 4) == "Pages 4-4 have no text"
+
+
+def test_missing_file():
+    assert "error" in open_pdf_document("/no/such/file.pdf")
+
+
+def test_scopes_are_isolated(sample_pdf):
+    with document_scope():
+        document_id = open_pdf_document(str(sample_pdf))["document_id"]
+
+        with document_scope():
+            assert get_open_document(document_id) is None
+            assert "Unknown document id" in list_document_chunks(document_id)["error"]
+
+        assert get_open_document(document_id) is not None
+
+    assert get_open_document(document_id) is None
+
+
+def test_evicted_document_error_is_clear(tmp_path, sample_pdf):
+    other = make_pdf(tmp_path / "other.pdf", ["Another book"])
+
+    with document_scope(max_documents=1) as registry:
+        first = open_pdf_document(str(sample_pdf))["document_id"]
+        open_pdf_document(str(other))
+
+        assert len(registry) == 1
+        assert "was closed" in read_document_chunk(first, 0)
+        assert "was closed" in read_document_pages(first, 1)
+
+
+def test_tool_threads_see_the_scope(sample_pdf):
+    async def run():
+        with document_scope():
+            opened = await asyncio.to_thread(open_pdf_document, str(sample_pdf))
+            return await asyncio.to_thread(read_document_chunk, opened["document_id"], 0)
+
+    assert asyncio.run(run()).startswith("Page 1 text")
@@ -0,0 +1,41 @@
+"""Tests for merging duplicate skill clusters"""
+
+from teaching_utils.agent_tools import merge_skill_cluster
+
+
+def make_skill(name, description, book, section, concepts):
+    return {
+        "name": name,
+        "description": description,
+        "source_book": book,
+        "source_section": section,
+        "key_concepts": concepts,
+    }
+
+
+def test_longest_description_wins():
+    merged = merge_skill_cluster([
+        make_skill("Merge", "short", "a.pdf", "1", ["x"]),
+        make_skill("Merge", "much longer", "b.pdf", "2", ["y"]),
+    ])
+    assert merged["description"] == "much longer"
+    assert merged["key_concepts"] == ["x", "y"]
+
+
+def test_tie_keeps_first_seen_description():
+    merged = merge_skill_cluster([
+        make_skill("Merge", "first", "a.pdf", "1", []),
+        make_skill("Merge", "other", "b.pdf", "2", []),
+        make_skill("Merge", "third", "c.pdf", "3", []),
+    ])
+    assert merged["description"] == "first"
+
+
+def test_provenance_carries_through_repeated_merges():
+    first = merge_skill_cluster([
+        make_skill("Merge", "d", "a.pdf", "1", []),
+        make_skill("Merge", "d", "b.pdf", "2", []),
+    ])
+    merged = merge_skill_cluster([first, make_skill("Merge", "d", "a.pdf", "3", [])])
+    assert merged["merged_from"] == ["a.pdf", "b.pdf"]
+    assert merged["source_sections"] == ["1", "2", "3"]
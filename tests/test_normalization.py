@@ -0,0 +1,81 @@
+"""Tests for deterministic page text normalization"""
+
+from teaching_utils.normalization import is_code_line, normalize_pdf_pages
+
+
+def book(bodies):
+    """Pages with a running header and a page-number footer"""
+    return [f"Python Basics\n{body}\n{number}" for number, body in enumerate(bodies, start=10)]
+
+
+def test_removes_running_headers_and_page_numbers():
+    pages, report = normalize_pdf_pages(book(["first page", "second page", "third page"]))
+    assert pages == ["first page", "second page", "third page"]
+    assert report.header_lines_removed == 3
+    assert report.page_numbers_removed == 3
+    assert report.chars_after < report.chars_before
+
+
+def test_keeps_numbers_next_to_code():
+    pages, report = normalize_pdf_pages(book(["prose", ">>> len([1, 2, 3])\n3", "more prose"]))
+    assert pages[1] == ">>> len([1, 2, 3])\n3"
+    assert report.page_numbers_removed == 3
+
+
+def test_joins_hyphenated_words():
+    pages, _ = normalize_pdf_pages(["An exam-\nple of a func-\ntion call."])
+    assert pages == ["An example of a function call."]
+
+
+def test_keeps_hyphen_in_compounds():
+    pages, report = normalize_pdf_pages([
+        "Each module is self-\ncontained.",
+        "A run-\ntime error differs from a run-time warning.",
+    ])
+    assert pages == [
+        "Each module is self-contained.",
+        "A run-time error differs from a run-time warning.",
+    ]
+    assert report.hyphenations_joined == 2
+
+
+def test_code_keeps_spacing():
+    code = "    total  =  price * quantity"
+    pages, _ = normalize_pdf_pages([f"Some   spaced   prose\n{code}"])
+    assert pages == [f"Some spaced prose\n{code}"]
+    assert is_code_line(code)
+
+
+def test_blank_pages_stay_aligned():
+    pages, _ = normalize_pdf_pages(["text", "   \n", "more"])
+    assert pages == ["text", "", "more"]
+
+
+def test_joins_non_ascii_continuations():
+    pages, report = normalize_pdf_pages(["some pre-\nétude text", "a café-\n(note)"])
+    assert pages == ["some preétude text", "a café-\n(note)"]
+    assert report.hyphenations_joined == 1
+
+
+def test_keeps_lines_that_repeat_only_by_number():
+    pages, report = normalize_pdf_pages([
+        f"Example {n}\nIn [{n}]: squares({n})\nOut: {n * n} items" for n in range(1, 8)
+    ])
+    assert pages[2] == "Example 3\nIn [3]: squares(3)\nOut: 9 items"
+    assert report.header_lines_removed == 0
+
+
+def test_keeps_header_when_it_is_the_only_prose():
+    pages, report = normalize_pdf_pages(
+        ["Python Basics\nfirst page", "Python Basics\nsecond page", "Python Basics", "Python Basics\nfourth page"]
+    )
+    assert pages == ["first page", "second page", "Python Basics", "fourth page"]
+    assert report.header_lines_removed == 3
+
+
+def test_keeps_numbered_lines_that_do_not_follow_the_page():
+    pages, report = normalize_pdf_pages([
+        f"Example {n} squares a list of {n} numbers\nresult is {n * n}" for n in range(1, 8)
+    ])
+    assert pages[3] == "Example 4 squares a list of 4 numbers\nresult is 16"
+    assert report.header_lines_removed == 0
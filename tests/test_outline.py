@@ -0,0 +1,74 @@
+"""Tests for outline (bookmark) segmentation of PDFs"""
+
+from pypdf import PdfWriter
+
+from conftest import make_pdf
+from teaching_utils.agent_tools import chunk_pdf_sections, read_pdf_outline
+
+
+def make_bookmarked_pdf(path, page_texts, bookmarks):
+    """Write a PDF with (title, page index, parent title or None) bookmarks"""
+    writer = PdfWriter(clone_from=make_pdf(path, page_texts))
+    items = {}
+    for title, page_index, parent in bookmarks:
+        items[title] = writer.add_outline_item(title, page_index, parent=items.get(parent))
+    writer.write(path)
+    return path
+
+
+def test_read_pdf_outline_sections(tmp_path):
+    pdf = make_bookmarked_pdf(
+        tmp_path / "book.pdf",
+        [f"Page {n} text" for n in range(1, 7)],
+        [("Chapter 1", 1, None), ("Variables", 2, "Chapter 1"), ("Chapter 2", 4, None)]
+    )
+
+    sections = read_pdf_outline(pdf)
+
+    assert [(s.label, s.start_page, s.end_page) for s in sections] == [
+        ("Front Matter", 1, 1),
+        ("Chapter 1", 2, 2),
+        ("Chapter 1 > Variables", 3, 4),
+        ("Chapter 2", 5, 6),
+    ]
+
+
+def test_read_pdf_outline_without_bookmarks(sample_pdf):
+    assert read_pdf_outline(sample_pdf) == []
+    assert chunk_pdf_sections(sample_pdf) == []
+
+
+def test_chunks_stay_within_sections(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF_CACHE_DIR", str(tmp_path / "cache"))
+    pdf = make_bookmarked_pdf(
+        tmp_path / "book.pdf",
+        [f"Page {n} " + "words " * 40 for n in range(1, 7)],
+        [("Chapter 1", 0, None), ("Loops", 2, "Chapter 1"), ("Chapter 2", 4, None)]
+    )
+
+    chunks = chunk_pdf_sections(pdf, chunk_size=150, overlap=0)
+
+    expected = {"Chapter 1": {1, 2}, "Chapter 1 > Loops": {3, 4}, "Chapter 2": {5, 6}}
+    sections = [chunk.section for chunk in chunks]
+    assert sorted(set(sections), key=sections.index) == list(expected)
+    assert {chunk.chapter for chunk in chunks} == {"Chapter 1", "Chapter 2"}
+    for chunk in chunks:
+        pages = {int(word) for word in chunk.text.split() if word.isdigit()}
+        assert pages <= expected[chunk.section]
+
+
+def test_chunks_are_normalized(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF_CACHE_DIR", str(tmp_path / "cache"))
+    pdf = make_bookmarked_pdf(
+        tmp_path / "book.pdf",
+        [f"Python Handbook\nBody of page {n}.\n{n}" for n in range(1, 7)],
+        [("Chapter 1", 0, None), ("Chapter 2", 3, None)]
+    )
+
+    raw = chunk_pdf_sections(pdf, chunk_size=1000, overlap=0)
+    normalized = chunk_pdf_sections(pdf, chunk_size=1000, overlap=0, normalize=True)
+
+    assert any("Python Handbook" in chunk.text for chunk in raw)
+    assert [chunk.section for chunk in normalized] == ["Chapter 1", "Chapter 2"]
+    assert all("Python Handbook" not in chunk.text for chunk in normalized)
+    assert "Body of page 4." in normalized[1].text
@@ -0,0 +1,47 @@
+"""Tests for the on-disk PDF page text cache"""
+
+from teaching_utils.pdf_cache import PdfPageCache
+
+
+PAGES = [(1, "First page"), (3, "Third page — ünïcode"), (4, "Fourth page")]
+
+
+def test_round_trip(tmp_path):
+    cache = PdfPageCache(tmp_path)
+    cache.put("abc", 5, PAGES)
+    assert cache.get("abc") == (5, PAGES)
+
+
+def test_page_range(tmp_path):
+    cache = PdfPageCache(tmp_path)
+    cache.put("abc", 5, PAGES)
+    assert cache.get("abc", start_page=2, end_page=3) == (5, [(3, "Third page — ünïcode")])
+
+
+def test_miss_and_extractor_version(tmp_path):
+    PdfPageCache(tmp_path, extractor_version=1).put("abc", 5, PAGES)
+    assert PdfPageCache(tmp_path).get("other") is None
+    assert PdfPageCache(tmp_path, extractor_version=2).get("abc") is None
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = PdfPageCache(tmp_path)
+    cache.put("abc", 5, PAGES)
+    cache.path_for("abc").write_bytes(b"PDFP\x00")
+    assert cache.get("abc") is None
+
+    cache.path_for("abc").write_bytes(b"")
+    assert cache.get("abc") is None
+
+
+def test_concurrent_writers_in_one_process(tmp_path, capsys):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = PdfPageCache(tmp_path)
+    pages = [(n, f"Page {n} " * 2000) for n in range(1, 40)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: cache.put("abc", 40, pages), range(32)))
+
+    assert "Could not write" not in capsys.readouterr().out
+    assert cache.get("abc") == (40, pages)
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
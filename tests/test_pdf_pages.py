@@ -0,0 +1,42 @@
+"""Tests for lazy and parallel PDF page reading and streaming chunking"""
+
+from teaching_utils.agent_tools import (
+    chunk_content, iter_chunks, iter_pdf_pages, read_pdf_pages, read_pdf_pages_parallel
+)
+
+
+def test_iter_pdf_pages_skips_blank_pages(sample_pdf):
+    pages = list(iter_pdf_pages(sample_pdf))
+    assert [number for number, _ in pages] == [1, 2, 3, 5, 6]
+    assert pages[0][1] == "Page 1 text"
+    assert read_pdf_pages(sample_pdf) == [text for _, text in pages]
+
+
+def test_iter_pdf_pages_range(sample_pdf):
+    assert list(iter_pdf_pages(sample_pdf, start_page=3, end_page=5)) == [
+        (3, "Page 3 text"), (5, "Page 5 text")
+    ]
+
+
+def test_iter_chunks_matches_chunk_content():
+    pages = [f"Page {n}. " + "Some words about Python. " * (n * 7) for n in range(1, 30)]
+    joined = "\n\n".join(pages)
+
+    for chunk_size, overlap in ((500, 50), (1000, 0), (5000, 200)):
+        assert list(iter_chunks(pages, chunk_size, overlap)) == chunk_content(joined, chunk_size, overlap)
+
+
+def test_parallel_read_matches_serial(sample_pdf):
+    serial = read_pdf_pages(sample_pdf)
+    finished = []
+
+    parallel = read_pdf_pages_parallel(
+        sample_pdf, max_workers=2, pages_per_shard=2, on_progress=finished.append
+    )
+
+    assert parallel == serial
+    assert sum(finished) == 6
+
+
+def test_parallel_read_range_in_process(sample_pdf):
+    assert read_pdf_pages_parallel(sample_pdf, max_workers=1, start_page=5) == ["Page 5 text", "Page 6 text"]
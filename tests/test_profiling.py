@@ -0,0 +1,50 @@
+"""Tests for per-stage memory profiling"""
+
+import json
+
+import pytest
+
+from teaching_utils.profiling import MemoryBudgetExceeded, MemoryProfiler
+
+
+def test_checkpoint_records_stage_peak():
+    profiler = MemoryProfiler()
+    profiler.start()
+    try:
+        data = [bytes(1024) for _ in range(4096)]
+        measurement = profiler.checkpoint("extract", "book")
+        del data
+    finally:
+        profiler.stop()
+
+    assert measurement.book == "book"
+    assert measurement.stage == "extract"
+    assert measurement.traced_peak_mb >= 4
+    assert profiler.peak_mb == measurement.traced_peak_mb
+
+
+def test_checkpoint_without_start_is_ignored():
+    profiler = MemoryProfiler()
+    assert profiler.checkpoint("extract") is None
+    assert profiler.stages == []
+
+
+def test_budget(tmp_path):
+    profiler = MemoryProfiler(budget_mb=1)
+    profiler.start()
+    try:
+        data = [bytes(1024) for _ in range(4096)]
+        profiler.checkpoint("identify", "book")
+        del data
+    finally:
+        profiler.stop()
+
+    with pytest.raises(MemoryBudgetExceeded, match="identify"):
+        profiler.check_budget()
+
+    report = json.loads(profiler.write_report(tmp_path / "memory.json").read_text())
+    assert report["within_budget"] is False
+    assert report["stages"][0]["stage"] == "identify"
+
+    profiler.budget_mb = 1024
+    profiler.check_budget()
@@ -0,0 +1,63 @@
+"""Tests for TF-IDF skill similarity"""
+
+import json
+
+import numpy as np
+
+from teaching_utils.agent_tools import check_skill_similarity, find_similar_skills
+from teaching_utils.similarity import similar_pairs, tfidf_matrix, top_k_neighbors
+
+
+NAMES = [
+    "Reading CSV files with pandas",
+    "Reading CSV files using pandas",
+    "Writing JSON files",
+    "List comprehensions",
+    "Dictionary comprehensions",
+    "Async functions and await",
+]
+
+
+def brute_force_scores(vectors):
+    dense = vectors.to_dense()
+    scores = dense @ dense.T
+    np.fill_diagonal(scores, -np.inf)
+    return scores
+
+
+def test_top_k_matches_brute_force():
+    vectors = tfidf_matrix(NAMES * 5)
+    expected = brute_force_scores(vectors)
+
+    for dense_features in (0, 4, 256):
+        indices, scores = top_k_neighbors(vectors, k=3, block_size=7, dense_features=dense_features)
+        assert np.allclose(scores, -np.sort(-expected, axis=1)[:, :3], atol=1e-5)
+        assert np.allclose(np.take_along_axis(expected, indices, axis=1), scores, atol=1e-5)
+
+
+def test_rows_are_unit_length():
+    vectors = tfidf_matrix(NAMES)
+    assert np.allclose(np.linalg.norm(vectors.to_dense(), axis=1), 1.0)
+
+
+def test_similar_pairs_are_unique():
+    indices, scores = top_k_neighbors(tfidf_matrix(NAMES), k=2)
+    pairs = similar_pairs(indices, scores, threshold=0.7)
+    assert [(first, second) for first, second, _ in pairs] == [(0, 1)]
+
+
+def test_find_similar_skills():
+    result = find_similar_skills(json.dumps([{"name": name} for name in NAMES]), threshold=0.7)
+    assert [(pair["first_name"], pair["second_name"]) for pair in result["pairs"]] == [(NAMES[0], NAMES[1])]
+
+
+def test_find_similar_skills_rejects_non_objects():
+    assert "error" in find_similar_skills("{}")
+    assert "error" in find_similar_skills('["a", "b"]')
+    assert "error" in find_similar_skills("not json")
+
+
+def test_check_skill_similarity():
+    assert check_skill_similarity(NAMES[0], NAMES[1])["is_similar"]
+    assert not check_skill_similarity(NAMES[0], NAMES[3])["is_similar"]
+    assert check_skill_similarity("", NAMES[0])["similarity_score"] == 0.0
@@ -0,0 +1,51 @@
+"""Tests for MinHash/LSH duplicate clustering"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from teaching_utils.similarity import SkillSimilarityIndex, names_match
+
+
+def skill(name, concepts=()):
+    return SimpleNamespace(name=name, key_concepts=list(concepts))
+
+
+def clusters_of(skills, **kwargs):
+    return SkillSimilarityIndex(**kwargs).find_clusters(skills)
+
+
+def test_same_name_always_merges():
+    skills = [skill("List Comprehensions", ["list"]), skill("other"), skill("list comprehensions", ["loops"])]
+    assert clusters_of(skills) == [[0, 2], [1]]
+
+
+def test_near_duplicates_merge():
+    skills = [
+        skill("Reading CSV files with pandas", ["csv", "pandas"]),
+        skill("Reading CSV file using pandas", ["csv", "pandas"]),
+        skill("Data Visualisation", ["plot"]),
+        skill("Data visualization", ["plot"]),
+    ]
+    assert clusters_of(skills) == [[0, 1], [2, 3]]
+
+
+@pytest.mark.parametrize("first, second", [
+    ("List comprehensions", "Set comprehensions"),
+    ("Skill 41", "Skill 414"),
+    ("Python 2 strings", "Python 3 strings"),
+])
+def test_different_skills_stay_apart(first, second):
+    assert not names_match(first, second)
+    assert clusters_of([skill(first), skill(second)]) == [[0], [1]]
+
+
+def test_bucket_members_are_compared_with_each_other():
+    # The first member matches neither of the others, which match each other
+    skills = [skill("Skill 41"), skill("Skills 414"), skill("Skill 414")]
+    assert clusters_of(skills) == [[0], [1, 2]]
+
+
+def test_clusters_preserve_input_order():
+    skills = [skill(f"Topic {n}") for n in range(5)] + [skill("Topic 2"), skill("Topic 0")]
+    assert clusters_of(skills) == [[0, 6], [1], [2, 5], [3], [4]]
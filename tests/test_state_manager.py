@@ -0,0 +1,59 @@
+"""Tests for workflow step tracking and checkpoints"""
+
+import pytest
+
+from teaching_utils.state_manager import StateManager, StepStatus
+
+
+STEPS = ["extract", "identify", "categorize"]
+
+
+def test_skip_step_records_reason_and_saves(tmp_path):
+    manager = StateManager(tmp_path)
+    state = manager.create_workflow("wf", "Workflow", STEPS)
+
+    step = manager.skip_step(state, "extract", reason="up to date")
+
+    assert step.status == StepStatus.SKIPPED
+    assert step.completed_at is not None
+    assert step.metadata["skip_reason"] == "up to date"
+
+    loaded = manager.load_workflow("wf")
+    assert manager.get_step(loaded, "extract").status == StepStatus.SKIPPED
+    assert manager.get_step(loaded, "extract").metadata == {"skip_reason": "up to date"}
+
+
+def test_skip_step_without_reason_or_save(tmp_path):
+    manager = StateManager(tmp_path)
+    state = manager.create_workflow("wf", "Workflow", STEPS)
+
+    step = manager.skip_step(state, "identify", save=False)
+
+    assert step.status == StepStatus.SKIPPED
+    assert step.metadata == {}
+    assert manager.get_step(manager.load_workflow("wf"), "identify").status == StepStatus.PENDING
+
+
+def test_skipped_steps_count_as_done(tmp_path):
+    manager = StateManager(tmp_path)
+    state = manager.create_workflow("wf", "Workflow", STEPS)
+
+    manager.skip_step(state, "extract")
+    assert manager.get_next_pending_step(state).step_id == "identify"
+
+    manager.complete_step(state, "identify")
+    assert not manager.is_workflow_complete(state)
+    manager.skip_step(state, "categorize")
+
+    assert manager.is_workflow_complete(state)
+    assert manager.get_next_pending_step(state) is None
+    summary = manager.get_workflow_summary(state)
+    assert (summary["completed"], summary["skipped"], summary["pending"]) == (1, 2, 0)
+
+
+def test_skip_unknown_step(tmp_path):
+    manager = StateManager(tmp_path)
+    state = manager.create_workflow("wf", "Workflow", STEPS)
+
+    with pytest.raises(ValueError, match="Step not found"):
+        manager.skip_step(state, "missing")